@@ -0,0 +1,151 @@
+"""
+파서 성능 측정 스크립트 (backend/app 디렉토리에서 실행)
+
+Usage:
+    python benchmark.py scroll https://www.section508.gov/develop/authoring-meaningful-alternative-text/ --repeat 3
+    python benchmark.py parse page.html https://example.com/large-page --repeat 5
+"""
+
+import argparse
+import statistics
+import time
+from urllib.parse import urljoin
+
+from parser.dom import parse_html
+from parser.parser import wait_for_page_load, wait_for_images, extract_content
+from parser.pool import get_webdriver_pool, shutdown_webdriver_pool
+from parser.rewrite import make_srcs_absolute
+from parser.static import decode_html, fetch_static_html
+
+SCROLL_MODES = ("legacy", "event")
+
+
+def _summarize(timings):
+    return {
+        "median": statistics.median(timings),
+        "min": min(timings),
+        "max": max(timings),
+    }
+
+
+def benchmark_scroll(urls, repeat=3):
+    """
+    페이지별로 legacy/event 스크롤 모드의 wait_for_images 소요 시간을 비교
+
+    반복마다 두 모드의 순서를 번갈아 바꾸고(legacy→event, event→legacy),
+    매 실행 전에 브라우저 HTTP 캐시를 비워 뒤에 실행되는 모드가 캐시 덕을 보지 않도록 함
+    """
+    pool = get_webdriver_pool()
+    results = []
+    try:
+        for url in urls:
+            row = {"url": url}
+            timings = {mode: [] for mode in SCROLL_MODES}
+            for attempt in range(repeat):
+                modes = SCROLL_MODES if attempt % 2 == 0 else tuple(reversed(SCROLL_MODES))
+                for mode in modes:
+                    with pool.lease() as driver:
+                        driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+                        driver.get(url)
+                        wait_for_page_load(driver)
+                        started_at = time.perf_counter()
+                        wait_for_images(driver, scroll_mode=mode)
+                        timings[mode].append(time.perf_counter() - started_at)
+            for mode in SCROLL_MODES:
+                row[mode] = _summarize(timings[mode])
+            results.append(row)
+
+            legacy, event = row["legacy"]["median"], row["event"]["median"]
+            print(
+                f"{url}\n"
+                f"  legacy: {legacy:.2f}s  event: {event:.2f}s  "
+                f"speedup: {legacy / event if event else float('inf'):.1f}x"
+            )
+    finally:
+        shutdown_webdriver_pool()
+    return results
+
+
+def _legacy_parse(html_code, base_url):
+    """기존 파이프라인: html.parser로 파싱 → readability용으로 str(soup) 재파싱 → URL 변환용 재파싱"""
+    from bs4 import BeautifulSoup
+    from readability.readability import Document
+
+    soup = BeautifulSoup(html_code, "html.parser")
+    images = soup.find_all("img")
+    readable = Document(str(soup))
+    readable.title()
+    readable.summary()
+    rewritten = BeautifulSoup(html_code, "html.parser")
+    for img in rewritten.find_all("img"):
+        if img.get("src"):
+            img["src"] = urljoin(base_url, img["src"])
+    str(rewritten)
+    return len(images)
+
+
+def _lxml_parse(html_code, base_url):
+    """공유 lxml 트리: 한 번 파싱해 이미지 추출, readability에 재사용 (URL 변환은 문자열 치환)"""
+    doc = parse_html(html_code)
+    images = list(doc.iter("img"))
+    extract_content(doc)
+    make_srcs_absolute(html_code, base_url)
+    return len(images)
+
+
+def _load_html(source):
+    """파일 경로면 파일 내용, URL이면 HTTP로 받은 HTML"""
+    if source.startswith(("http://", "https://")):
+        return fetch_static_html(source)
+    with open(source, "rb") as f:
+        return decode_html(f.read()), "https://example.com/"
+
+
+def benchmark_parse(sources, repeat=5):
+    """
+    페이지별로 기존(BeautifulSoup 여러 번 파싱)과 lxml 단일 파싱 파이프라인의 소요 시간 비교
+    (파싱, <img> 탐색, readability 요약, 이미지 URL 절대 경로 변환까지)
+    """
+    results = []
+    for source in sources:
+        html_code, base_url = _load_html(source)
+        row = {"source": source, "bytes": len(html_code.encode("utf-8"))}
+        for name, parse in (("legacy", _legacy_parse), ("lxml", _lxml_parse)):
+            timings = []
+            for _ in range(repeat):
+                started_at = time.perf_counter()
+                parse(html_code, base_url)
+                timings.append(time.perf_counter() - started_at)
+            row[name] = _summarize(timings)
+        results.append(row)
+
+        legacy, lxml = row["legacy"]["median"], row["lxml"]["median"]
+        print(
+            f"{source} ({row['bytes'] / 1024:.0f} KB)\n"
+            f"  legacy: {legacy * 1000:.0f}ms  lxml: {lxml * 1000:.0f}ms  "
+            f"speedup: {legacy / lxml if lxml else float('inf'):.1f}x"
+        )
+    return results
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="AltCAT 파서 벤치마크")
+    subparsers = arg_parser.add_subparsers(dest="command", required=True)
+
+    scroll_parser = subparsers.add_parser("scroll", help="wait_for_images 스크롤 모드 비교")
+    scroll_parser.add_argument("urls", nargs="+")
+    scroll_parser.add_argument("--repeat", type=int, default=3)
+
+    parse_parser = subparsers.add_parser("parse", help="BeautifulSoup 파이프라인과 lxml 단일 파싱 비교")
+    parse_parser.add_argument("sources", nargs="+", help="HTML 파일 경로 또는 URL")
+    parse_parser.add_argument("--repeat", type=int, default=5)
+
+    args = arg_parser.parse_args()
+    if args.command == "scroll":
+        benchmark_scroll(args.urls, repeat=args.repeat)
+    elif args.command == "parse":
+        benchmark_parse(args.sources, repeat=args.repeat)
+
+
+if __name__ == "__main__":
+    main()
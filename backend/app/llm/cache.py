@@ -0,0 +1,214 @@
+"""
+LLM 결과 캐시
+- SQLite 기반의 영속 캐시 (여러 워커 프로세스가 같은 파일을 공유)
+- 항목별 TTL + 최대 개수 초과 시 LRU 삭제
+- namespace별 hit/miss 통계
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+
+from .config import CACHE_CONFIG
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 이 횟수만큼 set이 호출될 때마다 최대 개수 초과 여부를 확인
+EVICTION_CHECK_INTERVAL = 100
+
+
+def resolve_cache_path(path: str) -> str:
+    """상대 경로는 실행 디렉토리가 아닌 backend/app 기준으로 해석"""
+    if os.path.isabs(path):
+        return path
+    return os.path.join(APP_DIR, path)
+
+
+def make_cache_key(*parts) -> str:
+    """임의의 JSON 직렬화 가능한 값들로 캐시 키(sha256) 생성"""
+    raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def hash_text(text: str) -> str:
+    """문자열 지문 (컨텍스트 등 긴 텍스트를 키에 넣을 때 사용)"""
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    namespace 단위로 분리되는 SQLite 키-값 캐시
+
+    값은 JSON으로 저장하며, ttl(초)이 지난 항목은 조회 시 삭제하고
+    max_entries를 넘으면 accessed_at이 가장 오래된 항목부터 삭제
+    """
+
+    def __init__(self, namespace: str, path: str = None, ttl: float = None, max_entries: int = None):
+        self.namespace = namespace
+        self.path = resolve_cache_path(path or CACHE_CONFIG["path"])
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._sets_since_eviction = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_cache_entries_accessed ON cache_entries (namespace, accessed_at)"
+            )
+
+    def get(self, key: str):
+        """캐시된 값을 반환 (없거나 만료되었으면 None)"""
+        now = time.time()
+        try:
+            with self._lock, self._conn:
+                row = self._conn.execute(
+                    "SELECT value, created_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                    (self.namespace, key),
+                ).fetchone()
+                if row is not None and self.ttl is not None and now - row[1] > self.ttl:
+                    self._conn.execute(
+                        "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                        (self.namespace, key),
+                    )
+                    row = None
+                if row is None:
+                    self.misses += 1
+                    return None
+                self._conn.execute(
+                    "UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                    (now, self.namespace, key),
+                )
+                self.hits += 1
+            return json.loads(row[0])
+        except sqlite3.Error as e:
+            # 캐시 장애가 요청 실패로 이어지지 않도록 miss로 처리
+            logging.warning(f"[{self.namespace}] 캐시 조회 실패: {e}")
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value):
+        now = time.time()
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    """
+                    INSERT OR REPLACE INTO cache_entries (namespace, key, value, created_at, accessed_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    (self.namespace, key, json.dumps(value, ensure_ascii=False), now, now),
+                )
+                self._sets_since_eviction += 1
+                if self._sets_since_eviction >= EVICTION_CHECK_INTERVAL:
+                    self._sets_since_eviction = 0
+                    self._evict()
+        except sqlite3.Error as e:
+            logging.warning(f"[{self.namespace}] 캐시 저장 실패: {e}")
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,))
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = self._conn.execute(
+                "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?", (self.namespace,)
+            ).fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "size": size,
+        }
+
+    def _evict(self):
+        """만료 항목 삭제 후, max_entries를 넘는 만큼 LRU 순서로 삭제 (lock 안에서 호출)"""
+        if self.ttl is not None:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND created_at < ?",
+                (self.namespace, time.time() - self.ttl),
+            )
+        if self.max_entries is None:
+            return
+        size = self._conn.execute(
+            "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?", (self.namespace,)
+        ).fetchone()[0]
+        overflow = size - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                """
+                DELETE FROM cache_entries WHERE namespace = ? AND key IN (
+                    SELECT key FROM cache_entries WHERE namespace = ?
+                    ORDER BY accessed_at ASC LIMIT ?
+                )
+                """,
+                (self.namespace, self.namespace, overflow),
+            )
+            logging.info(f"[{self.namespace}] 캐시 LRU 삭제: {overflow}개")
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(namespace: str, **kwargs) -> ResultCache:
+    """namespace별 ResultCache 싱글톤 반환 (최초 호출 시 kwargs로 생성)"""
+    with _caches_lock:
+        if namespace not in _caches:
+            _caches[namespace] = ResultCache(namespace, **kwargs)
+        return _caches[namespace]
+
+
+def get_alt_text_cache() -> ResultCache:
+    """(image_type, generated, modified) 결과 캐시"""
+    return get_cache(
+        "alt_text",
+        ttl=CACHE_CONFIG["alt_text_ttl"],
+        max_entries=CACHE_CONFIG["alt_text_max_entries"],
+    )
+
+
+def get_classification_cache() -> ResultCache:
+    """이미지 분류(image_type) 결과 캐시 - 이미지에만 의존하므로 페이지/요청/워커 간 공유"""
+    return get_cache(
+        "image_classification",
+        ttl=CACHE_CONFIG["classification_ttl"],
+        max_entries=CACHE_CONFIG["classification_max_entries"],
+    )
+
+
+def get_guideline_cache() -> ResultCache:
+    """번역 파이프라인의 문화 가이드라인(on_the_fly_guidelines) 캐시"""
+    return get_cache(
+        "translation_guidelines",
+        ttl=CACHE_CONFIG["guideline_ttl"],
+        max_entries=CACHE_CONFIG["guideline_max_entries"],
+    )
+
+
+def cache_stats() -> dict:
+    """생성된 모든 캐시의 통계"""
+    with _caches_lock:
+        caches = list(_caches.values())
+    return {cache.namespace: cache.stats() for cache in caches}
@@ -1,12 +1,17 @@
-import aisuite as ai
 from llm.prompt_util import *
 import asyncio
+import importlib.util
 import os
 import logging
-import time
+import random
 import traceback
+import httpx
+from openai import AsyncOpenAI, RateLimitError
 from fastapi import HTTPException
-from .image_utils import process_image_url, sanitize_image_url_for_logging
+from .image_utils import process_image_url, sanitize_image_url_for_logging, prompt_image_reference, image_content_hash, image_perceptual_hash
+from .cache import get_alt_text_cache, get_classification_cache, make_cache_key, hash_text
+from .config import CACHE_CONFIG, LLM_CLIENT_CONFIG
+from .limiter import get_llm_scheduler, estimate_tokens, parse_retry_after
 
 # httpx, httpcore, openai의 DEBUG 로그 비활성화 (base64 데이터 출력 방지)
 logging.getLogger("httpx").setLevel(logging.WARNING)
@@ -21,123 +26,201 @@ PROMPT_NAME_CULTURE_AWARE_KOREAN = "culture_aware_translation_korean"
 PROMPT_NAME_CULTURE_AWARE_SPANISH = "culture_aware_translation_spanish"
 PROMPT_NAME_CULTURE_AWARE_CHINESE = "culture_aware_translation_chinese"
 
-DIR_NAME_SVG_DATA = "svg_data_cache"
-
-REQUEST_TIMEOUT = 10
+REQUEST_TIMEOUT = LLM_CLIENT_CONFIG["timeout"]
 
 EMPTY_STRING = ""
 
 # 🔥 이미지 처리 함수들은 image_utils.py로 이동됨
 
 def create_messages(prompt_name: str, image_url: str, alt_text: str, image_type:str = "", context:str = ""):
-    prompts = load_prompts()
-    selected_prompt = get_prompt(prompts, prompt_name)
-    messages = None
+    selected_prompt = get_prompt_registry().get(prompt_name)
     if prompt_name == PROMPT_NAME_ENHACNED_ALT_TEXT:
-        system_prompt = selected_prompt["system_prompt"]
-        user_prompt_template = selected_prompt["user_prompt"]
         variables = {
             "current_alt_text": alt_text,
             "image_url": image_url,
             "image_type": image_type, 
             "context": context
         }
-        formatted_user_prompt = user_prompt_template.format(
-            current_alt_text=variables["current_alt_text"],
-            image_url=variables["image_url"],
-            image_type=variables["image_type"],
-            context=variables["context"]
-        )
-        # 로깅용으로 image_url을 sanitize해서 출력
-        log_safe_prompt = user_prompt_template.format(
-            current_alt_text=variables["current_alt_text"],
-            image_url=sanitize_image_url_for_logging(variables["image_url"]),
-            image_type=variables["image_type"],
-            context=variables["context"]
-        )
-        logging.info(log_safe_prompt)
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {
-                "role": "user",
-                "content": [
-                    {"type": "text", "text": formatted_user_prompt},
-                    {"type": "image_url", "image_url": {"url": image_url}},
-                ]
-            }
-        ]
-        return messages
     elif prompt_name == PROMPT_NAME_IMAGE_CLASSIFICATION:
-        system_prompt = selected_prompt["system_prompt"]
-        user_prompt_template = selected_prompt["user_prompt"]
         variables = {"image_url": image_url}
-        formatted_user_prompt = user_prompt_template.format(
-            image_url=variables["image_url"],
-        )
-        # 로깅용으로 image_url을 sanitize해서 출력
-        log_safe_prompt = user_prompt_template.format(
-            image_url=sanitize_image_url_for_logging(variables["image_url"]),
-        )
-        logging.info(log_safe_prompt)
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {
-                "role": "user",
-                "content": [
-                    {"type": "text", "text": formatted_user_prompt},
-                    {"type": "image_url", "image_url": {"url": image_url}},
-                ]
-            }
-        ]
-        return messages
     else:
         raise HTTPException(status_code=500, detail="프롬프트 이름이 잘못되었습니다.")
 
-def call_api_with_retries(client, model, messages, max_retries=3, timeout=5, temperature=0.1):
+    # 이미지는 image_url 파트로 전달하고, 텍스트에는 원본 URL(또는 축약형)만 넣어 base64가 중복 전송되지 않도록 함
+    formatted_user_prompt = selected_prompt.format_user(**{**variables, "image_url": prompt_image_reference(image_url)})
+    logging.info(formatted_user_prompt)
+    messages = [
+        {"role": "system", "content": selected_prompt.system_prompt},
+        {
+            "role": "user",
+            "content": [
+                {"type": "text", "text": formatted_user_prompt},
+                {"type": "image_url", "image_url": {"url": image_url}},
+            ]
+        }
+    ]
+    return messages
+
+_async_client = None
+
+def get_async_client() -> AsyncOpenAI:
+    """
+    프로세스 전역 AsyncOpenAI 클라이언트 (최초 호출 시 생성)
+    httpx 커넥션 풀을 공유하므로 요청마다 TLS 핸드셰이크를 다시 하지 않음
+    """
+    global _async_client
+    if _async_client is None:
+        http2 = LLM_CLIENT_CONFIG["http2"] and importlib.util.find_spec("h2") is not None
+        http_client = httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=LLM_CLIENT_CONFIG["max_connections"],
+                max_keepalive_connections=LLM_CLIENT_CONFIG["max_keepalive_connections"],
+                keepalive_expiry=LLM_CLIENT_CONFIG["keepalive_expiry"],
+            ),
+            timeout=httpx.Timeout(LLM_CLIENT_CONFIG["timeout"], connect=LLM_CLIENT_CONFIG["connect_timeout"]),
+        )
+        # 재시도는 call_api_with_retries에서 처리
+        _async_client = AsyncOpenAI(http_client=http_client, max_retries=0)
+        logging.info(f"AsyncOpenAI client initialized (http2={http2})")
+    return _async_client
+
+async def close_async_client():
+    global _async_client
+    if _async_client is not None:
+        await _async_client.close()
+        _async_client = None
+
+def _model_name(model: str) -> str:
+    """aisuite 형식("openai:gpt-4.1-mini")의 provider 접두사 제거"""
+    return model.split(":", 1)[1] if ":" in model else model
+
+def backoff_delay(attempt: int) -> float:
+    """지수 백오프 + 지터: base * 2^attempt (상한 backoff_max)의 50~100% 사이 임의 값"""
+    delay = min(LLM_CLIENT_CONFIG["backoff_max"], LLM_CLIENT_CONFIG["backoff_base"] * (2 ** attempt))
+    return delay * random.uniform(0.5, 1.0)
+
+async def call_api_with_retries(client, model, messages, max_retries=None, timeout=5, temperature=0.1):
     """
     client.chat.completions.create를 최대 max_retries번 시도하고,
     실패 시 예외를 다시 raise 혹은 특정 값을 리턴하여 처리할 수 있게 하는 헬퍼 함수
+    재시도 사이에는 이벤트 루프를 막지 않고 지터가 포함된 지수 백오프로 대기
+    모든 호출은 프로세스 전역 스케줄러(동시 실행 수, RPM/TPM 한도)를 거침
     """
+    if max_retries is None:
+        max_retries = LLM_CLIENT_CONFIG["max_retries"]
+    scheduler = get_llm_scheduler()
+    estimated_tokens = estimate_tokens(messages)
     for attempt in range(max_retries):
         try:
-            response = client.chat.completions.create(
-                model=model,
-                messages=messages,
-                timeout=timeout,
-                temperature=temperature
-            )
+            async with scheduler.slot(estimated_tokens) as grant:
+                response = await client.chat.completions.create(
+                    model=_model_name(model),
+                    messages=messages,
+                    timeout=timeout,
+                    temperature=temperature
+                )
+                scheduler.record_usage(grant, response.usage.total_tokens if response.usage else 0)
             return response
+        except RateLimitError as e:
+            # 스케줄러가 Retry-After 동안 모든 호출을 멈추므로 여기서는 따로 대기하지 않음
+            scheduler.penalize(parse_retry_after(e.response.headers if e.response is not None else None))
+            logging.error(f"[{attempt+1}/{max_retries}] API rate limit (429): {e}")
+            if attempt < max_retries - 1:
+                continue
+            raise e
         except Exception as e:  # 실제로는 Timeout 등 필요한 예외를 지정해주는 것이 좋음
             logging.error(f"[{attempt+1}/{max_retries}] API 호출 도중 예외 발생: {e}")
             if attempt < max_retries - 1:
                 # 잠깐 쉬었다가 재시도
-                time.sleep(1)
+                await asyncio.sleep(backoff_delay(attempt))
                 continue
             else:
                 # 재시도를 모두 소진한 경우
                 raise e 
 
-def make_request(image_url: str, alt_text: str, is_button: bool = False, context: str = ""):
-    client = ai.Client()
-    
-    # 🔥 image_utils를 사용하여 이미지 처리
-    image_url = process_image_url(image_url)
+def alt_text_cache_key(image_url: str, alt_text: str, is_button: bool, context: str):
+    """
+    alt-text 결과 캐시 키
+    이미지 내용 해시 + 기존 alt text + 버튼 여부 + 컨텍스트 지문 + 모델/프롬프트 버전
+    """
+    return make_cache_key(
+        image_content_hash(image_url),
+        alt_text,
+        bool(is_button),
+        hash_text(context),
+        OPENAI_4O_MINI_MODEL,
+        get_prompt_version(PROMPT_NAME_IMAGE_CLASSIFICATION),
+        get_prompt_version(PROMPT_NAME_ENHACNED_ALT_TEXT),
+    )
+
+async def make_request(image_url: str, alt_text: str, is_button: bool = False, context: str = "", bypass_cache: bool = False):
+    # 🔥 image_utils를 사용하여 이미지 처리 (SVG 변환/다운로드 등 블로킹 작업은 스레드에서)
+    image_url = await asyncio.to_thread(process_image_url, image_url)
     
     logging.info(f"image_url: {sanitize_image_url_for_logging(image_url)}")
 
+    use_cache = CACHE_CONFIG["enabled"] and not bypass_cache
+    if use_cache:
+        cache_key = await asyncio.to_thread(alt_text_cache_key, image_url, alt_text, is_button, context)
+        # SQLite 조회/저장(잠금 대기, 주기적 LRU 정리)이 이벤트 루프를 막지 않도록 스레드에서 실행
+        cached = await asyncio.to_thread(get_alt_text_cache().get, cache_key)
+        if cached is not None:
+            logging.info("alt-text 캐시 hit")
+            return tuple(cached)
+
+    result = await generate_alt_text(image_url, alt_text, is_button, context, bypass_cache)
+
+    # 타임아웃/오류 결과는 캐시하지 않음
+    if use_cache and "TimeoutError" not in result:
+        await asyncio.to_thread(get_alt_text_cache().set, cache_key, list(result))
+    return result
+
+def classification_cache_key(image_url: str):
+    """이미지 분류 캐시 키 - 이미지 해시 + 모델/프롬프트 버전 (alt text, 컨텍스트와 무관)"""
+    if CACHE_CONFIG["classification_hash"] == "perceptual":
+        image_hash = image_perceptual_hash(image_url)
+    else:
+        image_hash = image_content_hash(image_url)
+    return make_cache_key(
+        image_hash,
+        OPENAI_4O_MINI_MODEL,
+        get_prompt_version(PROMPT_NAME_IMAGE_CLASSIFICATION),
+    )
+
+async def classify_image(client, image_url: str, alt_text: str = "", context: str = "", bypass_cache: bool = False):
+    """이미지 분류 (image_type) - 이미 본 이미지는 캐시된 결과 재사용"""
+    use_cache = CACHE_CONFIG["enabled"] and not bypass_cache
+    if use_cache:
+        cache_key = await asyncio.to_thread(classification_cache_key, image_url)
+        cached = await asyncio.to_thread(get_classification_cache().get, cache_key)
+        if cached is not None:
+            logging.info(f"image_type 캐시 hit: {cached}")
+            return cached
+
+    messages = create_messages(PROMPT_NAME_IMAGE_CLASSIFICATION, image_url, alt_text, "", context)
+    response = await call_api_with_retries(
+        client=client,
+        model=OPENAI_4O_MINI_MODEL,
+        messages=messages,
+        timeout=REQUEST_TIMEOUT
+    )
+    image_type = response.choices[0].message.content
+
+    if use_cache:
+        await asyncio.to_thread(get_classification_cache().set, cache_key, image_type)
+    return image_type
+
+async def generate_alt_text(image_url: str, alt_text: str, is_button: bool = False, context: str = "", bypass_cache: bool = False):
+    """분류 → 생성/수정 두 번의 비전 호출로 alt-text 생성 (image_url은 process_image_url 처리된 값)"""
+    client = get_async_client()
+
     image_type = ""
     #TODO: Temporary disable for demo
     if True:
     # if not is_button:
-        messages = create_messages(PROMPT_NAME_IMAGE_CLASSIFICATION, image_url, alt_text, "", context)
         try:
-            response = call_api_with_retries(
-                client=client,
-                model=OPENAI_4O_MINI_MODEL,
-                messages=messages,
-                timeout=REQUEST_TIMEOUT
-            )
-            image_type = response.choices[0].message.content
+            image_type = await classify_image(client, image_url, alt_text, context, bypass_cache)
         except Exception as e:
             # 최종적으로 실패한 경우 처리
             logging.error(f"image_type 생성 중 타임아웃 혹은 오류: {e}")
@@ -152,7 +235,7 @@ def make_request(image_url: str, alt_text: str, is_button: bool = False, context
         logging.info("No original alt-text found. Performing GENERATE operation.")
         messages = create_messages(PROMPT_NAME_ENHACNED_ALT_TEXT, image_url, "", image_type, context)
         try:
-            response = call_api_with_retries(
+            response = await call_api_with_retries(
                 client=client,
                 model=OPENAI_4O_MINI_MODEL,
                 messages=messages,
@@ -168,7 +251,7 @@ def make_request(image_url: str, alt_text: str, is_button: bool = False, context
         logging.info(f"Original alt-text found: '{alt_text}'. Performing MODIFY operation.")
         messages = create_messages(PROMPT_NAME_ENHACNED_ALT_TEXT, image_url, alt_text, image_type, context)
         try:
-            response = call_api_with_retries(
+            response = await call_api_with_retries(
                 client=client,
                 model=OPENAI_4O_MINI_MODEL,
                 messages=messages,
@@ -182,10 +265,9 @@ def make_request(image_url: str, alt_text: str, is_button: bool = False, context
 
     return image_type, ai_generated_alt_text, ai_modified_alt_text
 
-async def get_ai_generated_alt_text(image_url: str, alt_text: str, is_button:bool = False, context: str = ""):
+async def get_ai_generated_alt_text(image_url: str, alt_text: str, is_button:bool = False, context: str = "", bypass_cache: bool = False):
     try:
-        loop = asyncio.get_event_loop()
-        image_type, ai_generated_alt_text, ai_modified_alt_text = await loop.run_in_executor(None, lambda: make_request(image_url, alt_text, is_button, context))
+        image_type, ai_generated_alt_text, ai_modified_alt_text = await make_request(image_url, alt_text, is_button, context, bypass_cache)
         logging.info(f"image_type:{image_type}")
         logging.info(f"ai_generated_alt_text:{ai_generated_alt_text}")
         logging.info(f"ai_modified_alt_text:{ai_modified_alt_text}")
@@ -0,0 +1,95 @@
+# LLM 결과 캐시 설정
+CACHE_CONFIG = {
+    "enabled": True,
+    "path": "cache/llm_cache.sqlite3",   # backend/app 기준 상대 경로 (절대 경로도 가능)
+    "alt_text_ttl": 60 * 60 * 24 * 7,     # alt-text 결과 유지 시간(초)
+    "alt_text_max_entries": 50000,        # 초과 시 가장 오래 사용되지 않은 항목부터 삭제
+    "classification_ttl": 60 * 60 * 24 * 30,  # 이미지 분류 결과 유지 시간(초)
+    "classification_max_entries": 200000,
+    "classification_hash": "content",     # "content": 바이트 sha256, "perceptual": dHash (리사이즈/재압축에도 동일, 단색/단순 아이콘은 sha256으로 대체)
+    "guideline_ttl": 60 * 60 * 24 * 14,   # 번역용 문화 가이드라인 유지 시간(초)
+    "guideline_max_entries": 20000,
+    "guideline_key": "alt_text",          # "alt_text": 언어 + 이미지 타입 + 정규화된 alt text, "image": 언어 + 이미지 타입 + 이미지 dHash
+    "search_cache_enabled": True,         # 가이드라인 에이전트 검색 결과 캐시
+    "search_ttl": 60 * 60 * 24 * 3,
+    "search_max_entries": 20000,
+}
+
+# 비동기 LLM 클라이언트 설정 (프로세스당 하나의 클라이언트와 커넥션 풀 공유)
+LLM_CLIENT_CONFIG = {
+    "timeout": 10,                    # 요청당 제한 시간(초)
+    "connect_timeout": 5,             # 연결 수립 제한 시간(초)
+    "max_connections": 100,           # 커넥션 풀 최대 연결 수
+    "max_keepalive_connections": 20,  # keep-alive로 유지할 유휴 연결 수
+    "keepalive_expiry": 60,           # 유휴 연결 유지 시간(초)
+    "http2": True,                    # h2 패키지가 설치된 경우에만 적용
+    "max_retries": 3,                 # 최대 시도 횟수
+    "backoff_base": 0.5,              # 재시도 대기 시간 기준값(초), 시도마다 2배
+    "backoff_max": 8,                 # 재시도 대기 시간 상한(초)
+}
+
+# LLM 호출 스케줄러 설정 (모든 LLM 호출이 공유하는 프로세스 전역 한도)
+LLM_RATE_LIMIT_CONFIG = {
+    "max_in_flight": 16,              # 동시에 실행 중인 LLM 호출 최대 수
+    "requests_per_minute": 500,       # 분당 요청 수 (RPM)
+    "tokens_per_minute": 200000,      # 분당 토큰 수 (TPM)
+    "default_retry_after": 5,         # 429 응답에 Retry-After 헤더가 없을 때 대기 시간(초)
+    "estimated_image_tokens": 1000,   # 이미지 1장의 예상 입력 토큰 수
+    "estimated_output_tokens": 300,   # 호출당 예상 출력 토큰 수
+}
+
+# 문화 인식 번역 파이프라인 설정
+TRANSLATOR_CONFIG = {
+    "prewarm": True,                  # 앱 시작 시 파이프라인 생성 + 그래프 컴파일
+    "recursion_limit": 50,            # 그래프 최대 단계 수
+    "deadline": 60,                   # 번역 1건의 제한 시간(초), 초과 시 그때까지의 결과 반환
+    "pass_score": 4,                  # 두 평가 점수가 모두 이 값 이상이면 통과
+    "max_iterations": 3,              # 생성+평가 반복 최대 횟수
+    "max_tokens": 20000,              # 생성+평가 반복에서 사용할 수 있는 최대 토큰 수
+    "max_seconds": 45,                # 생성+평가 반복에 쓸 수 있는 최대 시간(초)
+    "patience": 1,                    # 점수가 이 횟수만큼 연속으로 나아지지 않으면 중단
+    "estimated_agent_tokens": 6000,   # 가이드라인 에이전트 1회 실행(검색 포함)의 예상 토큰 수
+    "batch_concurrency": 8,           # 배치 번역에서 동시에 실행하는 번역 수
+    "search_backend": "tavily",       # "tavily": 웹 검색, "local": search_corpus_path의 로컬 코퍼스 (네트워크 없이 테스트/벤치마크)
+    "search_max_results": 3,
+    "search_corpus_path": "search_corpus.json",  # llm/translator 기준 상대 경로 (절대 경로도 가능)
+    "search_latency_ms": 0,           # local 백엔드에서 검색마다 추가할 고정 지연 시간(ms)
+}
+
+# 이미지 수집(다운로드 → 정규화 → 바이트 캐시) 설정
+IMAGE_INGEST_CONFIG = {
+    "enabled": True,                  # False이면 원본 URL을 그대로 LLM에 전달
+    "max_dimension": 1024,            # 긴 변 최대 픽셀 수
+    "jpeg_quality": 85,
+    "passthrough_max_bytes": 512 * 1024,  # 이보다 작은 JPEG/PNG/WebP는 다시 인코딩하지 않음
+    "max_download_bytes": 20 * 1024 * 1024,
+    "timeout": 10,                    # 다운로드 제한 시간(초)
+    "max_connections": 20,            # 다운로드 커넥션 풀 크기
+    "user_agent": "Mozilla/5.0 (compatible; AltCAT image fetcher)",
+    "memory_cache_bytes": 64 * 1024 * 1024,  # 메모리에 보관할 정규화된 이미지 바이트 총량
+    "memory_cache_items": 1024,       # 지문/원본 URL 조회표 크기 기준
+    "disk_cache_dir": "cache/images", # backend/app 기준 상대 경로 (절대 경로도 가능)
+    "url_ttl": 60 * 60 * 24,          # URL → 이미지 매핑 유지 시간(초), 지나면 다시 다운로드
+    "url_max_entries": 100000,
+    "svg_workers": 2,                 # SVG 래스터화 프로세스 수
+    "svg_timeout": 20,                # SVG 1개 래스터화 제한 시간(초)
+    "svg_max_bytes": 2 * 1024 * 1024, # 이보다 큰 SVG는 래스터화하지 않음
+    "svg_min_dimension": 256,         # 작은 아이콘 SVG는 긴 변이 이 크기가 되도록 확대
+}
+
+# alt-text 생성 전 이미지 중복 제거 설정
+DEDUP_CONFIG = {
+    "enabled": True,
+    "hash": "content",                # 수집 후 묶는 기준 - "content": 정규화된 바이트 sha256, "perceptual": dHash
+    # URL 정규화 시 무시하는 쿼리 파라미터 (크기 조정/형식/캐시 무효화용)
+    "ignored_query_params": {
+        "w", "h", "width", "height", "size", "resize", "fit", "crop", "dpr", "q", "quality",
+        "fm", "format", "auto", "v", "ver", "version", "t", "ts", "cb", "cache", "_", "itok",
+    },
+}
+
+# 프롬프트 컨텍스트 토큰 예산
+CONTEXT_CONFIG = {
+    "max_tokens": 500,                # 이미지 1개의 프롬프트에 넣는 컨텍스트 최대 토큰 수
+    "local_max_tokens": 200,          # 그중 이미지 주변 컨텍스트(캡션, 주변 문단 등)에 쓰는 최대 토큰 수
+}
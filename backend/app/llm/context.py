@@ -0,0 +1,39 @@
+"""
+프롬프트용 컨텍스트 구성
+- 이미지 주변(local) 컨텍스트를 우선 넣고, 남은 토큰 예산만큼 페이지 전체 컨텍스트를 잘라서 추가
+"""
+
+from .config import CONTEXT_CONFIG
+
+# estimate_tokens와 같은 기준 (4자 ≈ 1토큰)
+CHARS_PER_TOKEN = 4
+
+
+def trim_to_tokens(text: str, max_tokens: int) -> str:
+    """max_tokens 이하로 자르기 (단어 중간에서 자르지 않음)"""
+    text = (text or "").strip()
+    max_chars = max(0, max_tokens) * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    if " " in cut:
+        cut = cut.rsplit(" ", 1)[0]
+    return cut + " …"
+
+
+def build_prompt_context(page_context: str = "", local_context: str = "", max_tokens: int = None) -> str:
+    """
+    이미지 하나의 프롬프트 컨텍스트
+
+    local_context(캡션, 주변 문단 등)는 local_max_tokens까지, 페이지 컨텍스트는 남은 예산만큼만 포함
+    """
+    max_tokens = max_tokens or CONTEXT_CONFIG["max_tokens"]
+    parts = []
+    local = trim_to_tokens(local_context, min(max_tokens, CONTEXT_CONFIG["local_max_tokens"]))
+    if local:
+        parts.append(f"image context: {local}")
+    remaining = max_tokens - len(local) // CHARS_PER_TOKEN
+    page = trim_to_tokens(page_context, remaining)
+    if page:
+        parts.append(page)
+    return "\n".join(parts)
@@ -0,0 +1,116 @@
+"""
+LLM 호출 전 이미지 중복 제거
+
+같은 이미지가 쿼리 문자열, srcset 변형, CDN 호스트만 다르게 여러 번 나오는 경우
+수집(다운로드)한 이미지의 내용/지각 해시로 묶어 고유 이미지마다 한 번만 생성하고 결과를 모든 위치에 나눠줌
+
+URL이 같으면 해시 계산(수집)만 공유하고, 결과를 공유할지는 항상 내용 해시로 결정
+(-300x200 같은 파일은 잘라낸 다른 이미지인 경우가 많아 정규화된 URL만으로는 같은 이미지라고 볼 수 없음)
+normalize_image_url은 alt 일괄 수정의 URL 매칭에 사용
+"""
+
+import re
+import asyncio
+import logging
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from .cache import hash_text
+from .config import DEDUP_CONFIG
+from .image_utils import image_content_hash, image_perceptual_hash
+
+# 이미지 1개당 LLM 호출 수 (분류 + 생성/수정)
+LLM_CALLS_PER_IMAGE = 2
+
+# 파일명 끝의 크기/배율 접미사: photo-300x200.jpg, icon@2x.png
+SIZE_SUFFIX_PATTERN = re.compile(r"(-\d+x\d+|@\d(?:\.\d+)?x)(?=\.[A-Za-z0-9]+$)")
+
+
+def normalize_image_url(image_url: str) -> str:
+    """
+    중복 판단용 URL 정규화
+
+    - scheme/host 소문자, 기본 포트 제거
+    - 크기 조정/캐시 무효화용 쿼리 파라미터 제거, 나머지는 정렬
+    - 파일명의 -WxH, @2x 접미사 제거
+    """
+    if image_url.startswith("data:"):
+        return "data:" + hash_text(image_url)
+    parts = urlsplit(image_url)
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    ignored = DEDUP_CONFIG["ignored_query_params"]
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in ignored
+    )
+    path = SIZE_SUFFIX_PATTERN.sub("", parts.path)
+    return urlunsplit(((parts.scheme or "https").lower(), host, path, urlencode(query), ""))
+
+
+def image_identity_hash(image_url: str) -> str:
+    """수집된 이미지의 내용 해시 (DEDUP_CONFIG["hash"]가 "perceptual"이면 dHash)"""
+    if DEDUP_CONFIG["hash"] == "perceptual":
+        return image_perceptual_hash(image_url)
+    return image_content_hash(image_url)
+
+
+class AltTextDeduper:
+    """
+    한 요청(페이지) 안에서 같은 이미지의 alt-text 생성을 한 번으로 합침
+
+    generate_fn(image_url, alt_text, is_button, context, bypass_cache)는
+    get_ai_generated_alt_text와 같은 5-튜플을 반환해야 함
+    결과는 이미지 내용 해시와 기존 alt text, 버튼 여부, 컨텍스트까지 같을 때만 공유 (프롬프트 입력이 같아야 하므로)
+    """
+
+    def __init__(self, generate_fn, bypass_cache: bool = False):
+        self.generate_fn = generate_fn
+        self.bypass_cache = bypass_cache
+        self._hashes = {}
+        self._by_content = {}
+        self.images = 0
+
+    async def generate(self, image_url: str, alt_text: str, is_button: bool = False, context: str = "", bypass_cache: bool = None):
+        self.images += 1
+        bypass_cache = self.bypass_cache if bypass_cache is None else bypass_cache
+        if not DEDUP_CONFIG["enabled"]:
+            return await self.generate_fn(image_url, alt_text, is_button, context, bypass_cache)
+
+        # 같은 URL은 해시 계산(이미지 수집)을 한 번만 수행
+        hash_task = self._hashes.get(image_url)
+        if hash_task is None:
+            hash_task = asyncio.ensure_future(self._identity_hash(image_url))
+            self._hashes[image_url] = hash_task
+        # 여러 위치가 같은 작업을 기다리므로 한 곳이 취소되어도 공유 작업은 계속 실행
+        identity = await asyncio.shield(hash_task)
+
+        content_key = (identity, alt_text, bool(is_button), hash_text(context), bool(bypass_cache))
+        task = self._by_content.get(content_key)
+        if task is None:
+            task = asyncio.ensure_future(self.generate_fn(image_url, alt_text, is_button, context, bypass_cache))
+            self._by_content[content_key] = task
+        result = await asyncio.shield(task)
+        image_type, ai_generated_alt_text, ai_modified_alt_text = result[2:]
+        return image_url, alt_text, image_type, ai_generated_alt_text, ai_modified_alt_text
+
+    async def _identity_hash(self, image_url: str) -> str:
+        try:
+            return await asyncio.to_thread(image_identity_hash, image_url)
+        except Exception as e:
+            logging.warning(f"중복 제거용 해시 계산 실패: {image_url} ({e})")
+            return "url:" + image_url
+
+    def stats(self) -> dict:
+        unique_images = len(self._by_content) if DEDUP_CONFIG["enabled"] else self.images
+        return {
+            "images": self.images,
+            "unique_urls": len(self._hashes) if DEDUP_CONFIG["enabled"] else self.images,
+            "unique_images": unique_images,
+            "llm_calls_saved": (self.images - unique_images) * LLM_CALLS_PER_IMAGE,
+        }
+
+    def cancel(self):
+        """요청이 중단되었을 때 진행 중인 공유 작업 취소"""
+        for task in list(self._hashes.values()) + list(self._by_content.values()):
+            task.cancel()
@@ -1,23 +1,32 @@
 """
 이미지 처리 유틸리티 함수들
+- 이미지 수집(ingest): URL당 한 번만 다운로드 → 크기/형식 정규화 → 내용 주소 기반 바이트 캐시
 - 로컬 이미지 base64 변환
 - SVG → PNG 변환
 - 이미지 압축
+- 이미지 내용 해시 (캐시 키)
 """
 
 import os
 import base64
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+import httpx
 import cairosvg
 from PIL import Image
 import io
 
+from .cache import get_cache, resolve_cache_path
+from .config import IMAGE_INGEST_CONFIG
+
 # 프로젝트 루트 경로
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-# SVG 캐시 디렉토리
-SVG_CACHE_DIR = os.path.join(PROJECT_ROOT, "backend", "app", "svg_data_cache")
-
 # 로컬 이미지 매핑 (URL에 포함된 파일명 → 로컬 경로)
 LOCAL_IMAGES = {
     "denver-cropped.png": os.path.join(PROJECT_ROOT, "images", "denver-cropped.png"),
@@ -36,6 +45,500 @@ def sanitize_image_url_for_logging(image_url: str) -> str:
     return image_url
 
 
+def prompt_image_reference(image_url: str) -> str:
+    """
+    프롬프트 텍스트에 넣을 이미지 참조
+    ingest가 만든 data URL이면 원본 URL을, 그 외 data URL은 축약형을 반환 (base64를 텍스트로 보내지 않음)
+    """
+    if not image_url.startswith("data:"):
+        return image_url
+    source_url = _source_urls.get(_text_sha256(image_url))
+    return source_url or sanitize_image_url_for_logging(image_url)
+
+
+def image_content_hash(image_url: str) -> str:
+    """
+    이미지 내용 기준 sha256 (캐시 키용)
+
+    data URL은 payload를, 원격 URL은 수집(정규화)된 바이트를 해시하며,
+    다운로드에 실패하면 URL 자체의 해시를 사용
+    """
+    return _image_fingerprint(image_url)["sha256"]
+
+
+def image_perceptual_hash(image_url: str) -> str:
+    """
+    이미지 dHash (64bit hex) - 리사이즈/재압축된 같은 이미지는 같은 값
+    디코딩할 수 없거나 dHash가 모두 0/1인 이미지(단색, 밝기 변화가 거의 없는 아이콘 등 서로 다른 이미지가
+    같은 값을 갖기 쉬운 경우)는 image_content_hash로 대체
+    """
+    fingerprint = _image_fingerprint(image_url)
+    dhash = fingerprint["dhash"]
+    if not dhash or dhash in _DEGENERATE_DHASHES:
+        return fingerprint["sha256"]
+    return dhash
+
+
+def _image_fingerprint(image_url: str) -> dict:
+    if image_url.startswith("data:"):
+        data = _decode_data_url(image_url)
+        sha256 = hashlib.sha256(data).hexdigest()
+        # ingest에서 이미 계산한 지문이면 다시 디코딩하지 않음
+        known = _fingerprints.get(sha256)
+        return known if known is not None else _fingerprint_bytes(data)
+    try:
+        return ingest_image(image_url).fingerprint
+    except Exception as e:
+        logging.warning(f"이미지 해시 계산 실패, URL로 대체: {image_url} ({e})")
+        return {"sha256": "url:" + hashlib.sha256(image_url.encode("utf-8")).hexdigest(), "dhash": None}
+
+
+def _decode_data_url(data_url: str) -> bytes:
+    header, _, payload = data_url.partition(",")
+    if header.endswith(";base64"):
+        return base64.b64decode(payload)
+    return payload.encode("utf-8")
+
+
+def _fingerprint_bytes(data: bytes) -> dict:
+    return {"sha256": hashlib.sha256(data).hexdigest(), "dhash": _dhash(data)}
+
+
+def _dhash(data: bytes, hash_size: int = 8):
+    """difference hash: 회색조 (hash_size+1)x(hash_size) 축소 후 인접 픽셀 밝기 비교"""
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            return _dhash_image(img, hash_size)
+    except Exception:
+        return None
+
+
+class _BoundedDict:
+    """최근 사용 순서로 max_items개까지만 보관하는 스레드 안전 dict"""
+
+    def __init__(self, max_items: int):
+        self.max_items = max_items
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._items:
+                return None
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+
+# sha256 → {"sha256", "dhash"} (ingest 결과 재사용), data URL 해시 → 원본 URL (프롬프트 텍스트용)
+_fingerprints = _BoundedDict(IMAGE_INGEST_CONFIG["memory_cache_items"] * 4)
+_source_urls = _BoundedDict(IMAGE_INGEST_CONFIG["memory_cache_items"] * 4)
+
+
+def _text_sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class IngestedImage:
+    """정규화가 끝난 이미지 (data: 바이트, sha256: 정규화된 바이트 기준 내용 주소)"""
+
+    def __init__(self, data: bytes, mime_type: str, width: int, height: int, source_bytes: int, dhash: str = None):
+        self.data = data
+        self.mime_type = mime_type
+        self.width = width
+        self.height = height
+        self.source_bytes = source_bytes
+        self.sha256 = hashlib.sha256(data).hexdigest()
+        self.dhash = dhash
+
+    @property
+    def fingerprint(self) -> dict:
+        return {"sha256": self.sha256, "dhash": self.dhash}
+
+    def to_data_url(self) -> str:
+        return f"data:{self.mime_type};base64,{base64.b64encode(self.data).decode('utf-8')}"
+
+    def to_meta(self) -> dict:
+        return {
+            "sha256": self.sha256,
+            "mime_type": self.mime_type,
+            "width": self.width,
+            "height": self.height,
+            "source_bytes": self.source_bytes,
+            "dhash": self.dhash,
+        }
+
+
+class ImageByteCache:
+    """
+    내용 주소(sha256) 기반 이미지 바이트 캐시
+
+    - 메모리: 최근 사용한 이미지를 memory_cache_bytes까지 보관
+    - 디스크: disk_cache_dir/<sha 앞 2자리>/<sha> 파일 (워커 프로세스 간 공유)
+    - URL → 메타데이터(sha256, 크기, 형식)는 ResultCache "image_ingest" namespace에 TTL과 함께 저장
+    """
+
+    def __init__(self, directory: str = None, memory_bytes: int = None):
+        self.directory = resolve_cache_path(directory or IMAGE_INGEST_CONFIG["disk_cache_dir"])
+        self.memory_bytes = memory_bytes or IMAGE_INGEST_CONFIG["memory_cache_bytes"]
+        self._memory = OrderedDict()
+        self._memory_size = 0
+        self._lock = threading.Lock()
+        self.meta = get_cache(
+            "image_ingest",
+            ttl=IMAGE_INGEST_CONFIG["url_ttl"],
+            max_entries=IMAGE_INGEST_CONFIG["url_max_entries"],
+        )
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, sha256: str) -> str:
+        return os.path.join(self.directory, sha256[:2], sha256)
+
+    def get_bytes(self, sha256: str):
+        with self._lock:
+            data = self._memory.get(sha256)
+            if data is not None:
+                self._memory.move_to_end(sha256)
+                _ingest_stats["memory_hits"] += 1
+                return data
+        try:
+            with open(self._path(sha256), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        _ingest_stats["disk_hits"] += 1
+        self._remember(sha256, data)
+        return data
+
+    def put_bytes(self, sha256: str, data: bytes):
+        path = self._path(sha256)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # 다른 워커가 동시에 쓰더라도 내용이 같으므로 임시 파일 후 rename
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        self._remember(sha256, data)
+
+    def _remember(self, sha256: str, data: bytes):
+        with self._lock:
+            if sha256 in self._memory:
+                self._memory.move_to_end(sha256)
+                return
+            self._memory[sha256] = data
+            self._memory_size += len(data)
+            while self._memory_size > self.memory_bytes and len(self._memory) > 1:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_size -= len(evicted)
+
+    def get(self, key: str):
+        """key(URL 또는 원본 바이트 해시)로 저장된 IngestedImage (없으면 None)"""
+        meta = self.meta.get(key)
+        if meta is None:
+            return None
+        data = self.get_bytes(meta["sha256"])
+        if data is None:
+            return None
+        return IngestedImage(data, meta["mime_type"], meta["width"], meta["height"], meta["source_bytes"], meta["dhash"])
+
+    def put(self, key: str, image: IngestedImage):
+        self.put_bytes(image.sha256, image.data)
+        self.meta.set(key, image.to_meta())
+
+
+_byte_cache = None
+_http_client = None
+_singleton_lock = threading.Lock()
+# 같은 URL을 여러 스레드가 동시에 수집하지 않도록 URL 해시별 lock
+_key_locks = [threading.Lock() for _ in range(64)]
+_ingest_stats = {
+    "ingested": 0,
+    "memory_hits": 0,
+    "disk_hits": 0,
+    "failures": 0,
+    "svg_rasterized": 0,
+    "svg_timeouts": 0,
+    "svg_cache_hits": 0,
+    "source_bytes": 0,
+    "normalized_bytes": 0,
+}
+
+
+def get_image_byte_cache() -> ImageByteCache:
+    """프로세스 전역 ImageByteCache 반환 (최초 호출 시 생성)"""
+    global _byte_cache
+    with _singleton_lock:
+        if _byte_cache is None:
+            _byte_cache = ImageByteCache()
+        return _byte_cache
+
+
+def get_image_http_client() -> httpx.Client:
+    """이미지 다운로드용 프로세스 전역 httpx.Client (커넥션 풀 공유, 스레드 안전)"""
+    global _http_client
+    with _singleton_lock:
+        if _http_client is None:
+            _http_client = httpx.Client(
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=IMAGE_INGEST_CONFIG["max_connections"],
+                    max_keepalive_connections=IMAGE_INGEST_CONFIG["max_connections"],
+                ),
+                timeout=httpx.Timeout(IMAGE_INGEST_CONFIG["timeout"]),
+                headers={"User-Agent": IMAGE_INGEST_CONFIG["user_agent"]},
+            )
+        return _http_client
+
+
+def close_image_http_client():
+    global _http_client
+    with _singleton_lock:
+        if _http_client is not None:
+            _http_client.close()
+            _http_client = None
+
+
+def image_ingest_stats() -> dict:
+    stats = dict(_ingest_stats)
+    if stats["source_bytes"]:
+        stats["byte_ratio"] = round(stats["normalized_bytes"] / stats["source_bytes"], 4)
+    return stats
+
+
+def fetch_image_bytes(image_url: str) -> bytes:
+    """풀링된 클라이언트로 이미지 다운로드 (max_download_bytes를 넘으면 중단)"""
+    max_bytes = IMAGE_INGEST_CONFIG["max_download_bytes"]
+    with get_image_http_client().stream("GET", image_url) as response:
+        response.raise_for_status()
+        chunks = []
+        size = 0
+        for chunk in response.iter_bytes():
+            size += len(chunk)
+            if size > max_bytes:
+                raise ValueError(f"이미지가 너무 큽니다 (>{max_bytes} bytes): {image_url}")
+            chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def normalize_image(data: bytes) -> IngestedImage:
+    """
+    이미지를 max_dimension 이하로 축소하고 JPEG로 변환 (투명 배경은 흰색, 애니메이션 GIF는 첫 프레임)
+    이미 작은 JPEG/PNG/WebP는 그대로 사용하고, 다시 인코딩해도 작아지지 않으면 원본을 유지
+    """
+    max_dimension = IMAGE_INGEST_CONFIG["max_dimension"]
+    with Image.open(io.BytesIO(data)) as img:
+        source_format = (img.format or "").upper()
+        # 애니메이션 이미지는 열린 직후의 첫 프레임만 사용
+        frame = img.copy()
+
+    dhash = _dhash_image(frame)
+    passthrough = source_format in ("JPEG", "PNG", "WEBP")
+    resized = max(frame.size) > max_dimension
+    if passthrough and not resized and len(data) <= IMAGE_INGEST_CONFIG["passthrough_max_bytes"]:
+        return IngestedImage(data, Image.MIME[source_format], frame.width, frame.height, len(data), dhash)
+
+    frame = _flatten_alpha(frame)
+
+    frame.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+    buffer = io.BytesIO()
+    frame.save(buffer, format="JPEG", quality=IMAGE_INGEST_CONFIG["jpeg_quality"], optimize=True)
+    normalized = buffer.getvalue()
+    if passthrough and not resized and len(normalized) >= len(data):
+        return IngestedImage(data, Image.MIME[source_format], frame.width, frame.height, len(data), dhash)
+    return IngestedImage(normalized, "image/jpeg", frame.width, frame.height, len(data), dhash)
+
+
+def ingest_image(image_url: str) -> IngestedImage:
+    """
+    이미지 수집: 다운로드(또는 로컬 파일/SVG 변환/data URL 디코딩) → 정규화 → 바이트 캐시
+
+    같은 URL은 url_ttl 동안 다시 다운로드하지 않고, 같은 내용은 한 번만 저장되므로
+    alt-text 생성, 이미지 분류, 번역이 모두 같은 바이트를 재사용
+    """
+    cache = get_image_byte_cache()
+    if image_url.startswith("data:"):
+        source = _decode_data_url(image_url)
+        key = "data:" + hashlib.sha256(source).hexdigest()
+    else:
+        source = None
+        key = "url:" + image_url
+
+    with _key_locks[hash(key) % len(_key_locks)]:
+        image = cache.get(key)
+        if image is None:
+            try:
+                if source is None:
+                    source = _load_source_bytes(image_url)
+                if is_svg(source):
+                    image = _ingest_svg(source, cache)
+                else:
+                    image = normalize_image(source)
+            except Exception:
+                _ingest_stats["failures"] += 1
+                raise
+            cache.put(key, image)
+            _ingest_stats["ingested"] += 1
+            _ingest_stats["source_bytes"] += image.source_bytes
+            _ingest_stats["normalized_bytes"] += len(image.data)
+            logging.info(
+                f"이미지 수집: {sanitize_image_url_for_logging(image_url)} "
+                f"{image.source_bytes} → {len(image.data)} bytes ({image.width}x{image.height})"
+            )
+
+    _fingerprints.set(image.sha256, image.fingerprint)
+    return image
+
+
+def _load_source_bytes(image_url: str) -> bytes:
+    # 1. 로컬 하드코딩 이미지
+    for img_name, img_path in LOCAL_IMAGES.items():
+        if img_name in image_url and os.path.exists(img_path):
+            with open(img_path, "rb") as f:
+                return f.read()
+    # 2. 원격 이미지 (SVG도 원본 바이트를 받아 ingest_image에서 래스터화)
+    return fetch_image_bytes(image_url)
+
+
+def is_svg(data: bytes) -> bool:
+    """내용으로 SVG 여부 판단 (URL 확장자가 없거나 data:image/svg+xml인 경우 포함)"""
+    head = data[:1024].lstrip().lower()
+    return head.startswith(b"<svg") or (head.startswith(b"<?xml") and b"<svg" in head) or (head.startswith(b"<!--") and b"<svg" in head)
+
+
+def _ingest_svg(svg_bytes: bytes, cache: "ImageByteCache") -> IngestedImage:
+    """SVG 내용 해시로 캐시된 래스터 이미지를 재사용하고, 없으면 프로세스 풀에서 래스터화"""
+    if len(svg_bytes) > IMAGE_INGEST_CONFIG["svg_max_bytes"]:
+        raise ValueError(f"SVG가 너무 큽니다 (>{IMAGE_INGEST_CONFIG['svg_max_bytes']} bytes)")
+    key = "svg:" + hashlib.sha256(svg_bytes).hexdigest()
+    image = cache.get(key)
+    if image is not None:
+        _ingest_stats["svg_cache_hits"] += 1
+        return image
+    pool = get_svg_process_pool()
+    future = pool.submit(
+        rasterize_svg, svg_bytes, IMAGE_INGEST_CONFIG["svg_min_dimension"], IMAGE_INGEST_CONFIG["max_dimension"]
+    )
+    try:
+        png = future.result(timeout=IMAGE_INGEST_CONFIG["svg_timeout"])
+    except FutureTimeoutError:
+        # result(timeout)은 기다리기만 멈추고 워커의 렌더링은 계속되므로, 워커를 종료하고 풀을 새로 만듦
+        _ingest_stats["svg_timeouts"] += 1
+        _recycle_svg_process_pool(pool)
+        raise TimeoutError(f"SVG 래스터화 시간 초과 (>{IMAGE_INGEST_CONFIG['svg_timeout']}s)")
+    except BrokenProcessPool:
+        # 다른 SVG의 시간 초과로 풀이 교체되었거나 워커가 비정상 종료됨
+        _recycle_svg_process_pool(pool)
+        raise
+    _ingest_stats["svg_rasterized"] += 1
+    image = normalize_image(png)
+    image.source_bytes = len(svg_bytes)
+    cache.put(key, image)
+    return image
+
+
+def rasterize_svg(svg_bytes: bytes, min_dimension: int, max_dimension: int) -> bytes:
+    """
+    SVG → PNG 바이트 (파일 없이 메모리에서 변환, 프로세스 풀에서 실행되므로 모듈 최상위 함수)
+    긴 변이 [min_dimension, max_dimension] 범위에 들어오도록 배율 조정 (작은 아이콘은 확대)
+    """
+    png = cairosvg.svg2png(bytestring=svg_bytes)
+    with Image.open(io.BytesIO(png)) as img:
+        longest = max(img.size)
+    if longest == 0:
+        return png
+    if longest > max_dimension:
+        scale = max_dimension / longest
+    elif longest < min_dimension:
+        scale = min_dimension / longest
+    else:
+        return png
+    return cairosvg.svg2png(bytestring=svg_bytes, scale=scale)
+
+
+_svg_pool = None
+
+
+def get_svg_process_pool() -> ProcessPoolExecutor:
+    """
+    SVG 래스터화용 프로세스 풀 (cairosvg의 CPU 작업이 요청 스레드/GIL을 막지 않도록 함)
+
+    스레드가 많은 서버 프로세스에서 fork하면 다른 스레드가 잡고 있던 락까지 복사되므로
+    forkserver(없으면 spawn)로 워커를 시작
+    """
+    global _svg_pool
+    with _singleton_lock:
+        if _svg_pool is None:
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _svg_pool = ProcessPoolExecutor(
+                max_workers=IMAGE_INGEST_CONFIG["svg_workers"],
+                mp_context=multiprocessing.get_context(start_method),
+            )
+        return _svg_pool
+
+
+def _recycle_svg_process_pool(pool: ProcessPoolExecutor):
+    """
+    멈춘 워커가 있는 풀을 폐기 (워커 프로세스를 강제 종료하고, 다음 호출에서 새 풀 생성)
+    같은 풀에서 진행 중이던 다른 래스터화는 BrokenProcessPool로 실패함
+    """
+    global _svg_pool
+    with _singleton_lock:
+        if _svg_pool is pool:
+            _svg_pool = None
+    # ProcessPoolExecutor는 실행 중인 작업을 중단하는 공개 API가 없어 워커 프로세스를 직접 종료
+    for process in list((getattr(pool, "_processes", None) or {}).values()):
+        if process.is_alive():
+            process.kill()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_svg_process_pool():
+    global _svg_pool
+    with _singleton_lock:
+        if _svg_pool is not None:
+            _svg_pool.shutdown(wait=False, cancel_futures=True)
+            _svg_pool = None
+
+
+_DEGENERATE_DHASHES = {"dhash:" + "0" * 16, "dhash:" + "f" * 16}
+
+
+def _flatten_alpha(img: Image.Image) -> Image.Image:
+    """투명 배경을 흰색으로 채운 RGB 이미지 (투명 이미지가 아니면 RGB로만 변환)"""
+    if img.mode in ("RGBA", "LA", "P"):
+        img = img.convert("RGBA")
+        background = Image.new("RGB", img.size, (255, 255, 255))
+        background.paste(img, mask=img.split()[-1])
+        return background
+    return img if img.mode == "RGB" else img.convert("RGB")
+
+
+def _dhash_image(img: Image.Image, hash_size: int = 8):
+    """
+    difference hash - 투명 배경을 흰색으로 채운 뒤 계산
+    (convert("L")은 알파를 버리므로, 그대로 계산하면 투명 배경 위의 어두운 도형은 모두 0000...이 됨)
+    """
+    try:
+        grayscale = _flatten_alpha(img).convert("L")
+        pixels = list(grayscale.resize((hash_size + 1, hash_size), Image.Resampling.LANCZOS).getdata())
+    except Exception:
+        return None
+    bits = 0
+    for row in range(hash_size):
+        for col in range(hash_size):
+            left = pixels[row * (hash_size + 1) + col]
+            right = pixels[row * (hash_size + 1) + col + 1]
+            bits = (bits << 1) | (left > right)
+    return "dhash:" + format(bits, f"0{hash_size * hash_size // 4}x")
+
+
 def compress_image(image_path: str, max_size: int = 1024) -> bytes:
     """이미지를 압축하여 바이트로 반환 (최대 크기: max_size px)"""
     with Image.open(image_path) as img:
@@ -58,43 +561,19 @@ def compress_image(image_path: str, max_size: int = 1024) -> bytes:
 
 def convert_svg_to_png_base64(svg_url: str) -> str:
     """
-    SVG URL을 PNG로 변환하고 base64 데이터 URL로 반환
+    SVG URL을 PNG로 변환하고 base64 데이터 URL로 반환 (메모리에서 변환, SVG 내용 해시로 캐시)
     """
     logging.info(f"Converting SVG to PNG: {svg_url}")
-    
-    # SVG 캐시 디렉토리 생성
-    if not os.path.exists(SVG_CACHE_DIR):
-        os.makedirs(SVG_CACHE_DIR)
-    
-    # 파일명 생성
-    file_name = svg_url.split("/")[-1]
-    png_filename = file_name.replace(".svg", ".png")
-    png_path = os.path.join(SVG_CACHE_DIR, png_filename)
-    
-    # SVG를 PNG로 변환
-    cairosvg.svg2png(url=svg_url, write_to=png_path)
-    
-    # PNG 파일을 base64로 인코딩
-    with open(png_path, 'rb') as png_file:
-        png_data = base64.b64encode(png_file.read()).decode('utf-8')
-    
-    # 캐시된 PNG 파일 삭제 (메모리 관리)
-    try:
-        os.remove(png_path)
-    except Exception as e:
-        logging.warning(f"Failed to remove cached PNG file: {e}")
-    
-    return f"data:image/png;base64,{png_data}"
+    return ingest_image(svg_url).to_data_url()
 
 
 def process_image_url(image_url: str) -> str:
     """
     이미지 URL을 처리하여 OpenAI Vision API가 사용할 수 있는 형태로 변환
     
-    처리 순서:
-    1. 로컬 하드코딩 이미지 체크 (denver, jenny)
-    2. SVG 체크 및 변환
-    3. 그대로 반환 (외부 URL)
+    ingest_image로 한 번만 다운로드/정규화한 이미지를 data URL로 반환하므로
+    제공자가 원본(큰 JPEG, 애니메이션 GIF 등)을 매번 다시 받지 않음
+    수집에 실패하면 원본 URL을 그대로 반환 (제공자가 직접 다운로드)
     
     Args:
         image_url: 원본 이미지 URL
@@ -102,24 +581,14 @@ def process_image_url(image_url: str) -> str:
     Returns:
         처리된 이미지 URL (base64 또는 원본)
     """
-    # 1. 로컬 이미지 체크
-    for img_name, img_path in LOCAL_IMAGES.items():
-        if img_name in image_url:
-            if os.path.exists(img_path):
-                # 이미지 압축 (1024px 이하, JPEG 품질 92)
-                compressed_data = compress_image(img_path, max_size=1024)
-                base64_url = f"data:image/jpeg;base64,{base64.b64encode(compressed_data).decode('utf-8')}"
-                logging.info(f"✅ Converted {img_name} to compressed base64 (size: {len(compressed_data)} bytes)")
-                return base64_url
-            else:
-                logging.error(f"❌ Local file not found: {img_path}")
-            break
-    
-    # 2. SVG 체크
-    if image_url.strip().lower().endswith('.svg'):
-        logging.info(f"SVG detected, converting to PNG: {image_url}")
-        return convert_svg_to_png_base64(image_url)
-    
-    # 3. 그대로 반환
-    return image_url
-
+    if not IMAGE_INGEST_CONFIG["enabled"]:
+        return image_url
+    try:
+        image = ingest_image(image_url)
+    except Exception as e:
+        logging.warning(f"이미지 수집 실패, 원본 URL 사용: {sanitize_image_url_for_logging(image_url)} ({e})")
+        return image_url
+    data_url = image.to_data_url()
+    if not image_url.startswith("data:"):
+        _source_urls.set(_text_sha256(data_url), image_url)
+    return data_url
@@ -0,0 +1,229 @@
+"""
+프로세스 전역 LLM 호출 스케줄러
+- 동시 실행 수 제한 (max_in_flight)
+- 분당 요청 수(RPM) / 분당 토큰 수(TPM) 토큰 버킷
+- 429 / Retry-After 응답 시 전체 호출을 일시 정지하고 동시 실행 수를 줄임 (성공 시 점진 복구)
+- API 요청(client_id)별 대기열을 라운드로빈으로 처리해 한 요청이 다른 요청을 굶기지 않도록 함
+"""
+
+import time
+import asyncio
+import logging
+import contextvars
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+
+from .config import LLM_RATE_LIMIT_CONFIG
+
+# 현재 LLM 호출을 발생시킨 API 요청 ID (main의 미들웨어에서 요청마다 설정)
+current_client_id = contextvars.ContextVar("llm_client_id", default="default")
+
+
+class TokenBucket:
+    """분당 rate_per_minute 만큼 채워지는 토큰 버킷"""
+
+    def __init__(self, rate_per_minute: float):
+        self.capacity = float(rate_per_minute)
+        self.tokens = self.capacity
+        self.refill_per_second = self.capacity / 60.0
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_per_second)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """amount 만큼 사용하려면 기다려야 하는 시간(초)"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_per_second
+
+    def consume(self, amount: float):
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+    def adjust(self, delta: float):
+        """예상치와 실제 사용량의 차이 보정 (음수가 되면 그만큼 다음 호출이 늦어짐)"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + delta)
+
+
+class _Grant:
+    def __init__(self, client_id: str, estimated_tokens: int):
+        self.client_id = client_id
+        self.estimated_tokens = estimated_tokens
+
+
+class LLMScheduler:
+    def __init__(
+        self,
+        max_in_flight: int = None,
+        requests_per_minute: int = None,
+        tokens_per_minute: int = None,
+    ):
+        self.max_in_flight = max_in_flight or LLM_RATE_LIMIT_CONFIG["max_in_flight"]
+        self.rpm = TokenBucket(requests_per_minute or LLM_RATE_LIMIT_CONFIG["requests_per_minute"])
+        self.tpm = TokenBucket(tokens_per_minute or LLM_RATE_LIMIT_CONFIG["tokens_per_minute"])
+
+        # 429를 받으면 줄어들고 성공할 때마다 1씩 회복하는 현재 동시 실행 한도
+        self.concurrency_limit = self.max_in_flight
+        self.in_flight = 0
+        self._paused_until = 0.0
+        self._queues = OrderedDict()
+        self._timer = None
+        self.stats = {
+            "granted": 0,
+            "rate_limited": 0,
+            "queued": 0,
+        }
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int, client_id: str = None):
+        """
+        LLM 호출 하나를 실행할 수 있을 때까지 대기
+
+        async with scheduler.slot(tokens) as grant:
+            response = await ...
+            scheduler.record_usage(grant, response.usage.total_tokens)
+        """
+        grant = await self.acquire(estimated_tokens, client_id)
+        try:
+            yield grant
+        finally:
+            self.release(grant)
+
+    async def acquire(self, estimated_tokens: int, client_id: str = None) -> _Grant:
+        client_id = client_id or current_client_id.get()
+        grant = _Grant(client_id, estimated_tokens)
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(client_id, deque()).append((future, grant))
+        self.stats["queued"] += 1
+        self._dispatch()
+        try:
+            return await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # 슬롯을 받은 직후 취소된 경우 반납
+                self.release(grant)
+            raise
+        finally:
+            self.stats["queued"] -= 1
+
+    def release(self, grant: _Grant):
+        self.in_flight -= 1
+        self._dispatch()
+
+    def record_usage(self, grant: _Grant, total_tokens: int):
+        """응답의 실제 토큰 사용량으로 TPM 버킷 보정, 성공한 호출이므로 동시 실행 한도 회복"""
+        if total_tokens:
+            self.tpm.adjust(grant.estimated_tokens - total_tokens)
+        if self.concurrency_limit < self.max_in_flight:
+            self.concurrency_limit += 1
+
+    def penalize(self, retry_after: float = None):
+        """429 응답: retry_after 동안 모든 호출을 멈추고 동시 실행 한도를 절반으로 줄임"""
+        retry_after = retry_after or LLM_RATE_LIMIT_CONFIG["default_retry_after"]
+        self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+        self.concurrency_limit = max(1, self.concurrency_limit // 2)
+        self.stats["rate_limited"] += 1
+        logging.warning(
+            f"LLM rate limit: {retry_after:.1f}초 대기, 동시 실행 한도 {self.concurrency_limit}/{self.max_in_flight}"
+        )
+
+    def snapshot(self) -> dict:
+        return {
+            **self.stats,
+            "in_flight": self.in_flight,
+            "concurrency_limit": self.concurrency_limit,
+            "waiting_clients": len(self._queues),
+            "paused_for": max(0.0, round(self._paused_until - time.monotonic(), 2)),
+        }
+
+    def _dispatch(self):
+        """대기 중인 호출에 라운드로빈으로 슬롯 배정 (한도에 걸리면 타이머로 재시도)"""
+        while self._queues and self.in_flight < self.concurrency_limit:
+            wait = self._paused_until - time.monotonic()
+            if wait > 0:
+                self._schedule(wait)
+                return
+
+            client_id, queue = next(iter(self._queues.items()))
+            future, grant = queue[0]
+            if future.done():
+                # 대기 중 취소된 호출
+                queue.popleft()
+                if not queue:
+                    del self._queues[client_id]
+                continue
+
+            wait = max(self.rpm.wait_time(1), self.tpm.wait_time(grant.estimated_tokens))
+            if wait > 0:
+                self._schedule(wait)
+                return
+
+            queue.popleft()
+            if queue:
+                self._queues.move_to_end(client_id)
+            else:
+                del self._queues[client_id]
+
+            self.rpm.consume(1)
+            self.tpm.consume(grant.estimated_tokens)
+            self.in_flight += 1
+            self.stats["granted"] += 1
+            future.set_result(grant)
+
+    def _schedule(self, delay: float):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = asyncio.get_running_loop().call_later(delay, self._on_timer)
+
+    def _on_timer(self):
+        self._timer = None
+        self._dispatch()
+
+
+def estimate_tokens(messages: list, max_output_tokens: int = None) -> int:
+    """메시지 텍스트 길이(4자 ≈ 1토큰)와 이미지 개수로 요청 토큰 수를 대략 추정"""
+    text_chars = 0
+    images = 0
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, str):
+            text_chars += len(content)
+            continue
+        for part in content or []:
+            if part.get("type") == "text":
+                text_chars += len(part.get("text", ""))
+            elif part.get("type") == "image_url":
+                images += 1
+    output_tokens = max_output_tokens or LLM_RATE_LIMIT_CONFIG["estimated_output_tokens"]
+    return text_chars // 4 + images * LLM_RATE_LIMIT_CONFIG["estimated_image_tokens"] + output_tokens
+
+
+def parse_retry_after(headers) -> float:
+    """retry-after-ms / retry-after 헤더를 초 단위로 변환 (없으면 None)"""
+    if headers is None:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000.0
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        return None
+    return None
+
+
+_scheduler = None
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """프로세스 전역 LLMScheduler 반환 (최초 호출 시 생성)"""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = LLMScheduler()
+    return _scheduler
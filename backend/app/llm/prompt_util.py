@@ -1,20 +1,179 @@
 from fastapi import HTTPException
+from pathlib import Path
+from string import Formatter
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
 import yaml
 
-# prompts.yaml 로드 함수
+# 실행 디렉토리와 무관하게 이 파일 옆의 prompts.yaml 사용
+PROMPTS_PATH = Path(__file__).parent / "prompts.yaml"
+
+# 파일 변경(mtime) 확인 주기(초)
+MTIME_CHECK_INTERVAL = 2.0
+
+# 코드(create_messages)가 프롬프트별로 넘기는 변수
+# 로드/다시 로드 시 user_prompt의 자리표시자가 이 안에 있는지 검사 (여기 없는 프롬프트는 검사하지 않음)
+PROMPT_VARIABLES = {
+    "enhanced_alt_text_generation": {"current_alt_text", "image_url", "image_type", "context"},
+    "image_classification": {"image_url"},
+}
+
+
+def validate_prompts(prompts: dict) -> list:
+    """PROMPT_VARIABLES와 맞지 않는 프롬프트의 오류 메시지 목록 (문제가 없으면 빈 리스트)"""
+    errors = []
+    for name, variables in PROMPT_VARIABLES.items():
+        prompt = prompts.get(name)
+        if prompt is None:
+            errors.append(f"'{name}' 프롬프트가 없습니다.")
+            continue
+        unknown = sorted(set(prompt.fields) - variables)
+        if unknown:
+            errors.append(f"'{name}'의 알 수 없는 변수: {', '.join(unknown)} (사용 가능: {', '.join(sorted(variables))})")
+    return errors
+
+
+class PromptTemplate:
+    """
+    파싱이 끝난 프롬프트 하나
+
+    - fields: user_prompt에 들어가는 변수 이름 (로드 시 한 번만 분석)
+    - version: 프롬프트 내용 해시 (캐시 키에 포함해 프롬프트가 바뀌면 이전 결과를 사용하지 않도록 함)
+    """
+
+    def __init__(self, data: dict):
+        self.raw = data
+        self.name = data["name"]
+        self.description = data.get("description", "")
+        self.system_prompt = data.get("system_prompt", "")
+        self.user_prompt = data.get("user_prompt", "")
+        self.fields = tuple(
+            field_name for _, field_name, _, _ in Formatter().parse(self.user_prompt) if field_name
+        )
+        raw = json.dumps(data, ensure_ascii=False, sort_keys=True)
+        self.version = hashlib.sha256(raw.encode("utf-8")).hexdigest()[:12]
+
+    def format_user(self, **variables) -> str:
+        """
+        user_prompt에 필요한 변수만 채워서 반환
+
+        빈 자리로 프롬프트가 전송되지 않도록 변수가 빠져 있으면 KeyError (빠진 변수 이름 포함)
+        """
+        missing = [field for field in self.fields if field not in variables]
+        if missing:
+            raise KeyError(f"'{self.name}' 프롬프트에 필요한 변수가 없습니다: {', '.join(missing)}")
+        return self.user_prompt.format(**{field: variables[field] for field in self.fields})
+
+    def __getitem__(self, key):
+        # 기존 dict 방식 접근 호환 (selected_prompt["system_prompt"])
+        return self.raw[key]
+
+
+class PromptRegistry:
+    """
+    prompts.yaml을 한 번만 읽어 이름으로 찾을 수 있게 보관
+
+    파일 mtime이 바뀌면 다음 조회 때 자동으로 다시 읽고, reload()로 강제로 다시 읽을 수도 있음
+    다시 읽은 프롬프트가 validate_prompts를 통과하지 못하면 이전 프롬프트를 계속 사용
+    (강제로 다시 읽을 때와 최초 로드 시에는 422 오류)
+    """
+
+    def __init__(self, path=PROMPTS_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._prompts = {}
+        self._data = None
+        self._mtime = None
+        self._checked_at = 0.0
+        self.version = None
+        self.reload(force=True)
+
+    def get(self, name: str) -> PromptTemplate:
+        self._reload_if_changed()
+        return self._prompts.get(name)
+
+    def names(self):
+        self._reload_if_changed()
+        return list(self._prompts.keys())
+
+    @property
+    def data(self) -> dict:
+        self._reload_if_changed()
+        return self._data
+
+    def reload(self, force: bool = False) -> bool:
+        """파일이 바뀌었거나 force=True이면 다시 읽음 (다시 읽었으면 True)"""
+        with self._lock:
+            try:
+                mtime = os.path.getmtime(self.path)
+            except FileNotFoundError:
+                raise HTTPException(status_code=500, detail="prompts.yaml 파일을 찾을 수 없습니다.")
+            self._checked_at = time.monotonic()
+            if not force and mtime == self._mtime:
+                return False
+
+            try:
+                with open(self.path, "r", encoding="utf-8") as file:
+                    content = file.read()
+                data = yaml.safe_load(content)
+            except FileNotFoundError:
+                raise HTTPException(status_code=500, detail="prompts.yaml 파일을 찾을 수 없습니다.")
+            except yaml.YAMLError:
+                raise HTTPException(status_code=500, detail="prompts.yaml 파일 파싱 에러")
+
+            prompts = {prompt["name"]: PromptTemplate(prompt) for prompt in data["prompts"]}
+            errors = validate_prompts(prompts)
+            if errors:
+                # 같은 파일을 주기마다 다시 검사하지 않도록 mtime은 기록
+                self._mtime = mtime
+                detail = "prompts.yaml 검증 실패 (이전 프롬프트 유지): " + "; ".join(errors)
+                logging.error(detail)
+                if force or not self._prompts:
+                    raise HTTPException(status_code=422, detail=detail)
+                return False
+
+            self._prompts = prompts
+            self._data = data
+            self._mtime = mtime
+            self.version = hashlib.sha256(content.encode("utf-8")).hexdigest()[:12]
+            logging.info(f"prompts.yaml 로드 완료: {len(self._prompts)}개, version={self.version}")
+            return True
+
+    def _reload_if_changed(self):
+        if time.monotonic() - self._checked_at >= MTIME_CHECK_INTERVAL:
+            self.reload()
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_prompt_registry() -> PromptRegistry:
+    """프로세스 전역 PromptRegistry 반환 (최초 호출 시 생성)"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = PromptRegistry()
+        return _registry
+
+
+# prompts.yaml 로드 함수 (캐시된 내용을 반환)
 def load_prompts():
-    try:
-        with open("llm/prompts.yaml", "r", encoding="utf-8") as file:
-            prompts = yaml.safe_load(file)
-            return prompts
-    except FileNotFoundError:
-        raise HTTPException(status_code=500, detail="prompts.yaml 파일을 찾을 수 없습니다.")
-    except yaml.YAMLError:
-        raise HTTPException(status_code=500, detail="prompts.yaml 파일 파싱 에러")
-    
+    return get_prompt_registry().data
+
 # 특정 프롬프트 찾기
 def get_prompt(prompts, name):
+    if prompts is None or prompts is get_prompt_registry().data:
+        return get_prompt_registry().get(name)
     for prompt in prompts["prompts"]:
         if prompt["name"] == name:
             return prompt
-    return None
\ No newline at end of file
+    return None
+
+# 프롬프트 버전 (캐시 키에 포함해 프롬프트가 바뀌면 이전 결과를 사용하지 않도록 함)
+def get_prompt_version(name):
+    return get_prompt_registry().get(name).version
@@ -7,10 +7,10 @@ AltCAT Translator Module
 3. Evaluator: 번역 품질 평가
 
 Usage:
-    from llm.translator import TranslatorPipeline, translate_with_pipeline
+    from llm.translator import get_translator_pipeline, translate_with_pipeline
     
-    # 클래스 사용
-    translator = TranslatorPipeline()
+    # 프로세스 전역 인스턴스 사용 (그래프는 생성 시 한 번만 컴파일)
+    translator = get_translator_pipeline()
     result = await translator.translate(
         original_alt_text="USCIS logo",
         target_language="ko",
@@ -25,6 +25,6 @@ Usage:
     )
 """
 
-from .translator import TranslatorPipeline, translate_with_pipeline
+from .translator import TranslatorPipeline, get_translator_pipeline, translator_stats, translate_with_pipeline
 
-__all__ = ["TranslatorPipeline", "translate_with_pipeline"] 
\ No newline at end of file
+__all__ = ["TranslatorPipeline", "get_translator_pipeline", "translator_stats", "translate_with_pipeline"] 
\ No newline at end of file
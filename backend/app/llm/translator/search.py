@@ -0,0 +1,188 @@
+"""
+가이드라인 에이전트용 검색 도구
+
+- CachedSearchTool: 검색 도구를 감싸 정규화된 검색어 기준으로 결과를 디스크(SQLite)에 캐시
+- LocalCorpusSearch: 네트워크 없이 로컬 JSON 코퍼스에서 검색 (부하 테스트/벤치마크용, 지연 시간 고정 가능)
+
+TRANSLATOR_CONFIG["search_backend"]로 "tavily" / "local" 중 선택
+"""
+
+import json
+import time
+import asyncio
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Type
+
+from pydantic import BaseModel, Field
+from langchain_core.tools import BaseTool
+
+from ..cache import get_cache, make_cache_key
+from ..config import CACHE_CONFIG, TRANSLATOR_CONFIG
+
+SEARCH_TOOL_NAME = "tavily_search_results_json"
+SEARCH_TOOL_DESCRIPTION = (
+    "A search engine optimized for comprehensive, accurate, and trusted results. "
+    "Useful for when you need to answer questions about current events. "
+    "Input should be a search query."
+)
+
+
+class SearchInput(BaseModel):
+    query: str = Field(description="search query to look up")
+
+
+def normalize_query(query: str) -> str:
+    """캐시 키용 검색어 정규화 (대소문자, 공백 차이 무시)"""
+    return " ".join((query or "").lower().split())
+
+
+def get_search_cache():
+    """검색 결과 캐시 (프로세스/워커 간 공유)"""
+    return get_cache(
+        "search_results",
+        ttl=CACHE_CONFIG["search_ttl"],
+        max_entries=CACHE_CONFIG["search_max_entries"],
+    )
+
+
+def is_cacheable_result(result: Any) -> bool:
+    """
+    캐시해도 되는 검색 결과인지 (결과 dict가 1개 이상인 리스트만)
+
+    TavilySearchResults는 실패 시 예외 대신 오류 문자열(repr(e))을 반환하므로,
+    문자열/빈 결과를 캐시하면 일시적인 429나 네트워크 오류가 search_ttl 동안 검색 결과로 쓰임
+    """
+    return (
+        isinstance(result, list)
+        and len(result) > 0
+        and all(isinstance(item, dict) for item in result)
+    )
+
+
+class CachedSearchTool(BaseTool):
+    """
+    검색 도구 캐시 래퍼
+
+    같은 검색어(정규화 기준)는 백엔드를 다시 호출하지 않고 캐시된 결과를 반환
+    오류 문자열이나 빈 결과는 캐시하지 않음 (is_cacheable_result)
+    도구 이름/설명은 감싼 도구와 같게 유지해 에이전트 프롬프트가 바뀌지 않도록 함
+    """
+
+    name: str = SEARCH_TOOL_NAME
+    description: str = SEARCH_TOOL_DESCRIPTION
+    args_schema: Type[BaseModel] = SearchInput
+    backend: BaseTool
+    backend_name: str = ""
+
+    def _cache_key(self, query: str) -> str:
+        return make_cache_key(self.backend_name, normalize_query(query))
+
+    def _run(self, query: str, **kwargs) -> Any:
+        cache = get_search_cache()
+        cache_key = self._cache_key(query)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+        result = self.backend.invoke({"query": query})
+        if is_cacheable_result(result):
+            cache.set(cache_key, result)
+        else:
+            logging.warning(f"Search result not cached: '{query}' ({str(result)[:200]})")
+        return result
+
+    async def _arun(self, query: str, **kwargs) -> Any:
+        cache = get_search_cache()
+        cache_key = self._cache_key(query)
+        cached = await asyncio.to_thread(cache.get, cache_key)
+        if cached is not None:
+            logging.info(f"Search cache hit: '{query}'")
+            return cached
+        result = await self.backend.ainvoke({"query": query})
+        if is_cacheable_result(result):
+            await asyncio.to_thread(cache.set, cache_key, result)
+        else:
+            logging.warning(f"Search result not cached: '{query}' ({str(result)[:200]})")
+        return result
+
+
+class LocalCorpusSearch(BaseTool):
+    """
+    로컬 JSON 코퍼스 검색 (네트워크 없이 번역 파이프라인을 테스트/벤치마크하기 위한 대체 백엔드)
+
+    코퍼스 형식: {"documents": [{"url": ..., "title": ..., "content": ...}, ...]}
+    검색어와 겹치는 단어 수로 점수를 매겨 상위 max_results개를 Tavily와 같은 형식으로 반환
+    latency_ms를 주면 매 검색마다 그만큼 대기 (항상 같은 지연 시간으로 측정)
+    """
+
+    name: str = SEARCH_TOOL_NAME
+    description: str = SEARCH_TOOL_DESCRIPTION
+    args_schema: Type[BaseModel] = SearchInput
+    corpus_path: str
+    max_results: int = 3
+    latency_ms: float = 0
+    documents: List[Dict[str, Any]] = []
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        with open(self.corpus_path, "r", encoding="utf-8") as f:
+            self.documents = json.load(f)["documents"]
+        for document in self.documents:
+            document["_terms"] = set(normalize_query(f"{document.get('title', '')} {document.get('content', '')}").split())
+        logging.info(f"Local search corpus loaded: {len(self.documents)} documents from {self.corpus_path}")
+
+    def _search(self, query: str) -> List[Dict[str, str]]:
+        terms = set(normalize_query(query).split())
+        scored = [
+            (len(terms & document["_terms"]), index, document)
+            for index, document in enumerate(self.documents)
+        ]
+        scored = [item for item in scored if item[0] > 0]
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [
+            {"url": document.get("url", ""), "content": document.get("content", "")}
+            for _, _, document in scored[:self.max_results]
+        ]
+
+    def _run(self, query: str, **kwargs) -> List[Dict[str, str]]:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        return self._search(query)
+
+    async def _arun(self, query: str, **kwargs) -> List[Dict[str, str]]:
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        return self._search(query)
+
+
+def resolve_corpus_path(path: str) -> str:
+    """상대 경로는 이 파일(llm/translator) 기준으로 해석"""
+    if Path(path).is_absolute():
+        return path
+    return str(Path(__file__).parent / path)
+
+
+def create_search_tool(backend: Optional[str] = None) -> BaseTool:
+    """설정에 맞는 검색 도구 생성 (CACHE_CONFIG["search_cache_enabled"]이면 캐시 래퍼 적용)"""
+    backend = backend or TRANSLATOR_CONFIG["search_backend"]
+    max_results = TRANSLATOR_CONFIG["search_max_results"]
+    if backend == "local":
+        tool = LocalCorpusSearch(
+            corpus_path=resolve_corpus_path(TRANSLATOR_CONFIG["search_corpus_path"]),
+            max_results=max_results,
+            latency_ms=TRANSLATOR_CONFIG["search_latency_ms"],
+        )
+    elif backend == "tavily":
+        from langchain_community.tools.tavily_search import TavilySearchResults
+        tool = TavilySearchResults(max_results=max_results)
+    else:
+        raise ValueError(f"Unknown search backend: {backend}")
+
+    if not (CACHE_CONFIG["enabled"] and CACHE_CONFIG["search_cache_enabled"]):
+        return tool
+    return CachedSearchTool(
+        name=tool.name,
+        description=tool.description,
+        backend=tool,
+        backend_name=f"{backend}:{max_results}",
+    )
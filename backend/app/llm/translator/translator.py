@@ -8,21 +8,32 @@ POC 검증된 로직을 그대로 사용:
 """
 
 import os
+import re
 import yaml
 import json
+import time
 import logging
 import asyncio
+import threading
 from typing import Dict, Any, Optional, List, TypedDict
 from pathlib import Path
-from ..image_utils import process_image_url
+from ..image_utils import process_image_url, image_perceptual_hash
+from ..cache import get_guideline_cache, make_cache_key, hash_text
+from ..config import CACHE_CONFIG, TRANSLATOR_CONFIG, LLM_RATE_LIMIT_CONFIG
+from .search import create_search_tool
+from ..limiter import get_llm_scheduler, parse_retry_after
 
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from pydantic import BaseModel, Field
 from langgraph.graph import StateGraph, END
 from langchain.agents import AgentExecutor, create_openai_tools_agent
-from langchain_community.tools.tavily_search import TavilySearchResults
 from langchain_core.messages import HumanMessage
+from openai import RateLimitError
+
+# translate_events: 그래프 실행 작업 → 이벤트 제너레이터 사이의 큐
+STREAM_QUEUE_SIZE = 64
+_STREAM_END = object()
 
 
 class GraphState(TypedDict):
@@ -35,12 +46,25 @@ class GraphState(TypedDict):
     
     # 생성 과정
     on_the_fly_guidelines: Optional[List[str]]
+    guideline_cache_key: Optional[str]
     generated_alt_text: Optional[str]
     
     # 평가 과정
     feedback: Optional[str]
     accessibility_score: Optional[int]
     cultural_score: Optional[int]
+
+    # 반복 예산 (생성+평가 1회 = 1 iteration)
+    refine_started_at: Optional[float]
+    iterations: int
+    tokens_spent: int
+    stale_iterations: int
+
+    # 지금까지 가장 점수가 높은 시도
+    best_alt_text: Optional[str]
+    best_accessibility_score: Optional[int]
+    best_cultural_score: Optional[int]
+    best_feedback: Optional[str]
     
     # 에러 처리
     error: Optional[str]
@@ -66,27 +90,46 @@ class TranslatorPipeline:
     def __init__(self, config_path: Optional[str] = None):
         """
         초기화 - POC와 동일한 구조
+
+        설정 로드, LLM/검색 도구 생성, 그래프 컴파일을 모두 여기서 한 번만 수행하므로
+        get_translator_pipeline()으로 프로세스 전역 인스턴스를 공유해서 사용
+        (요청별 상태는 그래프 입력으로만 전달)
         """
+        started_at = time.perf_counter()
         if config_path is None:
             config_path = Path(__file__).parent / "translator.yaml"
         
         self.config_path = config_path
         self.config = self._load_config()
+        # 가이드라인 프롬프트가 바뀌면 이전에 캐시된 가이드라인을 사용하지 않도록 키에 포함
+        self.guideline_prompt_version = hash_text(
+            json.dumps(self.config['guideline_synthesizer'], ensure_ascii=False, sort_keys=True)
+        )[:12]
         
         # LangChain 모델 초기화 (POC와 동일)
         # llm: 번역 생성용 (temperature 0.3)
-        self.llm = ChatOpenAI(model="gpt-4.1-mini", temperature=0.3, streaming=True)
+        self.llm = ChatOpenAI(model="gpt-4.1-mini", temperature=0.3, streaming=True, stream_usage=True)
         # agent_llm: guideline & evaluator용 (temperature 0.1)
         self.agent_llm = ChatOpenAI(model="gpt-4.1-mini", temperature=0.3)
         
-        # Tavily 검색 도구 초기화 (POC와 동일)
-        self.tavily_tool = TavilySearchResults(max_results=3)
-        self.tools = [self.tavily_tool]
+        # 검색 도구 초기화 (TRANSLATOR_CONFIG["search_backend"], 결과는 디스크 캐시)
+        self.search_tool = create_search_tool()
+        self.tools = [self.search_tool]
         
         # 체인들 초기화
         self._init_agents_and_chains()
-        
-        logging.info("TranslatorPipeline initialized with POC logic")
+
+        # StateGraph 컴파일 (요청마다 다시 만들지 않음)
+        self.app = self._build_graph()
+
+        self.stats = {
+            "init_seconds": round(time.perf_counter() - started_at, 3),
+            "translations": 0,
+            "failures": 0,
+            "first_translation_seconds": None,
+            "last_translation_seconds": None,
+        }
+        logging.info(f"TranslatorPipeline initialized in {self.stats['init_seconds']}s")
     
     def _load_config(self) -> Dict[str, Any]:
         """translator.yaml 설정 파일 로드"""
@@ -99,12 +142,27 @@ class TranslatorPipeline:
             logging.error(f"Failed to load config from {self.config_path}: {e}")
             raise
     
-    def _process_image_url(self, image_url: str) -> str:
+    async def prepare_image(self, image_url: str) -> str:
         """
         이미지 URL을 처리하여 OpenAI Vision API가 사용할 수 있는 형태로 변환
-        image_utils 모듈의 통합 함수 사용
+        image_utils 모듈의 통합 함수 사용 (다운로드/변환이 블로킹이므로 스레드에서 실행)
+        """
+        return await asyncio.to_thread(process_image_url, image_url)
+
+    async def _scheduled(self, make_call, estimated_tokens: int):
+        """
+        LLM 호출을 프로세스 전역 스케줄러(동시 실행 수, RPM/TPM 한도)를 거쳐 실행
+        alt-text 생성과 같은 한도를 공유하므로 번역이 몰려도 429가 나지 않도록 함
         """
-        return process_image_url(image_url)
+        scheduler = get_llm_scheduler()
+        try:
+            async with scheduler.slot(estimated_tokens) as grant:
+                result = await make_call()
+                scheduler.record_usage(grant, total_tokens(result))
+                return result
+        except RateLimitError as e:
+            scheduler.penalize(parse_retry_after(e.response.headers if e.response is not None else None))
+            raise
     
     def _init_agents_and_chains(self):
         """POC와 동일한 Agent 및 Chain 초기화"""
@@ -149,80 +207,243 @@ class TranslatorPipeline:
                 {"type": "image_url", "image_url": {"url": "{image_url}"}}
             ])
         ])
-        self.evaluation_chain = evaluator_prompt | self.agent_llm.with_structured_output(Evaluation)
+        # include_raw: 토큰 사용량(usage_metadata)을 얻기 위해 원본 응답도 함께 받음
+        self.evaluation_chain = evaluator_prompt | self.agent_llm.with_structured_output(Evaluation, include_raw=True)
     
+    def _build_graph(self):
+        """POC와 동일한 StateGraph 구성 후 컴파일"""
+        workflow = StateGraph(GraphState)
+
+        # 노드 추가 (POC와 동일)
+        workflow.add_node("guideline_agent", self._guideline_agent_node)
+        workflow.add_node("generation_node", self._generation_node)
+        workflow.add_node("evaluator", self._evaluator_node)
+
+        # 엣지 연결 (가이드라인 캐시 hit이면 바로 generation_node부터 시작)
+        workflow.set_conditional_entry_point(
+            self._route_entry,
+            {"guideline_agent": "guideline_agent", "generation_node": "generation_node"}
+        )
+        workflow.add_edge("guideline_agent", "generation_node")
+        workflow.add_edge("generation_node", "evaluator")
+        workflow.add_conditional_edges(
+            "evaluator",
+            self._should_continue,
+            {"end": END, "generation_node": "generation_node"}
+        )
+
+        return workflow.compile()
+
     async def translate(
         self,
         original_alt_text: str,
         target_language_name: str,
         image_url: str,
-        image_type: str = "informative"
+        image_type: str = "informative",
+        deadline: Optional[float] = None,
+        image_processed: bool = False
     ) -> Dict[str, Any]:
         """
         메인 번역 함수 - POC의 StateGraph 로직 사용
+
+        deadline(초)이 지나면 그래프 실행을 취소 (기본값: TRANSLATOR_CONFIG["deadline"])
+        image_processed=True이면 image_url을 prepare_image()의 결과로 보고 다시 처리하지 않음
+        (같은 이미지를 여러 언어로 번역할 때 다운로드/SVG 변환을 한 번만 하기 위함)
+        """
+        result = None
+        async for event in self.translate_events(
+            original_alt_text, target_language_name, image_url, image_type,
+            deadline=deadline, image_processed=image_processed, stream_tokens=False
+        ):
+            if event["event"] == "done":
+                result = event["result"]
+        return result
+
+    async def translate_events(
+        self,
+        original_alt_text: str,
+        target_language_name: str,
+        image_url: str,
+        image_type: str = "informative",
+        deadline: Optional[float] = None,
+        image_processed: bool = False,
+        stream_tokens: bool = True
+    ):
+        """
+        번역 진행 상황을 이벤트로 내보내는 비동기 제너레이터 (스트리밍 엔드포인트용)
+
+        - {"event": "guidelines"}: 가이드라인 준비 완료 (cached: 캐시 hit 여부)
+        - {"event": "token"}: 번역 생성 토큰 (stream_tokens=True일 때만)
+        - {"event": "evaluation"}: 평가 점수
+        - {"event": "retry"}: 피드백을 반영해 다시 생성
+        - {"event": "done"}: translate()와 같은 형식의 최종 결과
         """
         logging.info(f"Starting translation pipeline: '{original_alt_text}' -> {target_language_name}")
+        started_at = time.perf_counter()
         
         try:
-            # POC와 동일한 StateGraph 구성
-            workflow = StateGraph(GraphState)
-            
-            # 노드 추가 (POC와 동일)
-            workflow.add_node("guideline_agent", self._guideline_agent_node)
-            workflow.add_node("generation_node", self._generation_node)
-            workflow.add_node("evaluator", self._evaluator_node)
-            
-            # 엣지 연결 (POC와 동일)
-            workflow.set_entry_point("guideline_agent")
-            workflow.add_edge("guideline_agent", "generation_node")
-            workflow.add_edge("generation_node", "evaluator")
-            workflow.add_conditional_edges(
-                "evaluator",
-                self._should_continue,
-                {"end": END, "generation_node": "generation_node"}
-            )
-            
-            app = workflow.compile()
-            
             # 입력 데이터 구성
             inputs = {
                 "original_alt_text": original_alt_text,
                 "language": target_language_name,
                 "image_type": image_type,
-                "image_url": self._process_image_url(image_url)
+                "image_url": image_url if image_processed else await self.prepare_image(image_url),
+                "iterations": 0,
+                "tokens_spent": 0,
+                "stale_iterations": 0,
             }
+            inputs.update(await self._lookup_guidelines(inputs))
+            if inputs.get("on_the_fly_guidelines"):
+                yield {"event": "guidelines", "guidelines": inputs["on_the_fly_guidelines"], "cached": True}
             
-            # 그래프 실행 (POC와 동일)
-            final_state = {}
-            for event in app.stream(inputs, {"recursion_limit": 50}):
-                for key, value in event.items():
-                    if key != "__end__":
-                        final_state.update(value)
+            # 그래프 실행 (노드가 모두 비동기이므로 이벤트 루프를 막지 않음)
+            # 그래프는 별도 작업에서 큐로 결과를 넘기고, 제한 시간은 큐 읽기에만 적용
+            # (timeout 범위 안에서 yield하면 소비자 쪽에서 취소가 발생해 아래 fallback이 실행되지 않음)
+            final_state = dict(inputs)
+            stream_mode = ["updates", "messages"] if stream_tokens else ["updates"]
+            timeout = deadline or TRANSLATOR_CONFIG["deadline"]
+            loop = asyncio.get_running_loop()
+            ends_at = loop.time() + timeout
+            queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+            producer = asyncio.create_task(self._pump_graph(inputs, stream_mode, queue))
+            try:
+                while True:
+                    try:
+                        item = await asyncio.wait_for(queue.get(), max(0, ends_at - loop.time()))
+                    except TimeoutError:
+                        # 제한 시간 초과: 그때까지 생성된 번역이 있으면 그것을 반환
+                        logging.warning(f"Translation deadline exceeded: '{original_alt_text}' -> {target_language_name}")
+                        final_state["error"] = f"{timeout}초 안에 번역이 끝나지 않았습니다."
+                        final_state["stop_reason"] = "deadline"
+                        break
+                    if item is _STREAM_END:
+                        break
+                    if isinstance(item, Exception):
+                        raise item
+                    mode, chunk = item
+                    if mode == "messages":
+                        # generation_node의 LLM 토큰만 전달 (에이전트/평가 LLM 출력 제외)
+                        message, metadata = chunk
+                        if metadata.get("langgraph_node") == "generation_node" and message.content:
+                            yield {"event": "token", "iteration": final_state.get("iterations", 0) + 1, "text": message.content}
+                        continue
+                    for node, update in chunk.items():
+                        if not update:
+                            continue
+                        final_state.update(update)
+                        for event in self._progress_events(node, final_state):
+                            yield event
+            finally:
+                # 제한 시간 초과, 오류, 소비자가 스트림을 닫은 경우 모두 그래프 실행 중단
+                producer.cancel()
             
-            return {
-                "original_text": original_alt_text,
-                "translated_text": final_state.get('generated_alt_text', original_alt_text),
-                "target_language_name": target_language_name,
-                "guidelines": final_state.get('on_the_fly_guidelines', []),
-                "evaluation": {
-                    "accessibility_score": final_state.get('accessibility_score'),
-                    "cultural_score": final_state.get('cultural_score'),
-                    "feedback": final_state.get('feedback')
-                },
-                "success": final_state.get('error') is None
-            }
+            self._record(started_at, failed=final_state.get('error') is not None)
+            yield {"event": "done", "result": self._build_result(original_alt_text, target_language_name, final_state)}
             
         except Exception as e:
             logging.error(f"Translation pipeline failed: {e}")
-            return {
+            self._record(started_at, failed=True)
+            yield {"event": "done", "result": {
                 "original_text": original_alt_text,
                 "translated_text": original_alt_text,
                 "target_language_name": target_language_name,
                 "error": str(e),
                 "success": False
-            }
-    
-    def _guideline_agent_node(self, state: GraphState) -> GraphState:
+            }}
+
+    async def _pump_graph(self, inputs: Dict[str, Any], stream_mode: List[str], queue: asyncio.Queue):
+        """그래프 스트림을 큐로 전달 (끝나면 _STREAM_END, 실패하면 예외 객체를 넣음)"""
+        try:
+            async for item in self.app.astream(
+                inputs, {"recursion_limit": TRANSLATOR_CONFIG["recursion_limit"]}, stream_mode=stream_mode
+            ):
+                await queue.put(item)
+        except Exception as e:
+            await queue.put(e)
+            return
+        await queue.put(_STREAM_END)
+
+    def _progress_events(self, node: str, state: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """노드 실행 결과 → 진행 이벤트 목록"""
+        if state.get("error"):
+            return []
+        if node == "guideline_agent":
+            return [{"event": "guidelines", "guidelines": state.get("on_the_fly_guidelines", []), "cached": False}]
+        if node != "evaluator":
+            return []
+        events = [{
+            "event": "evaluation",
+            "iteration": state["iterations"],
+            "accessibility_score": state["accessibility_score"],
+            "cultural_score": state["cultural_score"],
+            "feedback": state.get("feedback"),
+        }]
+        if self._stop_reason(state) is None:
+            events.append({"event": "retry", "iteration": state["iterations"] + 1, "feedback": state.get("feedback")})
+        return events
+
+    def _build_result(self, original_alt_text: str, target_language_name: str, final_state: Dict[str, Any]) -> Dict[str, Any]:
+        """그래프 최종 상태 → 응답 (마지막 시도가 아니라 가장 점수가 높은 시도를 반환)"""
+        has_best = final_state.get('best_alt_text') is not None
+        translated_text = final_state.get('best_alt_text') if has_best else final_state.get('generated_alt_text')
+        return {
+            "original_text": original_alt_text,
+            "translated_text": translated_text or original_alt_text,
+            "target_language_name": target_language_name,
+            "guidelines": final_state.get('on_the_fly_guidelines', []),
+            "evaluation": {
+                "accessibility_score": final_state.get('best_accessibility_score' if has_best else 'accessibility_score'),
+                "cultural_score": final_state.get('best_cultural_score' if has_best else 'cultural_score'),
+                "feedback": final_state.get('best_feedback' if has_best else 'feedback'),
+                "iterations": final_state.get('iterations', 0),
+                "tokens_spent": final_state.get('tokens_spent', 0),
+                "stop_reason": final_state.get('stop_reason') or self._stop_reason(final_state),
+            },
+            "success": final_state.get('error') is None,
+            "error": final_state.get('error')
+        }
+
+    def guideline_cache_key(self, language: str, image_type: str, original_alt_text: str, image_url: str) -> str:
+        """
+        가이드라인 캐시 키 (CACHE_CONFIG["guideline_key"])
+        - "alt_text": 언어 + 이미지 타입 + 정규화된 alt text (같은 사이트에서 반복되는 문구끼리 공유)
+        - "image": 언어 + 이미지 타입 + 이미지 dHash (비슷한 이미지끼리 공유)
+        """
+        if CACHE_CONFIG["guideline_key"] == "image":
+            subject = "image:" + image_perceptual_hash(image_url)
+        else:
+            subject = "alt_text:" + normalize_alt_text(original_alt_text)
+        return make_cache_key(language, image_type, subject, self.agent_llm.model_name, self.guideline_prompt_version)
+
+    async def _lookup_guidelines(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """캐시된 가이드라인이 있으면 그래프 입력에 넣어 guideline_agent 단계를 건너뜀"""
+        if not CACHE_CONFIG["enabled"]:
+            return {}
+        cache_key = await asyncio.to_thread(
+            self.guideline_cache_key,
+            inputs["language"], inputs["image_type"], inputs["original_alt_text"], inputs["image_url"],
+        )
+        # SQLite 조회가 이벤트 루프(다른 스트림)를 막지 않도록 스레드에서 실행
+        cached = await asyncio.to_thread(get_guideline_cache().get, cache_key)
+        if cached is not None:
+            logging.info(f"Guidelines cache hit ({len(cached)} guidelines)")
+            return {"on_the_fly_guidelines": cached, "guideline_cache_key": cache_key}
+        return {"guideline_cache_key": cache_key}
+
+    def _route_entry(self, state: GraphState) -> str:
+        return "generation_node" if state.get("on_the_fly_guidelines") else "guideline_agent"
+
+    def _record(self, started_at: float, failed: bool):
+        """번역 소요 시간 기록 (첫 요청은 커넥션 수립 등이 포함되므로 따로 보관)"""
+        elapsed = round(time.perf_counter() - started_at, 3)
+        self.stats["translations"] += 1
+        if failed:
+            self.stats["failures"] += 1
+        if self.stats["first_translation_seconds"] is None:
+            self.stats["first_translation_seconds"] = elapsed
+        self.stats["last_translation_seconds"] = elapsed
+
+    async def _guideline_agent_node(self, state: GraphState) -> GraphState:
         """Phase 1: 자율적인 에이전트가 이미지를 분석하고, 웹 검색을 통해 맞춤 가이드라인을 생성 (POC와 동일)"""
         logging.info("Step 1: Generating cultural guidelines with search")
         try:
@@ -231,7 +452,11 @@ class TranslatorPipeline:
                 "original_alt_text": state["original_alt_text"],
                 "image_url": state["image_url"],  # 🔥 이미 처리된 이미지 URL 사용
             }
-            result = self.guideline_agent_executor.invoke(agent_vars)
+            # 에이전트는 검색 결과를 반영하기 위해 LLM을 여러 번 호출하므로 예상 토큰을 넉넉히 잡음
+            result = await self._scheduled(
+                lambda: self.guideline_agent_executor.ainvoke(agent_vars),
+                TRANSLATOR_CONFIG["estimated_agent_tokens"],
+            )
             
             # 에이전트의 출력에서 JSON 부분만 안전하게 추출 (POC와 동일)
             json_str = result['output'][result['output'].find('{'):result['output'].rfind('}')+1]
@@ -240,6 +465,10 @@ class TranslatorPipeline:
             # Pydantic으로 유효성 검사 및 데이터 추출 (POC와 동일)
             on_the_fly_guidelines = OnTheFlyGuidelines(**guideline_json).on_the_fly_guidelines
             logging.info(f"Generated {len(on_the_fly_guidelines)} cultural guidelines")
+            if state.get("guideline_cache_key") and on_the_fly_guidelines:
+                await asyncio.to_thread(
+                    get_guideline_cache().set, state["guideline_cache_key"], on_the_fly_guidelines
+                )
             
             return {"on_the_fly_guidelines": on_the_fly_guidelines, "error": None}
 
@@ -247,7 +476,7 @@ class TranslatorPipeline:
             logging.error(f"Guidelines generation failed: {e}")
             return {"error": str(e)}
     
-    def _generation_node(self, state: GraphState) -> GraphState:
+    async def _generation_node(self, state: GraphState) -> GraphState:
         """Phase 2: 생성된 가이드라인에 따라 최종 Alt Text를 생성 (POC와 동일)"""
         logging.info("Step 2: Generating translation with vision")
         try:
@@ -262,17 +491,26 @@ class TranslatorPipeline:
             }
 
             # Vision 입력을 포함한 멀티모달 프롬프트 생성 (POC와 동일)
-            prompt_with_vision = self.generation_prompt_template.invoke(g_vars)
-            final_alt_text = self.llm.invoke(prompt_with_vision).content
+            prompt_with_vision = await self.generation_prompt_template.ainvoke(g_vars)
+            response = await self._scheduled(
+                lambda: self.llm.ainvoke(prompt_with_vision),
+                LLM_RATE_LIMIT_CONFIG["estimated_image_tokens"] + LLM_RATE_LIMIT_CONFIG["estimated_output_tokens"],
+            )
+            final_alt_text = response.content
             logging.info(f"Translation generated: '{final_alt_text}'")
 
-            return {"generated_alt_text": final_alt_text, "error": None}
+            return {
+                "generated_alt_text": final_alt_text,
+                "refine_started_at": state.get("refine_started_at") or time.monotonic(),
+                "tokens_spent": state.get("tokens_spent", 0) + (total_tokens(response) or LLM_RATE_LIMIT_CONFIG["estimated_image_tokens"]),
+                "error": None
+            }
 
         except Exception as e:
             logging.error(f"Translation generation failed: {e}")
             return {"error": str(e)}
     
-    def _evaluator_node(self, state: GraphState) -> GraphState:
+    async def _evaluator_node(self, state: GraphState) -> GraphState:
         """생성된 Alt Text를 Vision을 사용하여 평가 (POC와 동일)"""
         logging.info("Step 3: Evaluating translation with vision")
         try:
@@ -282,37 +520,105 @@ class TranslatorPipeline:
                 "image_type": state["image_type"],
                 "language": state["language"]
             }
-            evaluation = self.evaluation_chain.invoke(e_vars)
+            result = await self._scheduled(
+                lambda: self.evaluation_chain.ainvoke(e_vars),
+                LLM_RATE_LIMIT_CONFIG["estimated_image_tokens"] + LLM_RATE_LIMIT_CONFIG["estimated_output_tokens"],
+            )
+            evaluation = result["parsed"]
+            if evaluation is None:
+                raise result.get("parsing_error") or ValueError("Evaluation output could not be parsed")
 
             logging.info(f"Evaluation - Accessibility: {evaluation.accessibility_score}, Cultural: {evaluation.cultural_score}")
 
-            return {
+            update = {
                 "accessibility_score": evaluation.accessibility_score,
                 "cultural_score": evaluation.cultural_score,
                 "feedback": evaluation.feedback,
+                "iterations": state.get("iterations", 0) + 1,
+                "tokens_spent": state.get("tokens_spent", 0) + (total_tokens(result) or LLM_RATE_LIMIT_CONFIG["estimated_image_tokens"]),
                 "error": None
             }
+            # 가장 좋은 시도 갱신 (낮은 쪽 점수 우선, 같으면 합계), 나아지지 않으면 stale 증가
+            score = (min(evaluation.accessibility_score, evaluation.cultural_score),
+                     evaluation.accessibility_score + evaluation.cultural_score)
+            best = state.get("best_accessibility_score"), state.get("best_cultural_score")
+            if None in best or score > (min(best), sum(best)):
+                update.update({
+                    "best_alt_text": state["generated_alt_text"],
+                    "best_accessibility_score": evaluation.accessibility_score,
+                    "best_cultural_score": evaluation.cultural_score,
+                    "best_feedback": evaluation.feedback,
+                    "stale_iterations": 0,
+                })
+            else:
+                update["stale_iterations"] = state.get("stale_iterations", 0) + 1
+            return update
         except Exception as e:
             logging.error(f"Translation evaluation failed: {e}")
             return {"error": str(e)}
     
     def _should_continue(self, state: GraphState) -> str:
-        """평가 점수에 따라 다음 단계를 결정 (POC와 동일)"""
+        """평가 점수와 남은 예산에 따라 다음 단계를 결정"""
         logging.info("Checking quality threshold")
+        stop_reason = self._stop_reason(state)
+        if stop_reason is None:
+            logging.info(f"Threshold failed (A:{state['accessibility_score']}, C:{state['cultural_score']}). Looping back")
+            return "generation_node"  # 피드백을 가지고 generation_node로 돌아감
+        logging.info(f"Stopping refinement: {stop_reason} (A:{state.get('accessibility_score')}, C:{state.get('cultural_score')})")
+        return "end"
+
+    def _stop_reason(self, state: Dict[str, Any]) -> Optional[str]:
+        """반복을 멈춰야 하는 이유 (계속해야 하면 None)"""
         if state.get("error"):
-            logging.error(f"Error detected: {state['error']}, ending graph")
-            return "end"
-        
+            return "error"
         if state.get("accessibility_score") is None or state.get("cultural_score") is None:
-            logging.warning("Scores not found, ending graph to prevent loop")
-            return "end"
+            return "no_scores"
+        pass_score = TRANSLATOR_CONFIG["pass_score"]
+        if state["accessibility_score"] >= pass_score and state["cultural_score"] >= pass_score:
+            return "passed"
+        if state.get("iterations", 0) >= TRANSLATOR_CONFIG["max_iterations"]:
+            return "max_iterations"
+        if state.get("tokens_spent", 0) >= TRANSLATOR_CONFIG["max_tokens"]:
+            return "token_budget"
+        if state.get("refine_started_at") and time.monotonic() - state["refine_started_at"] >= TRANSLATOR_CONFIG["max_seconds"]:
+            return "time_budget"
+        if state.get("stale_iterations", 0) >= TRANSLATOR_CONFIG["patience"]:
+            return "no_improvement"
+        return None
 
-        if state["accessibility_score"] < 4 or state["cultural_score"] < 4:
-            logging.info(f"Threshold failed (A:{state['accessibility_score']}, C:{state['cultural_score']}). Looping back")
-            return "generation_node"  # 피드백을 가지고 generation_node로 돌아감
-        else:
-            logging.info(f"Threshold passed (A:{state['accessibility_score']}, C:{state['cultural_score']})")
-            return "end"
+
+def total_tokens(result) -> int:
+    """LLM 응답의 총 토큰 수 (structured output의 include_raw 결과도 지원, 알 수 없으면 0)"""
+    if isinstance(result, dict):
+        result = result.get("raw")
+    usage = getattr(result, "usage_metadata", None) or {}
+    return usage.get("total_tokens", 0)
+
+
+def normalize_alt_text(text: str) -> str:
+    """캐시 키용 alt text 정규화 (소문자, 구두점 제거, 공백 정리)"""
+    text = re.sub(r"[^\w\s]", " ", (text or "").lower())
+    return " ".join(text.split())
+
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+def get_translator_pipeline() -> TranslatorPipeline:
+    """프로세스 전역 TranslatorPipeline 반환 (최초 호출 시 생성)"""
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = TranslatorPipeline()
+        return _pipeline
+
+
+def translator_stats() -> Dict[str, Any]:
+    """번역 파이프라인 초기화/번역 소요 시간 (아직 생성되지 않았으면 initialized=False)"""
+    if _pipeline is None:
+        return {"initialized": False}
+    return {"initialized": True, **_pipeline.stats}
 
 
 # 편의 함수들
@@ -320,16 +626,20 @@ async def translate_with_pipeline(
     original_alt_text: str,
     target_language_name: str,
     image_url: str,
-    image_type: str = "informative"
+    image_type: str = "informative",
+    deadline: Optional[float] = None,
+    image_processed: bool = False
 ) -> Dict[str, Any]:
     """
     전체 번역 파이프라인 실행 - 전체 결과 딕셔너리 반환
     """
-    translator = TranslatorPipeline()
+    translator = get_translator_pipeline()
     result = await translator.translate(
         original_alt_text=original_alt_text,
         target_language_name=target_language_name,
         image_url=image_url,
-        image_type=image_type
+        image_type=image_type,
+        deadline=deadline,
+        image_processed=image_processed
     )
     return result 
\ No newline at end of file
@@ -1,14 +1,30 @@
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import HTMLResponse, StreamingResponse
 from dotenv import load_dotenv
-from llm.client import get_ai_generated_alt_text
-from llm.translator import translate_with_pipeline
-from parser.parser import parse_page, download_html
+from llm.client import get_ai_generated_alt_text, close_async_client
+from llm.cache import cache_stats
+from llm.dedup import AltTextDeduper, normalize_image_url
+from llm.context import build_prompt_context
+from llm.image_utils import image_ingest_stats, close_image_http_client, shutdown_svg_process_pool
+from llm.limiter import current_client_id, get_llm_scheduler
+from llm.prompt_util import get_prompt_registry
+from llm.config import TRANSLATOR_CONFIG
+from llm.translator import translate_with_pipeline, get_translator_pipeline, translator_stats
+from parser.parser import parse_page, download_html, iter_page_images, ParseCancelled
+from parser.pool import get_webdriver_pool, shutdown_webdriver_pool, WebDriverPoolExhausted
+from parser.executor import get_parse_executor, shutdown_parse_executor, ParseQueueFull, ParseDeadlineExceeded
+from parser.context import get_context_store
+from parser.static import StaticFetchError
+from parser.rewrite import rewrite_alt_texts
+from parser.utils import load_config
 from schemas.alt_text import *
 from schemas.parser import *
 from schemas.translation import *
+from streaming import iterate_in_thread, format_stream_event, STREAM_MEDIA_TYPES
 import logging
 import asyncio
+import threading
+import uuid
 import requests
 import os
 
@@ -38,23 +54,129 @@ app.add_middleware(
     allow_headers=["*"],  # 모든 헤더 허용
 )
 
+@app.middleware("http")
+async def assign_llm_client_id(request: Request, call_next):
+    """요청마다 LLM 스케줄러용 ID를 부여해 동시에 들어온 요청 사이에서 LLM 호출을 공평하게 분배"""
+    current_client_id.set(uuid.uuid4().hex)
+    return await call_next(request)
+
+# 파싱 관련 예외 → HTTP 상태 코드
+PARSE_ERROR_STATUS = {
+    ParseQueueFull: 503,
+    WebDriverPoolExhausted: 503,
+    ParseDeadlineExceeded: 504,
+    ParseCancelled: 499,  # 클라이언트가 먼저 연결을 끊음
+    StaticFetchError: 502,  # static 모드에서 HTML을 가져오지 못함
+}
+PARSE_ERRORS = tuple(PARSE_ERROR_STATUS.keys())
+
+def parse_error_status(error):
+    for error_type, status_code in PARSE_ERROR_STATUS.items():
+        if isinstance(error, error_type):
+            return status_code
+    return 500
+
+def prompt_context(context: str = "", context_id: str = None, local_context: str = "", required: bool = True) -> str:
+    """
+    이미지 하나의 LLM 프롬프트 컨텍스트
+    context_id가 있으면 ContextStore의 페이지 컨텍스트를 사용하고, 토큰 예산에 맞게 잘라서 반환
+
+    context_id를 찾을 수 없으면(만료, 다른 워커, 잘못된 ID) 경고를 남기고 ContextStore의 miss로 집계
+    - 요청에 context 본문이 함께 있으면 그것을 사용
+    - 없으면 required=True일 때 410을 반환해 클라이언트가 context를 다시 보내도록 함
+      (페이지 컨텍스트 없이 조용히 생성하지 않음)
+    """
+    if not context_id:
+        return build_prompt_context(context, local_context)
+    page_context = get_context_store().get(context_id)
+    if page_context is None:
+        logging.warning(f"페이지 컨텍스트를 찾을 수 없음: context_id={context_id}")
+        if not context and required:
+            raise HTTPException(
+                status_code=410,
+                detail=f"context_id '{context_id}'가 만료되었거나 없습니다. context를 함께 보내주세요.",
+            )
+        page_context = context
+    return build_prompt_context(page_context, local_context)
+
+def image_prompt_context(image: dict) -> str:
+    """파서가 만든 이미지 데이터(context_id, local_context)의 프롬프트 컨텍스트 (방금 저장한 ID이므로 없으면 경고만)"""
+    return prompt_context(context_id=image.get('context_id'), local_context=image.get('local_context', ""), required=False)
+
+@app.on_event("startup")
+async def startup_webdriver_pool():
+    """앱 시작 시 웹드라이버 풀을 만들고 설정에 따라 브라우저를 미리 띄워둠"""
+    pool = get_webdriver_pool()
+    get_parse_executor()
+    if load_config()["WEBDRIVER_POOL_CONFIG"]["prewarm"]:
+        await asyncio.get_running_loop().run_in_executor(None, pool.prewarm)
+
+@app.on_event("startup")
+async def startup_translator_pipeline():
+    """앱 시작 시 번역 파이프라인을 만들고 그래프를 컴파일해 첫 요청 지연을 줄임"""
+    if not TRANSLATOR_CONFIG["prewarm"]:
+        return
+    try:
+        await asyncio.get_running_loop().run_in_executor(None, get_translator_pipeline)
+    except Exception as e:
+        # API 키 누락 등으로 실패해도 서버는 띄우고, 첫 번역 요청에서 다시 시도
+        logging.error(f"번역 파이프라인 사전 생성 실패: {e}")
+
+@app.on_event("shutdown")
+async def shutdown_webdriver_pool_event():
+    shutdown_parse_executor()
+    shutdown_webdriver_pool()
+    await close_async_client()
+    close_image_http_client()
+    shutdown_svg_process_pool()
+
+@app.get("/api/metrics")
+async def metrics_endpoint():
+    """파싱 대기열, 웹드라이버 풀, LLM 결과 캐시, LLM 스케줄러, 번역 파이프라인, 이미지 수집 상태"""
+    return {
+        "parse_executor": get_parse_executor().stats(),
+        "webdriver_pool": dict(get_webdriver_pool().stats),
+        "cache": cache_stats(),
+        "llm_scheduler": get_llm_scheduler().snapshot(),
+        "translator": translator_stats(),
+        "image_ingest": image_ingest_stats(),
+        "page_contexts": get_context_store().stats(),
+    }
+
 @app.post("/api/download_html")
-async def download_html_endpoint(request: DownloadHTMLRequest):
+async def download_html_endpoint(request: DownloadHTMLRequest, http_request: Request):
     """
     주어진 URL로부터 HTML을 다운받아 반환
-    (Selenium을 사용)
+    (Selenium을 사용, 파싱 전용 실행기에서 실행)
     """
     try:
-        html_code = download_html(request.url, enable_logging=True)
+        html_code = await get_parse_executor().run(
+            download_html, request.url, enable_logging=True, request=http_request
+        )
         if html_code is None:
             raise HTTPException(status_code=500, detail="HTML 다운로드에 실패했습니다.")
 
         return {"html_code": html_code}
 
+    except HTTPException:
+        raise
+    except PARSE_ERRORS as e:
+        raise HTTPException(status_code=parse_error_status(e), detail=str(e))
     except Exception as e:
         logging.error(f"HTML 다운로드 실패: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/admin/reload_prompts")
+async def reload_prompts_endpoint():
+    """prompts.yaml을 즉시 다시 읽고 프롬프트별 버전을 반환"""
+    registry = get_prompt_registry()
+    reloaded = registry.reload(force=True)
+    return {
+        "reloaded": reloaded,
+        "version": registry.version,
+        "prompts": {name: registry.get(name).version for name in registry.names()},
+    }
+
 @app.post("/api/update_alt_text")
 async def update_alt_text_endpoint(request: UpdateAltTextRequest):
     """
@@ -62,23 +184,46 @@ async def update_alt_text_endpoint(request: UpdateAltTextRequest):
     Returns the modified HTML.
     """
     try:
-        # 1) Parse the HTML using BeautifulSoup
-        soup = BeautifulSoup(request.html_code, "html.parser")
-        
-        # 2) Find the <img> tag matching image_url
-        target_img = soup.find("img", {"src": request.image_url})
-        if not target_img:
+        # Splice the alt attribute of the <img> whose src matches image_url exactly;
+        # the rest of the document (doctype, fragments, formatting) is returned unchanged
+        updated_html, updated_images, _ = await asyncio.to_thread(
+            rewrite_alt_texts,
+            request.html_code,
+            {request.image_url: request.customized_alt_text},
+        )
+        if not updated_images:
             raise HTTPException(status_code=404, detail=f"No matching <img> with alt_text: {request.customized_alt_text} found in the HTML.")
 
-        # 3) Update alt attribute
-        target_img["alt"] = request.customized_alt_text
-        
-        # 4) Convert back to string
-        updated_html = str(soup)
-
         return {
             "updated_html": updated_html
         }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/update_alt_text_bulk", response_model=BulkUpdateAltTextResponse)
+async def update_alt_text_bulk_endpoint(request: BulkUpdateAltTextRequest):
+    """
+    Applies a whole map of image URL → alt text edits in one pass.
+
+    The HTML is rewritten by scanning <img> tags only (no DOM tree is built), matching each
+    src against the original, absolute and normalized forms of the edit keys.
+    Edits that matched no <img> are returned in `unmatched`.
+    """
+    try:
+        updated_html, updated_images, unmatched = await asyncio.to_thread(
+            rewrite_alt_texts,
+            request.html_code,
+            request.edits,
+            request.base_url,
+            normalize_image_url,
+        )
+        return BulkUpdateAltTextResponse(
+            updated_html=updated_html,
+            updated_images=updated_images,
+            unmatched=unmatched,
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -117,7 +262,8 @@ async def root():
 
 @app.post("/api/get_ai_generated_alt_text", response_model=AltTextResponse)
 async def ai_generated_alt_text_endpoint(request: AltTextRequest):
-    image_url, previous_alt_text, image_type, ai_generated_alt_text, ai_modified_alt_text= await get_ai_generated_alt_text(request.image_url, request.alt_text, request.is_button, request.context)
+    context = prompt_context(request.context, request.context_id, request.local_context)
+    image_url, previous_alt_text, image_type, ai_generated_alt_text, ai_modified_alt_text= await get_ai_generated_alt_text(request.image_url, request.alt_text, request.is_button, context, request.bypass_cache)
     return AltTextResponse(image_url=image_url, 
                            previous_alt_text=previous_alt_text,
                            image_type=image_type,
@@ -126,16 +272,23 @@ async def ai_generated_alt_text_endpoint(request: AltTextRequest):
 
 @app.post("/api/get_ai_generated_alt_text_list", response_model=AltTextListResponse)
 async def ai_generated_alt_text_list_endpoint(request: AltTextListRequest):
+    # 컨텍스트를 먼저 모두 확인 (만료된 context_id가 있으면 생성 작업을 만들기 전에 410)
+    contexts = [prompt_context(item.context, item.context_id, item.local_context) for item in request.images]
+    deduper = AltTextDeduper(get_ai_generated_alt_text)
     tasks = [
-        get_ai_generated_alt_text(item.image_url, item.alt_text, item.is_button, item.context) for item in request.images
+        deduper.generate(item.image_url, item.alt_text, item.is_button, context, item.bypass_cache)
+        for item, context in zip(request.images, contexts)
     ]   
-    outputs = await asyncio.gather(*tasks)
+    try:
+        outputs = await asyncio.gather(*tasks)
+    finally:
+        deduper.cancel()
     results = [AltTextResponse(image_url=image_url, 
                                previous_alt_text=previous_alt_text,
                                image_type=image_type,
                                ai_generated_alt_text=ai_generated_alt_text,
                                ai_modified_alt_text=ai_modified_alt_text) for image_url, previous_alt_text, image_type, ai_generated_alt_text, ai_modified_alt_text in outputs]
-    return AltTextListResponse(results=results)
+    return AltTextListResponse(results=results, dedup_stats=deduper.stats())
 
 @app.options("/api/parse_url")
 async def options_parse_url_endpoint():
@@ -147,12 +300,15 @@ async def options_parse_url_endpoint():
     }
 
 @app.post("/api/parse_url", response_model=ParserResponse)
-async def parse_webpage_endpoint(request: ParserRequest):
+async def parse_webpage_endpoint(request: ParserRequest, http_request: Request):
     try:
-        result = parse_page(
+        result = await get_parse_executor().run(
+            parse_page,
             url=str(request.url),
             container=request.container,
-            enable_logging=request.enable_logging
+            enable_logging=request.enable_logging,
+            mode=request.mode,
+            request=http_request,
         )
         
         if result is None:
@@ -163,8 +319,13 @@ async def parse_webpage_endpoint(request: ParserRequest):
             
         return ParserResponse(
             images=result,
+            contexts=get_context_store().get_many(image.get('context_id') for image in result),
         )
         
+    except HTTPException:
+        raise
+    except PARSE_ERRORS as e:
+        raise HTTPException(status_code=parse_error_status(e), detail=str(e))
     except Exception as e:
         logging.error(f"파싱 엔드포인트 오류: {str(e)}")
         raise HTTPException(
@@ -173,12 +334,15 @@ async def parse_webpage_endpoint(request: ParserRequest):
         )
     
 @app.post("/api/parse_url_generate_alt_text", response_model=AltTextListResponse)
-async def parse_webpage_generate_alt_text_endpoint(request: ParserRequest):
+async def parse_webpage_generate_alt_text_endpoint(request: ParserRequest, http_request: Request):
     try:
-        result = parse_page(
+        result = await get_parse_executor().run(
+            parse_page,
             url=str(request.url),
             container=request.container,
-            enable_logging=request.enable_logging
+            enable_logging=request.enable_logging,
+            mode=request.mode,
+            request=http_request,
         )
         
         if result is None:
@@ -187,11 +351,16 @@ async def parse_webpage_generate_alt_text_endpoint(request: ParserRequest):
                 detail="페이지 파싱 중 오류가 발생했습니다."
             )
         
+        # 같은 이미지(정규화된 URL, 내용 해시 기준)는 한 번만 생성하고 결과를 나눠줌
+        deduper = AltTextDeduper(get_ai_generated_alt_text, request.bypass_cache)
         tasks = [
-            get_ai_generated_alt_text(item['img_url'], item['alt_text'], item['is_button'], item['context']) for item in result
+            deduper.generate(item['img_url'], item['alt_text'], item['is_button'], image_prompt_context(item)) for item in result
         ]
 
-        outputs = await asyncio.gather(*tasks)
+        try:
+            outputs = await asyncio.gather(*tasks)
+        finally:
+            deduper.cancel()
         results = [AltTextResponse(image_url=image_url, 
                                    previous_alt_text=previous_alt_text,
                                    image_type=image_type,
@@ -199,8 +368,12 @@ async def parse_webpage_generate_alt_text_endpoint(request: ParserRequest):
                                    ai_modified_alt_text=ai_modified_alt_text) 
                                    for image_url, previous_alt_text, image_type, ai_generated_alt_text, ai_modified_alt_text in outputs]
 
-        return AltTextListResponse(results=results)
+        return AltTextListResponse(results=results, dedup_stats=deduper.stats())
 
+    except HTTPException:
+        raise
+    except PARSE_ERRORS as e:
+        raise HTTPException(status_code=parse_error_status(e), detail=str(e))
     except Exception as e:
         logging.error(f"파싱 엔드포인트 오류: {str(e)}")
         raise HTTPException(
@@ -208,27 +381,131 @@ async def parse_webpage_generate_alt_text_endpoint(request: ParserRequest):
             detail=f"예상치 못한 오류가 발생했습니다: {str(e)}"
         )
 
+@app.post("/api/parse_url_generate_alt_text_stream")
+async def parse_webpage_generate_alt_text_stream_endpoint(request: ParserRequest, format: str = "ndjson"):
+    """
+    페이지 파싱과 alt-text 생성을 스트리밍으로 수행 (format: "ndjson" 또는 "sse")
+
+    - {"event": "context"}: 페이지 컨텍스트 (context_id별로 한 번만 전송)
+    - {"event": "image"}: 파서가 이미지를 찾는 즉시 전송
+    - {"event": "alt_text"}: 각 이미지의 alt-text 생성이 끝나는 즉시 전송
+    - {"event": "parse_done"}, {"event": "done"}: 파싱 종료 / 전체 종료
+    클라이언트가 연결을 끊으면 파싱과 진행 중인 생성 작업을 모두 취소
+    """
+    if format not in STREAM_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 형식입니다. 지원 형식: {list(STREAM_MEDIA_TYPES.keys())}")
+
+    return StreamingResponse(
+        stream_parse_and_generate(request, format),
+        media_type=STREAM_MEDIA_TYPES[format],
+    )
+
+async def stream_parse_and_generate(request: ParserRequest, stream_format: str = "ndjson"):
+    cancel_event = threading.Event()
+    events = asyncio.Queue()
+    generation_tasks = set()
+    deduper = AltTextDeduper(get_ai_generated_alt_text, request.bypass_cache)
+
+    async def generate(index, image):
+        try:
+            image_url, previous_alt_text, image_type, ai_generated_alt_text, ai_modified_alt_text = await deduper.generate(
+                image['img_url'], image['alt_text'], image['is_button'], image_prompt_context(image)
+            )
+            result = AltTextResponse(image_url=image_url,
+                                     previous_alt_text=previous_alt_text,
+                                     image_type=image_type,
+                                     ai_generated_alt_text=ai_generated_alt_text,
+                                     ai_modified_alt_text=ai_modified_alt_text)
+            events.put_nowait({"event": "alt_text", "index": index, "result": result.model_dump()})
+        except Exception as e:
+            detail = e.detail if isinstance(e, HTTPException) else str(e)
+            events.put_nowait({"event": "alt_text_error", "index": index, "image_url": image['img_url'], "detail": detail})
+
+    async def pump_parser():
+        count = 0
+        try:
+            parse_executor = get_parse_executor()
+            images = iterate_in_thread(
+                parse_executor.wrap_iterator(
+                    lambda cancel_event: iter_page_images(
+                        url=str(request.url),
+                        container=request.container,
+                        enable_logging=request.enable_logging,
+                        cancel_event=cancel_event,
+                        mode=request.mode,
+                    ),
+                    cancel_event,
+                ),
+                cancel_event,
+                executor=parse_executor.executor,
+            )
+            sent_contexts = set()
+            async with asyncio.timeout(parse_executor.request_deadline):
+                async for image in images:
+                    # 페이지 컨텍스트는 처음 나올 때 한 번만 전송하고, 이미지에는 context_id만 포함
+                    context_id = image.get('context_id')
+                    if context_id and context_id not in sent_contexts:
+                        sent_contexts.add(context_id)
+                        events.put_nowait({"event": "context", "context_id": context_id,
+                                           "context": get_context_store().get(context_id)})
+                    events.put_nowait({"event": "image", "index": count, "image": image})
+                    generation_tasks.add(asyncio.create_task(generate(count, image)))
+                    count += 1
+            events.put_nowait({"event": "parse_done", "images": count})
+        except TimeoutError:
+            cancel_event.set()
+            events.put_nowait({"event": "error", "status_code": 504, "detail": "파싱 제한 시간을 초과했습니다."})
+        except PARSE_ERRORS as e:
+            events.put_nowait({"event": "error", "status_code": parse_error_status(e), "detail": str(e)})
+        except Exception as e:
+            logging.error(f"스트리밍 파싱 오류: {str(e)}")
+            events.put_nowait({"event": "error", "status_code": 500, "detail": str(e)})
+
+    parser_task = asyncio.create_task(pump_parser())
+    parser_finished = False
+    pending_generations = 0
+    try:
+        while not parser_finished or pending_generations > 0:
+            event = await events.get()
+            if event["event"] == "image":
+                pending_generations += 1
+            elif event["event"] in ("alt_text", "alt_text_error"):
+                pending_generations -= 1
+            elif event["event"] in ("parse_done", "error"):
+                parser_finished = True
+            yield format_stream_event(event, stream_format)
+
+        yield format_stream_event({"event": "done", "dedup_stats": deduper.stats()}, stream_format)
+    finally:
+        # 정상 종료 또는 클라이언트 연결 종료 시 남은 작업 정리
+        cancel_event.set()
+        parser_task.cancel()
+        for task in generation_tasks:
+            task.cancel()
+        deduper.cancel()
+
+# 지원하는 번역 언어 코드 → 파이프라인에 전달하는 언어명
+LANGUAGE_NAMES = {
+    'ko': 'Korean',
+    'es': 'Spanish',
+    'zh': 'Chinese'
+}
+
 @app.post("/api/translate_culture_aware", response_model=CultureAwareTranslationResponse)
 async def translate_culture_aware_endpoint(request: CultureAwareTranslationRequest):
     """
     영어 alt-text를 문화적 특성을 고려하여 번역 - 새로운 TranslatorPipeline 사용
     """
     try:
-        # 지원하는 언어 검증 및 언어명 매핑
-        language_to_name = {
-            'ko': 'Korean',
-            'es': 'Spanish', 
-            'zh': 'Chinese'
-        }
-        
-        if request.target_language not in language_to_name:
+        # 지원하는 언어 검증
+        if request.target_language not in LANGUAGE_NAMES:
             raise HTTPException(
                 status_code=400, 
-                detail=f"지원하지 않는 언어입니다. 지원 언어: {list(language_to_name.keys())}"
+                detail=f"지원하지 않는 언어입니다. 지원 언어: {list(LANGUAGE_NAMES.keys())}"
             )
         
         # 🔥 언어 코드를 언어명으로 변환
-        target_language_name = language_to_name[request.target_language]
+        target_language_name = LANGUAGE_NAMES[request.target_language]
         
         # 🔥 image_url이 없으면 에러 발생 (디버깅을 위해 fallback 제거)
         if not request.image_url:
@@ -263,4 +540,150 @@ async def translate_culture_aware_endpoint(request: CultureAwareTranslationReque
         raise
     except Exception as e:
         logging.error(f"Culture-aware translation error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/translate_culture_aware_stream")
+async def translate_culture_aware_stream_endpoint(request: CultureAwareTranslationRequest, format: str = "sse"):
+    """
+    문화 인식 번역 진행 상황을 스트리밍 (format: "sse" 또는 "ndjson")
+
+    - {"event": "guidelines"}: 가이드라인 준비 완료
+    - {"event": "token"}: 번역 생성 토큰 (생성 중인 번역을 바로 표시)
+    - {"event": "evaluation"}: 평가 점수, {"event": "retry"}: 피드백을 반영해 다시 생성
+    - {"event": "done"}: /api/translate_culture_aware와 같은 형식의 최종 결과
+    """
+    if format not in STREAM_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 형식입니다. 지원 형식: {list(STREAM_MEDIA_TYPES.keys())}")
+    if request.target_language not in LANGUAGE_NAMES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"지원하지 않는 언어입니다. 지원 언어: {list(LANGUAGE_NAMES.keys())}"
+        )
+    if not request.image_url:
+        raise HTTPException(
+            status_code=400,
+            detail="image_url이 필요합니다. Vision API를 사용하려면 유효한 이미지 URL을 제공해야 합니다."
+        )
+
+    return StreamingResponse(
+        stream_translation(request, format),
+        media_type=STREAM_MEDIA_TYPES[format],
+    )
+
+async def stream_translation(request: CultureAwareTranslationRequest, stream_format: str = "sse"):
+    try:
+        translator = await asyncio.to_thread(get_translator_pipeline)
+        async for event in translator.translate_events(
+            original_alt_text=request.english_alt_text,
+            target_language_name=LANGUAGE_NAMES[request.target_language],
+            image_url=request.image_url,
+            image_type=request.image_type or "informative",
+        ):
+            if event["event"] == "done":
+                result = event["result"]
+                response = CultureAwareTranslationResponse(
+                    original_text=request.english_alt_text,
+                    translated_text=result.get('translated_text', request.english_alt_text),
+                    target_language=request.target_language,
+                    guidelines=result.get('guidelines'),
+                    evaluation=result.get('evaluation')
+                )
+                event = {"event": "done", "success": result.get('success', False),
+                         "error": result.get('error'), "result": response.model_dump()}
+            yield format_stream_event(event, stream_format)
+    except Exception as e:
+        logging.error(f"Culture-aware translation stream error: {e}")
+        yield format_stream_event({"event": "error", "status_code": 500, "detail": str(e)}, stream_format)
+
+@app.post("/api/translate_culture_aware_batch")
+async def translate_culture_aware_batch_endpoint(request: BatchTranslationRequest, format: str = "ndjson"):
+    """
+    여러 alt-text를 여러 언어로 한 번에 번역하고, 끝나는 순서대로 스트리밍 (format: "ndjson" 또는 "sse")
+
+    - 이미지는 URL별로 한 번만 처리한 뒤 모든 언어의 번역에서 재사용
+    - 동시에 실행하는 번역 수는 TRANSLATOR_CONFIG["batch_concurrency"]로 제한
+    - {"event": "translation"} / {"event": "translation_error"}: (item_index, target_language)별 결과
+    - {"event": "done"}: 전체 종료
+    - {"event": "error"}: 번역 파이프라인 초기화 실패 등으로 배치 전체가 중단됨 (스트림 종료)
+    """
+    if format not in STREAM_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 형식입니다. 지원 형식: {list(STREAM_MEDIA_TYPES.keys())}")
+
+    unsupported = [language for language in request.target_languages if language not in LANGUAGE_NAMES]
+    if unsupported or not request.target_languages:
+        raise HTTPException(
+            status_code=400,
+            detail=f"지원하지 않는 언어입니다: {unsupported}. 지원 언어: {list(LANGUAGE_NAMES.keys())}"
+        )
+
+    return StreamingResponse(
+        stream_batch_translation(request, format),
+        media_type=STREAM_MEDIA_TYPES[format],
+    )
+
+async def stream_batch_translation(request: BatchTranslationRequest, stream_format: str = "ndjson"):
+    try:
+        translator = await asyncio.to_thread(get_translator_pipeline)
+    except Exception as e:
+        logging.error(f"Batch translation stream error: {e}")
+        yield format_stream_event({"event": "error", "status_code": 500, "detail": str(e)}, stream_format)
+        return
+
+    semaphore = asyncio.Semaphore(TRANSLATOR_CONFIG["batch_concurrency"])
+    target_languages = list(dict.fromkeys(request.target_languages))
+    prepared_images = {}
+
+    def prepare(image_url):
+        # 같은 이미지 URL은 항목/언어에 관계없이 한 번만 처리
+        if image_url not in prepared_images:
+            prepared_images[image_url] = asyncio.ensure_future(translator.prepare_image(image_url))
+        return prepared_images[image_url]
+
+    async def translate(index, item, language):
+        try:
+            processed_image_url = await prepare(item.image_url)
+            async with semaphore:
+                result = await translator.translate(
+                    original_alt_text=item.english_alt_text,
+                    target_language_name=LANGUAGE_NAMES[language],
+                    image_url=processed_image_url,
+                    image_type=item.image_type or "informative",
+                    image_processed=True,
+                )
+            response = CultureAwareTranslationResponse(
+                original_text=item.english_alt_text,
+                translated_text=result.get('translated_text', item.english_alt_text),
+                target_language=language,
+                guidelines=result.get('guidelines'),
+                evaluation=result.get('evaluation')
+            )
+            return {"event": "translation", "item_index": index, "target_language": language,
+                    "success": result.get('success', False), "result": response.model_dump()}
+        except Exception as e:
+            logging.error(f"Batch translation error (item {index}, {language}): {e}")
+            detail = e.detail if isinstance(e, HTTPException) else str(e)
+            return {"event": "translation_error", "item_index": index, "target_language": language, "detail": detail}
+
+    tasks = [
+        asyncio.create_task(translate(index, item, language))
+        for index, item in enumerate(request.items)
+        for language in target_languages
+    ]
+    try:
+        succeeded = 0
+        for next_done in asyncio.as_completed(tasks):
+            event = await next_done
+            if event["event"] == "translation" and event["success"]:
+                succeeded += 1
+            yield format_stream_event(event, stream_format)
+
+        yield format_stream_event({"event": "done", "translations": len(tasks), "succeeded": succeeded}, stream_format)
+    except Exception as e:
+        logging.error(f"Batch translation stream error: {e}")
+        yield format_stream_event({"event": "error", "status_code": 500, "detail": str(e)}, stream_format)
+    finally:
+        # 클라이언트 연결 종료 시 남은 번역 취소
+        for task in tasks:
+            task.cancel()
+        for future in prepared_images.values():
+            future.cancel()
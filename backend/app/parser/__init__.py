@@ -1,12 +1,31 @@
 from .utils import setup_logging, setup_webdriver, load_config
+from .pool import WebDriverPool, WebDriverPoolExhausted, get_webdriver_pool, shutdown_webdriver_pool
+from .context import ContextStore, get_context_store
+from .dom import parse_html, serialize_html, source_doctype, make_images_absolute
+from .rewrite import AltTextRewriter, rewrite_alt_texts, make_srcs_absolute
+from .static import StaticFetchError, fetch_static_html, collect_static_image_info, browser_required_reason
+from .executor import (
+    ParseExecutor,
+    ParseQueueFull,
+    ParseDeadlineExceeded,
+    get_parse_executor,
+    shutdown_parse_executor,
+)
 from .parser import (
     parse_page,
+    iter_page_images,
+    load_page_static,
+    load_page_with_browser,
+    ParseCancelled,
     wait_for_page_load,
     wait_for_images,
+    collect_image_info,
     get_image_sizes,
     select_container,
     check_button,
     check_image_rendered,
     process_images,
+    iter_images,
     extract_content,
+    extract_local_context,
 ) 
\ No newline at end of file
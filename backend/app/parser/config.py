@@ -3,7 +3,27 @@ WEBDRIVER_CONFIG = {
     "timeout": 20,                # 페이지 로딩 대기 시간
     "retry_attempts": 3,          # 재시도 횟수
     "retry_wait": 5,             # 재시도 대기 시간(초)
-    "scroll_pause_time": 2,      # 스크롤 후 대기 시간
+    "scroll_pause_time": 2,      # 스크롤 후 대기 시간 (legacy 모드)
+    "scroll_mode": "event",      # "event": 이벤트 기반 스크롤, "legacy": 고정 sleep 스크롤
+    "scroll_deadline": 15,       # event 모드 전체 제한 시간(초)
+    "scroll_quiet_ms": 300,      # 이 시간 동안 DOM/이미지 이벤트가 없으면 안정된 것으로 판단
+}
+
+# 웹드라이버 풀 설정
+WEBDRIVER_POOL_CONFIG = {
+    "pool_size": 3,               # 동시에 유지할 최대 브라우저 수
+    "prewarm": True,              # 앱 시작 시 브라우저를 미리 띄워둘지 여부
+    "lease_timeout": 30,          # 모든 브라우저가 사용 중일 때 대기할 최대 시간(초)
+    "max_pages_per_driver": 50,   # 이 횟수만큼 사용한 브라우저는 폐기 후 새로 생성
+    "health_check_timeout": 5,    # 헬스 체크 스크립트 응답 대기 시간(초)
+}
+
+# 파싱 전용 실행기 설정 (이벤트 루프 밖에서 Selenium 작업 실행)
+PARSE_EXECUTOR_CONFIG = {
+    "max_workers": 3,                 # 동시에 실행할 파싱 작업 수 (웹드라이버 풀 크기와 동일하게 유지)
+    "max_queue": 20,                  # 실행 대기 중인 작업의 최대 개수, 초과 시 503
+    "request_deadline": 120,          # 요청당 최대 처리 시간(초), 초과 시 504
+    "disconnect_poll_interval": 0.5,  # 클라이언트 연결 종료 확인 주기(초)
 }
 
 # 크롬 드라이버 옵션
@@ -35,6 +55,40 @@ IMAGE_CONFIG = {
     "min_height": 5,          # 최소 이미지 높이
 }
 
+# 페이지 컨텍스트 저장소 설정 (이미지 데이터에는 context_id만 포함)
+PAGE_CONTEXT_CONFIG = {
+    "ttl": 60 * 60,           # 컨텍스트 보관 시간(초)
+    "max_entries": 500,       # 초과 시 오래된 것부터 삭제
+}
+
+# 이미지별 주변 컨텍스트 추출 설정 (figcaption, 주변 문단, 가까운 제목, 링크 텍스트, aria 속성)
+LOCAL_CONTEXT_CONFIG = {
+    "enabled": True,
+    "max_tokens": 150,        # 이미지 1개의 주변 컨텍스트 최대 토큰 수 (4자 ≈ 1토큰)
+    "field_max_chars": 300,   # 항목(캡션, 문단 등) 하나의 최대 글자 수
+    "paragraph_max_levels": 3,    # 주변 문단을 찾을 때 올라가는 조상 단계 수
+    "paragraph_max_siblings": 2,  # 각 단계에서 확인하는 앞/뒤 형제 수
+    "page_context": True,     # False이면 readability 페이지 요약(extract_content)을 만들지 않음
+}
+
+# 브라우저 없이 HTTP로 받은 HTML만 파싱하는 정적 모드 설정
+STATIC_PARSE_CONFIG = {
+    "default_mode": "browser",    # 요청에 mode가 없을 때: "browser" / "static" / "auto"
+    "timeout": 10,                # HTML/이미지 헤더 요청 제한 시간(초)
+    "max_html_bytes": 5 * 1024 * 1024,
+    "user_agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+    ),
+    "size_probe_bytes": 64 * 1024,  # 크기 속성이 없는 이미지는 앞부분만 받아 헤더에서 크기 확인
+    "max_size_probes": 40,        # 페이지당 최대 크기 확인 요청 수
+    "probe_workers": 8,           # 크기 확인 동시 요청 수
+    # auto 모드에서 브라우저로 전환하는 기준
+    "min_images": 1,              # 보이는 이미지가 이보다 적으면 전환
+    "min_text_chars": 200,        # 본문 텍스트가 이보다 짧고 SPA 흔적이 있으면 전환
+    "unknown_size_ratio": 0.5,    # 크기를 알 수 없는 이미지 비율이 이 이상이면 전환
+}
+
 # 로깅 설정
 LOGGING_CONFIG = {
     "level": "DEBUG",
@@ -0,0 +1,87 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from parser.utils import load_config
+
+logger = logging.getLogger(__name__)
+
+
+class ContextStore:
+    """
+    페이지 전체 컨텍스트(extract_content 결과)를 한 번만 보관하고 context_id로 참조하게 하는 저장소
+
+    - 이미지마다 같은 컨텍스트 문자열을 복사하지 않도록 이미지 데이터에는 context_id만 넣음
+    - context_id는 내용 해시이므로 같은 페이지를 다시 파싱해도 같은 ID
+    - ttl이 지나거나 max_entries를 넘으면 오래된 것부터 삭제
+    """
+
+    def __init__(self, ttl=None, max_entries=None):
+        context_config = load_config()["PAGE_CONTEXT_CONFIG"]
+        self.ttl = ttl or context_config["ttl"]
+        self.max_entries = max_entries or context_config["max_entries"]
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0  # 없거나 만료된 context_id 조회 수 (/api/metrics)
+
+    def put(self, text):
+        context_id = hashlib.sha256((text or "").encode("utf-8")).hexdigest()[:16]
+        with self._lock:
+            self._entries[context_id] = (text, time.monotonic())
+            self._entries.move_to_end(context_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return context_id
+
+    def get(self, context_id):
+        """context_id의 컨텍스트 (없거나 만료되었으면 None)"""
+        if not context_id:
+            return None
+        with self._lock:
+            entry = self._entries.get(context_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            text, stored_at = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[context_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(context_id)
+            self.hits += 1
+            return text
+
+    def get_many(self, context_ids):
+        """여러 context_id → {context_id: 컨텍스트} (응답에 한 번씩만 포함할 때 사용)"""
+        contexts = {}
+        for context_id in context_ids:
+            if context_id and context_id not in contexts:
+                text = self.get(context_id)
+                if text is not None:
+                    contexts[context_id] = text
+        return contexts
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_context_store():
+    """프로세스 전역 ContextStore 반환 (최초 호출 시 생성)"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ContextStore()
+        return _store
@@ -0,0 +1,137 @@
+"""
+lxml 기반 HTML 파싱 계층
+
+문서를 한 번만 파싱하고 같은 트리를 이미지 추출, readability(extract_content), URL 변환에 재사용
+(예전에는 BeautifulSoup(html.parser)로 파싱한 뒤 readability용으로 str(soup)을 다시 파싱했음)
+"""
+
+import re
+from functools import lru_cache
+from urllib.parse import urljoin
+
+from lxml import etree
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+
+HEADING_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+
+# 문서 맨 앞(공백/주석 뒤)의 doctype 선언
+DOCTYPE_PATTERN = re.compile(r"^\s*(?:<!--.*?-->\s*)*(<!doctype[^>]*>)", re.IGNORECASE | re.DOTALL)
+
+# 보이는 텍스트 노드 (script/style 등 안의 텍스트 제외)
+_VISIBLE_TEXT = etree.XPath(
+    "descendant-or-self::text()"
+    "[not(ancestor::script or ancestor::style or ancestor::noscript or ancestor::template)]"
+)
+
+# 이미지 앞에 있는 가장 가까운 제목 (역방향 축이므로 [1]이 가장 가까운 요소)
+_PRECEDING_HEADING = etree.XPath(
+    "preceding::*[" + " or ".join(f"self::{tag}" for tag in HEADING_TAGS) + "][1]"
+)
+
+
+def parse_html(html_code):
+    """
+    HTML 문자열/바이트를 lxml 문서(HtmlElement)로 파싱
+
+    XML 인코딩 선언이 있는 문자열은 lxml이 거부하므로 UTF-8 바이트로 바꿔 파싱
+    """
+    if isinstance(html_code, str):
+        try:
+            return lxml_html.document_fromstring(html_code)
+        except ValueError:
+            html_code = html_code.encode("utf-8")
+            return lxml_html.document_fromstring(html_code, parser=lxml_html.HTMLParser(encoding="utf-8"))
+    return lxml_html.document_fromstring(html_code)
+
+
+def source_doctype(html_code):
+    """원본 HTML에 실제로 있던 doctype 선언 (없으면 None)"""
+    if isinstance(html_code, bytes):
+        html_code = html_code[:4096].decode("ascii", errors="ignore")
+    match = DOCTYPE_PATTERN.match(html_code)
+    return match.group(1) if match else None
+
+
+def serialize_html(doc, doctype=None):
+    """
+    parse_html 결과를 문자열로 변환
+
+    lxml은 doctype이 없던 문서에도 기본값(HTML 4.0 Transitional, quirks 모드)을 채우므로
+    docinfo.doctype은 쓰지 않고, 원본의 doctype(source_doctype 결과)을 넘긴 경우에만 앞에 붙임
+    원본 문자열을 그대로 보존해야 하면 parser.rewrite의 문자열 치환을 사용
+    """
+    body = lxml_html.tostring(doc, encoding="unicode", method="html")
+    return f"{doctype}\n{body}" if doctype else body
+
+
+def make_images_absolute(doc, base_url):
+    """모든 <img>의 src를 base_url 기준 절대 경로로 변환 (트리를 직접 수정)"""
+    for img in doc.iter("img"):
+        src = img.get("src")
+        if src:
+            img.set("src", urljoin(base_url, src))
+    return doc
+
+
+@lru_cache(maxsize=128)
+def _css_selector(selector):
+    return CSSSelector(selector, translator="html")
+
+
+def select_one(element, selector):
+    """CSS 선택자에 맞는 첫 번째 요소 (없으면 None)"""
+    matches = _css_selector(selector)(element)
+    return matches[0] if matches else None
+
+
+def text_of(element):
+    """
+    요소 안의 보이는 텍스트 (BeautifulSoup의 get_text(" ")에 해당)
+
+    itertext()와 달리 script/style/noscript/template 안의 텍스트(JSON 데이터, CSS 등)는 제외
+    """
+    return " ".join(_VISIBLE_TEXT(element))
+
+
+def find_ancestor(element, *tags):
+    """tags 중 하나인 가장 가까운 조상 요소 (없으면 None)"""
+    return next(element.iterancestors(*tags), None)
+
+
+def find_previous_heading(element):
+    """문서 순서상 element 앞에 있는 가장 가까운 제목 요소 (없으면 None)"""
+    headings = _PRECEDING_HEADING(element)
+    return headings[0] if headings else None
+
+
+def find_nearby(element, tag, max_levels=3, max_siblings=2):
+    """
+    element 주변의 가장 가까운 tag 요소 (없으면 None)
+
+    element와 조상 max_levels단계까지 올라가며, 각 단계에서 앞/뒤 형제를 가까운 순서로 max_siblings개씩 확인
+    (형제 자신이 tag이거나 형제의 바로 아래 자식이 tag인 경우)
+    페이지 전체를 감싼 블록 안의 먼 요소를 가져오지 않도록 탐색 범위를 제한함
+    """
+    current = element
+    for _ in range(max_levels + 1):
+        if current is None:
+            return None
+        previous = current.itersiblings(preceding=True)
+        following = current.itersiblings()
+        for _ in range(max_siblings):
+            for sibling in (next(previous, None), next(following, None)):
+                if sibling is None or not isinstance(sibling.tag, str):
+                    continue
+                if sibling.tag == tag:
+                    return sibling
+                child = sibling.find(tag)
+                if child is not None:
+                    return child
+        current = current.getparent()
+    return None
+
+
+def class_list(element):
+    """class 속성을 리스트로 (BeautifulSoup의 element.get("class", [])에 해당)"""
+    return (element.get("class") or "").split()
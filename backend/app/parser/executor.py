@@ -0,0 +1,194 @@
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from parser.parser import ParseCancelled
+from parser.utils import load_config
+
+logger = logging.getLogger(__name__)
+
+
+class ParseQueueFull(Exception):
+    """실행 중 + 대기 중인 파싱 작업이 한도를 넘었을 때 발생"""
+
+
+class ParseDeadlineExceeded(Exception):
+    """요청당 제한 시간 안에 파싱이 끝나지 않았을 때 발생"""
+
+
+class ParseExecutor:
+    """
+    Selenium 파싱을 이벤트 루프 밖의 전용 스레드 풀에서 실행하는 실행기
+
+    - max_workers 만큼만 동시에 실행하고, max_queue를 넘는 요청은 즉시 거절
+    - 요청별 제한 시간과 클라이언트 연결 종료 시 cancel_event를 설정해 작업을 중단
+    - 대기열 길이/실행 수/완료·실패·취소 횟수를 stats로 제공
+    """
+
+    def __init__(self, max_workers=None, max_queue=None, request_deadline=None):
+        executor_config = load_config()["PARSE_EXECUTOR_CONFIG"]
+        self.max_workers = max_workers or executor_config["max_workers"]
+        self.max_queue = max_queue if max_queue is not None else executor_config["max_queue"]
+        self.request_deadline = request_deadline or executor_config["request_deadline"]
+        self.disconnect_poll_interval = executor_config["disconnect_poll_interval"]
+
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="parser")
+        self._lock = threading.Lock()
+        self._counters = {
+            "queued": 0,
+            "running": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "timeouts": 0,
+            "cancelled": 0,
+        }
+
+    def stats(self):
+        with self._lock:
+            return {
+                **self._counters,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+            }
+
+    async def run(self, fn, *args, request=None, deadline=None, **kwargs):
+        """
+        fn(*args, cancel_event=..., **kwargs)를 전용 스레드 풀에서 실행하고 결과를 반환
+
+        Args:
+            request: starlette Request (주어지면 클라이언트 연결 종료 시 작업 취소)
+            deadline: 제한 시간(초), 기본값은 PARSE_EXECUTOR_CONFIG["request_deadline"]
+        """
+        self._reserve()
+        cancel_event = threading.Event()
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self.executor, functools.partial(self._tracked(fn, cancel_event), *args, **kwargs)
+        )
+
+        disconnect_task = None
+        if request is not None:
+            disconnect_task = asyncio.create_task(self._wait_for_disconnect(request))
+
+        try:
+            waiters = {future} if disconnect_task is None else {future, disconnect_task}
+            done, _ = await asyncio.wait(
+                waiters,
+                timeout=deadline or self.request_deadline,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if future in done:
+                return future.result()
+
+            cancel_event.set()
+            # 스레드는 강제로 멈출 수 없으므로 결과만 버림
+            future.add_done_callback(lambda f: f.exception())
+            if disconnect_task is not None and disconnect_task in done:
+                logger.info("클라이언트 연결 종료로 파싱 취소")
+                raise ParseCancelled("클라이언트 연결이 종료되었습니다.")
+
+            with self._lock:
+                self._counters["timeouts"] += 1
+            raise ParseDeadlineExceeded(f"{deadline or self.request_deadline}초 안에 파싱이 끝나지 않았습니다.")
+
+        except asyncio.CancelledError:
+            cancel_event.set()
+            raise
+
+        finally:
+            if disconnect_task is not None:
+                disconnect_task.cancel()
+
+    def wrap_iterator(self, make_iterator, cancel_event):
+        """
+        스트리밍 파싱용: make_iterator(cancel_event)가 만드는 이터레이터를 대기열 통계에 포함시킴
+
+        반환된 팩토리는 self.executor에서 실행되어야 함 (streaming.iterate_in_thread의 executor 인자)
+        """
+        self._reserve()
+
+        def tracked_iterator():
+            self._start(cancel_event)
+            failed = False
+            try:
+                yield from make_iterator(cancel_event)
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                self._finish(cancel_event, failed)
+
+        return tracked_iterator
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _reserve(self):
+        with self._lock:
+            if self._counters["queued"] + self._counters["running"] >= self.max_workers + self.max_queue:
+                self._counters["rejected"] += 1
+                raise ParseQueueFull("파싱 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.")
+            self._counters["queued"] += 1
+
+    def _tracked(self, fn, cancel_event):
+        def job(*args, **kwargs):
+            self._start(cancel_event)
+            failed = False
+            try:
+                return fn(*args, cancel_event=cancel_event, **kwargs)
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                self._finish(cancel_event, failed)
+        return job
+
+    def _start(self, cancel_event):
+        with self._lock:
+            self._counters["queued"] -= 1
+            self._counters["running"] += 1
+        if cancel_event.is_set():
+            # 대기열에 있는 동안 취소/시간 초과된 작업은 실행하지 않음
+            with self._lock:
+                self._counters["running"] -= 1
+                self._counters["cancelled"] += 1
+            raise ParseCancelled("대기 중 취소된 파싱 작업입니다.")
+
+    def _finish(self, cancel_event, failed):
+        with self._lock:
+            self._counters["running"] -= 1
+            if cancel_event.is_set():
+                self._counters["cancelled"] += 1
+            elif failed:
+                self._counters["failed"] += 1
+            else:
+                self._counters["completed"] += 1
+
+    async def _wait_for_disconnect(self, request):
+        while not await request.is_disconnected():
+            await asyncio.sleep(self.disconnect_poll_interval)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_parse_executor():
+    """프로세스 전역 ParseExecutor 반환 (최초 호출 시 생성)"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ParseExecutor()
+        return _executor
+
+
+def shutdown_parse_executor():
+    """프로세스 전역 ParseExecutor 종료"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
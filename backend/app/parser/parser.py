@@ -11,12 +11,29 @@ from selenium.common.exceptions import (
 )
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 from readability.readability import Document
 from retrying import retry
 
-from parser.utils import load_config, setup_webdriver, setup_logging  # utils의 함수들을 명시적으로 import
+from parser.utils import load_config, setup_logging  # utils의 함수들을 명시적으로 import
+from parser.pool import get_webdriver_pool, WebDriverPoolExhausted
+from parser.context import get_context_store
+from parser.dom import (
+    class_list,
+    find_ancestor,
+    find_nearby,
+    find_previous_heading,
+    parse_html,
+    select_one,
+    text_of,
+)
+from parser.rewrite import make_srcs_absolute
+from parser.static import (
+    StaticFetchError,
+    browser_required_reason,
+    collect_static_image_info,
+    fetch_static_html,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -26,16 +43,20 @@ logger = logging.getLogger(__name__)
     retry_on_exception=lambda e: isinstance(e, (WebDriverException, TimeoutException))
 )
 def make_img_src_absolute(html_code: str, base_url: str) -> str:
-    soup = BeautifulSoup(html_code, 'html.parser')
-    for img_tag in soup.find_all('img'):
-        src = img_tag.get('src')
-        if src:
-            absolute_src = urljoin(base_url, src)
-            img_tag['src'] = absolute_src
-    return str(soup)
+    # 트리로 다시 직렬화하지 않고 <img>의 src만 문자열에서 치환 (doctype, 조각 HTML 등 원본 유지)
+    return make_srcs_absolute(html_code, base_url)
+
+
+class ParseCancelled(Exception):
+    """cancel_event가 설정되어 파싱을 중단했을 때 발생"""
+
+
+def _check_cancelled(cancel_event):
+    if cancel_event is not None and cancel_event.is_set():
+        raise ParseCancelled("파싱이 취소되었습니다.")
 
 
-def download_html(url, enable_logging=True):
+def download_html(url, enable_logging=True, cancel_event=None):
     """
     Selenium으로 주어진 URL을 열고 최종 렌더링된 HTML을 반환하며, HTML 코드를 파일로 저장할 수 있는 함수
 
@@ -43,6 +64,7 @@ def download_html(url, enable_logging=True):
         url (str): 대상 페이지 URL
         enable_logging (bool): 로깅 활성화 여부
         output_file (str): 저장할 HTML 파일 경로 (예: 'output.html')
+        cancel_event (threading.Event): 설정되면 다음 단계 전에 ParseCancelled 발생
 
     Returns:
         str: 최종 렌더링된 HTML (page_source)
@@ -50,22 +72,21 @@ def download_html(url, enable_logging=True):
     setup_logging(enable_logging)
     logger.info(f"HTML 다운로드 시작: {url}")
 
-    driver = None
     try:
-        # 1) WebDriver 세팅
-        driver = setup_webdriver()
+        # 1) 풀에서 WebDriver 대여 (with 블록 종료 시 자동 반납)
+        with get_webdriver_pool().lease() as driver:
+            # 2) 페이지 접속
+            driver.get(url)
 
-        # 2) 페이지 접속
-        driver.get(url)
+            # 3) 페이지 로딩 대기
+            wait_for_page_load(driver)
+            _check_cancelled(cancel_event)
 
-        # 3) 페이지 로딩 대기
-        wait_for_page_load(driver)
+            # 4) 광고 제거 등 필요시 추가 작업
+            remove_ads(driver)
 
-        # 4) 광고 제거 등 필요시 추가 작업
-        remove_ads(driver)
-
-        # 5) 최종 page_source 획득
-        html_content = driver.page_source
+            # 5) 최종 page_source 획득
+            html_content = driver.page_source
         
         # 절대 경로로 변환
         html_code = make_img_src_absolute(html_content, url)
@@ -73,6 +94,9 @@ def download_html(url, enable_logging=True):
         logger.info("HTML 다운로드 완료")
         return html_code
 
+    except (WebDriverPoolExhausted, ParseCancelled):
+        # 풀이 가득 찬 경우(503)와 취소된 경우는 호출 측에서 처리하도록 그대로 전달
+        raise
     except WebDriverException as e:
         logger.error(f"WebDriver 오류: {e}")
         return None
@@ -80,15 +104,15 @@ def download_html(url, enable_logging=True):
         logger.error(f"예상치 못한 오류: {e}", exc_info=True)
         return None
     finally:
-        if driver:
-            driver.quit()
-
         for handler in logger.handlers[:]:
             handler.close()
             logger.removeHandler(handler)
 
 
-def parse_page(url, container=None, enable_logging=True):
+PARSE_MODES = ("browser", "static", "auto")
+
+
+def parse_page(url, container=None, enable_logging=True, cancel_event=None, mode=None):
     """
     웹 페이지를 파싱하여 이미지와 콘텐츠를 추출하는 메인 함수
     
@@ -96,44 +120,23 @@ def parse_page(url, container=None, enable_logging=True):
         url: 파싱할 웹 페이지 URL
         container: 특정 컨테이너 내의 콘텐츠만 파싱하고 싶을 때 사용할 CSS 선택자
         enable_logging: 로깅 활성화 여부 (기본값: True)
+        cancel_event: 설정되면 다음 단계 전에 ParseCancelled 발생 (threading.Event)
+        mode: "browser" / "static" / "auto" (None이면 STATIC_PARSE_CONFIG["default_mode"])
         
     Returns:
         dict: 이미지 데이터와 콘텐츠를 포함하는 딕셔너리
     """
-    setup_logging(enable_logging)
-    logger.info(f"페이지 파싱 시작: {url}")
-    
-    driver = None
     try:
-        driver = setup_webdriver()
-        driver.get(url)
-        base_url = driver.current_url
-        
-        # 페이지 로딩 대기
-        wait_for_page_load(driver)
-        wait_for_images(driver)
-        remove_ads(driver)
-        
-        # 이미지 크기 정보 수집
-        image_sizes = get_image_sizes(driver)
-        
-        # HTML 파싱
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        
-        # 콘텐츠 추출
-        context = extract_content(soup)
-        
-        # 이미지 처리
-        images = process_images(soup, driver, context, image_sizes, base_url, container)
-        
-
-        
-        logger.info(f"이미지 {len(images)}개 추출 완료")
+        images = list(iter_page_images(url, container, enable_logging, cancel_event, mode))
         if enable_logging:
             logger.debug(f"선택된 이미지 데이터: {images}")
         
         return images
         
+    except (WebDriverPoolExhausted, ParseCancelled, StaticFetchError):
+        # 풀이 가득 찬 경우(503), 취소된 경우, static 모드에서 HTML을 못 받은 경우(502)는 호출 측에서 처리
+        raise
+
     except WebDriverException as e:
         logger.error(f"WebDriver 오류: {e}")
         return None
@@ -141,16 +144,98 @@ def parse_page(url, container=None, enable_logging=True):
     except Exception as e:
         logger.error(f"예상치 못한 오류: {e}", exc_info=True)
         return None
+
+
+def iter_page_images(url, container=None, enable_logging=True, cancel_event=None, mode=None):
+    """
+    parse_page의 제너레이터 버전 - 이미지 데이터를 찾는 즉시 하나씩 반환
+
+    오류는 None으로 바꾸지 않고 그대로 raise 하며, cancel_event(threading.Event)가
+    설정되면 다음 단계로 넘어가기 전에 ParseCancelled를 발생시킴
+
+    mode
+    - "browser": 웹드라이버로 렌더링 후 파싱 (기존 방식)
+    - "static": HTTP로 받은 HTML만 파싱 (브라우저 사용 안 함)
+    - "auto": 먼저 정적 파싱을 시도하고, JS 렌더링 페이지로 보이거나 이미지가 부족하면 브라우저로 다시 파싱
+    """
+    setup_logging(enable_logging)
+    mode = mode or load_config()["STATIC_PARSE_CONFIG"]["default_mode"]
+    if mode not in PARSE_MODES:
+        raise ValueError(f"알 수 없는 파싱 모드: {mode}")
+    logger.info(f"페이지 파싱 시작: {url} (mode={mode})")
+    
+    try:
+        loaded = None
+        if mode in ("static", "auto"):
+            try:
+                loaded = load_page_static(url, cancel_event)
+            except StaticFetchError as e:
+                if mode == "static":
+                    raise
+                logger.info(f"정적 파싱 실패, 브라우저로 전환: {e}")
+            else:
+                reason = browser_required_reason(loaded[0], loaded[1])
+                if mode == "auto" and reason:
+                    logger.info(f"정적 파싱 결과 부족, 브라우저로 전환: {reason}")
+                    loaded = None
+            _check_cancelled(cancel_event)
+
+        if loaded is None:
+            loaded = load_page_with_browser(url, cancel_event)
+        doc, image_info, base_url = loaded
+            
+        # 콘텐츠 추출 (이미지 추출과 같은 lxml 트리 사용, 설정으로 끄면 이미지별 주변 컨텍스트만 사용)
+        context = extract_content(doc) if load_config()["LOCAL_CONTEXT_CONFIG"]["page_context"] else ""
+        
+        # 이미지 처리 (브라우저 반납 후 WebDriver 호출 없이 수행)
+        count = 0
+        for image in iter_images(doc, image_info, context, base_url, container):
+            _check_cancelled(cancel_event)
+            count += 1
+            yield image
+        
+        logger.info(f"이미지 {count}개 추출 완료")
         
     finally:
-        if driver:
-            driver.quit()
-            
         for handler in logger.handlers[:]:
             handler.close()
             logger.removeHandler(handler)
 
 
+def load_page_with_browser(url, cancel_event=None):
+    """웹드라이버로 페이지를 렌더링해 (doc, image_info, base_url) 반환"""
+    with get_webdriver_pool().lease() as driver:
+        driver.get(url)
+        base_url = driver.current_url
+        
+        # 페이지 로딩 대기
+        wait_for_page_load(driver)
+        _check_cancelled(cancel_event)
+        wait_for_images(driver)
+        _check_cancelled(cancel_event)
+        remove_ads(driver)
+        
+        # 한 번의 스크립트 호출로 모든 이미지의 크기/렌더링/버튼 여부 수집
+        image_info = collect_image_info(driver)
+        
+        # HTML 파싱 (collect_image_info가 부여한 data-altcat-idx 속성 포함)
+        doc = parse_html(driver.page_source)
+    return doc, image_info, base_url
+
+
+def load_page_static(url, cancel_event=None):
+    """
+    브라우저 없이 HTTP로 받은 HTML을 파싱해 (doc, image_info, base_url) 반환
+
+    image_info는 collect_image_info와 같은 형식 (크기는 속성/이미지 헤더에서 추정)
+    """
+    html_content, base_url = fetch_static_html(url)
+    _check_cancelled(cancel_event)
+    doc = parse_html(html_content)
+    image_info = collect_static_image_info(doc, base_url, IMAGE_INDEX_ATTR, check_button, cancel_event)
+    return doc, image_info, base_url
+
+
 def wait_for_page_load(driver):
     """페이지 로딩을 기다리는 함수"""
     configs = load_config()
@@ -159,106 +244,263 @@ def wait_for_page_load(driver):
     wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
 
 
-def wait_for_images(driver):
-    """이미지 로딩을 기다리는 최적화된 함수"""
+HIDE_POPUPS_SCRIPT = """
+const style = document.createElement('style');
+style.innerHTML = `
+    .braze-slideup, .popup-class-name, .ad-banner {
+        display: none !important;
+    }
+`;
+document.head.appendChild(style);
+"""
+
+# IntersectionObserver/MutationObserver와 이미지 load/error 이벤트로 구동되는 스크롤
+# - 마지막 이벤트 이후 quietMs 동안 변화가 없으면 다음 화면으로 스크롤
+# - 바닥에 도달한 뒤에도 조용하면 종료, deadlineMs가 지나면 무조건 종료
+EVENT_SCROLL_SCRIPT = """
+const done = arguments[arguments.length - 1];
+const deadlineMs = arguments[0];
+const quietMs = arguments[1];
+
+const startedAt = performance.now();
+let lastActivity = startedAt;
+let steps = 0;
+let finished = false;
+let checkTimer = null;
+
+function scrollHeight() {
+    return Math.max(
+        document.documentElement.scrollHeight,
+        document.body ? document.body.scrollHeight : 0,
+        document.documentElement.offsetHeight,
+        document.body ? document.body.offsetHeight : 0
+    );
+}
+
+function pendingImages() {
+    return Array.from(document.images).filter(img => img.getAttribute('src') && !img.complete).length;
+}
+
+function promote(img) {
+    if (img.loading === 'lazy') {
+        img.loading = 'eager';
+    }
+    if (img.dataset.src && img.getAttribute('src') !== img.dataset.src) {
+        img.src = img.dataset.src;
+    }
+}
+
+const intersectionObserver = new IntersectionObserver(entries => {
+    entries.forEach(entry => {
+        if (entry.isIntersecting) {
+            promote(entry.target);
+            intersectionObserver.unobserve(entry.target);
+            activity();
+        }
+    });
+}, { rootMargin: '100% 0px' });
+
+function watch(img) {
+    if (img.__altcatWatched) return;
+    img.__altcatWatched = true;
+    img.addEventListener('load', activity);
+    img.addEventListener('error', activity);
+    intersectionObserver.observe(img);
+}
+
+const mutationObserver = new MutationObserver(mutations => {
+    for (const mutation of mutations) {
+        mutation.addedNodes.forEach(node => {
+            if (node.nodeType !== 1) return;
+            if (node.tagName === 'IMG') watch(node);
+            if (node.querySelectorAll) node.querySelectorAll('img').forEach(watch);
+        });
+    }
+    activity();
+});
+
+function activity() {
+    lastActivity = performance.now();
+    scheduleCheck(quietMs);
+}
+
+function scheduleCheck(delay) {
+    if (finished) return;
+    clearTimeout(checkTimer);
+    checkTimer = setTimeout(check, delay);
+}
+
+function finish(timedOut) {
+    if (finished) return;
+    finished = true;
+    clearTimeout(checkTimer);
+    clearTimeout(deadlineTimer);
+    intersectionObserver.disconnect();
+    mutationObserver.disconnect();
+    window.scrollTo({ top: 0, behavior: 'instant' });
+    done({
+        steps: steps,
+        elapsed_ms: Math.round(performance.now() - startedAt),
+        pending_images: pendingImages(),
+        timed_out: timedOut,
+    });
+}
+
+function check() {
+    const idle = performance.now() - lastActivity;
+    if (idle < quietMs || pendingImages() > 0 && idle < quietMs * 4) {
+        // 아직 이벤트가 발생 중이거나 로딩 중인 이미지가 있음
+        scheduleCheck(Math.max(quietMs - idle, 50));
+        return;
+    }
+    const atBottom = window.scrollY + window.innerHeight >= scrollHeight() - 2;
+    if (atBottom) {
+        finish(false);
+        return;
+    }
+    window.scrollTo({ top: window.scrollY + window.innerHeight, behavior: 'instant' });
+    steps += 1;
+    activity();
+}
+
+const deadlineTimer = setTimeout(() => finish(true), deadlineMs);
+
+Array.from(document.images).forEach(watch);
+mutationObserver.observe(document.documentElement, {
+    childList: true,
+    subtree: true,
+    attributes: true,
+    attributeFilter: ['src', 'srcset'],
+});
+activity();
+"""
+
+def wait_for_images(driver, scroll_mode=None):
+    """
+    이미지 로딩을 기다리는 함수
+
+    scroll_mode(기본값: WEBDRIVER_CONFIG["scroll_mode"])가 "event"이면 페이지 내부 이벤트로
+    구동되는 스크롤을, "legacy"이면 고정 sleep 기반 스크롤을 사용
+    """
     configs = load_config()
+    webdriver_config = configs["WEBDRIVER_CONFIG"]
+    scroll_mode = scroll_mode or webdriver_config.get("scroll_mode", "event")
+    started_at = time.perf_counter()
     try:
-        wait = WebDriverWait(driver, configs["WEBDRIVER_CONFIG"]["timeout"])
-        wait.until(lambda d: len(d.find_elements(By.TAG_NAME, "img")) > 0)
-        driver.execute_script(
-            """
-            const style = document.createElement('style');
-            style.innerHTML = `
-                .braze-slideup, .popup-class-name, .ad-banner {
-                    display: none !important;
-                }
-            `;
-            document.head.appendChild(style);
-            """
-        )
-        # Lazy Load 이미지 로드 강제화
+        if scroll_mode == "legacy":
+            result = _scroll_with_fixed_sleeps(driver, configs)
+        else:
+            result = _scroll_until_quiescent(driver, webdriver_config)
+
+    except TimeoutException:
+        logger.error("이미지 로딩 시간 초과")
+        return False
+
+    finally:
+        logger.info(f"이미지 로딩 대기 완료: mode={scroll_mode}, elapsed={time.perf_counter() - started_at:.2f}s")
+
+    return result
+
+
+def _scroll_until_quiescent(driver, webdriver_config):
+    """DOM이 안정되거나 전체 제한 시간이 지날 때까지 이벤트 기반으로 스크롤"""
+    deadline = webdriver_config["scroll_deadline"]
+    driver.execute_script(HIDE_POPUPS_SCRIPT)
+    # 스크립트 자체 제한 시간보다 약간 여유를 둠
+    driver.set_script_timeout(deadline + 5)
+    stats = driver.execute_async_script(
+        EVENT_SCROLL_SCRIPT,
+        int(deadline * 1000),
+        webdriver_config["scroll_quiet_ms"],
+    )
+    logger.debug(f"이벤트 기반 스크롤 결과: {stats}")
+    if stats and stats.get("timed_out"):
+        logger.warning(f"스크롤 제한 시간 도달: 로딩 중인 이미지 {stats.get('pending_images')}개")
+    return True
+
+
+def _scroll_with_fixed_sleeps(driver, configs):
+    """기존 방식: 1000px씩 스크롤하며 고정 시간 sleep"""
+    wait = WebDriverWait(driver, configs["WEBDRIVER_CONFIG"]["timeout"])
+    wait.until(lambda d: len(d.find_elements(By.TAG_NAME, "img")) > 0)
+    driver.execute_script(HIDE_POPUPS_SCRIPT)
+    # Lazy Load 이미지 로드 강제화
+    driver.execute_script("""
+        Array.from(document.querySelectorAll('img[loading="lazy"]')).forEach(img => {
+            img.loading = 'eager';
+            if (img.dataset.src) {
+                img.src = img.dataset.src;
+            }
+        });
+    """)
+
+    # 스크롤 처리 개선
+    script = """
+        function getScrollHeight() {
+            return Math.max(
+                document.documentElement.scrollHeight,
+                document.body.scrollHeight,
+                document.documentElement.offsetHeight,
+                document.body.offsetHeight
+            );
+        }
+        return getScrollHeight();
+    """
+    
+    total_height = driver.execute_script(script)
+    current_height = 0
+    step = 1000  
+    while current_height < total_height:
+        # 스크롤 실행
+        driver.execute_script(f"""
+            window.scrollTo({{
+                top: {current_height + step},
+                behavior: 'smooth'
+            }});
+        """)
+        
+        # 스크롤 후 잠시 대기
+        time.sleep(0.5)
+        
+        # 새로운 이미지 로딩 처리
         driver.execute_script("""
             Array.from(document.querySelectorAll('img[loading="lazy"]')).forEach(img => {
-                img.loading = 'eager';
-                if (img.dataset.src) {
-                    img.src = img.dataset.src;
+                const rect = img.getBoundingClientRect();
+                if (rect.top <= window.innerHeight) {
+                    img.loading = 'eager';
+                    if (img.dataset.src) {
+                        img.src = img.dataset.src;
+                    }
                 }
             });
         """)
-
-        # 스크롤 처리 개선
-        script = """
-            function getScrollHeight() {
-                return Math.max(
-                    document.documentElement.scrollHeight,
-                    document.body.scrollHeight,
-                    document.documentElement.offsetHeight,
-                    document.body.offsetHeight
-                );
-            }
-            return getScrollHeight();
-        """
         
-        total_height = driver.execute_script(script)
-        current_height = 0
-        step = 1000  
-        while current_height < total_height:
-            # 스크롤 실행
-            driver.execute_script(f"""
-                window.scrollTo({{
-                    top: {current_height + step},
-                    behavior: 'smooth'
-                }});
-            """)
-            
-            # 스크롤 후 잠시 대기
-            time.sleep(0.5)
-            
-            # 새로운 이미지 로딩 처리
-            driver.execute_script("""
-                Array.from(document.querySelectorAll('img[loading="lazy"]')).forEach(img => {
-                    const rect = img.getBoundingClientRect();
-                    if (rect.top <= window.innerHeight) {
-                        img.loading = 'eager';
-                        if (img.dataset.src) {
-                            img.src = img.dataset.src;
-                        }
-                    }
-                });
-            """)
-            
-            # 새로운 높이 계산
-            new_height = driver.execute_script(script)
-            if new_height == total_height and current_height >= total_height - step:
-                break
-                
-            current_height += step
-            total_height = new_height
+        # 새로운 높이 계산
+        new_height = driver.execute_script(script)
+        if new_height == total_height and current_height >= total_height - step:
+            break
             
-        # 맨 위로 스크롤
-        driver.execute_script("window.scrollTo({ top: 0, behavior: 'smooth' });")
-        time.sleep(configs["WEBDRIVER_CONFIG"]["scroll_pause_time"])
-
-        # 모든 이미지 로드 확인
-        driver.execute_script("""
-            return Promise.all(Array.from(document.images).map(img => {
-                if (img.complete) return Promise.resolve();
-                return new Promise((resolve, reject) => {
-                    img.onload = resolve;
-                    img.onerror = reject;
-                });
-            }));
-        """)
-
-    except TimeoutException:
-        logger.error("이미지 로딩 시간 초과")
-        return False
+        current_height += step
+        total_height = new_height
+        
+    # 맨 위로 스크롤
+    driver.execute_script("window.scrollTo({ top: 0, behavior: 'smooth' });")
+    time.sleep(configs["WEBDRIVER_CONFIG"]["scroll_pause_time"])
+
+    # 모든 이미지 로드 확인
+    driver.execute_script("""
+        return Promise.all(Array.from(document.images).map(img => {
+            if (img.complete) return Promise.resolve();
+            return new Promise((resolve, reject) => {
+                img.onload = resolve;
+                img.onerror = reject;
+            });
+        }));
+    """)
 
     return True
 
 
-
-
 # def wait_for_images(driver):
 #     """이미지 로딩을 기다리는 함수"""
 #     configs = load_config()
@@ -308,26 +550,126 @@ def wait_for_images(driver):
 
 #     return True
 
-def get_image_sizes(driver):
+# 렌더링 여부와 관계없이 항상 포함시키는 ESA 이미지 경로
+ESA_PATHS = [
+    "/var/esa/storage/images/esa_multimedia/images/2012/03/europe_seen_by_andre_kuipers_onboard_the_iss/9251267-7-eng-GB/Europe_seen_by_Andre_Kuipers_onboard_the_ISS_pillars.jpg",
+    "/var/esa/storage/images/esa_multimedia/images/2018/10/from_mission_control_to_mercury/17835462-5-eng-GB/From_mission_control_to_Mercury_pillars.jpg"
+]
+
+# 각 <img>에 부여하는 인덱스 속성 (page_source의 태그와 수집 결과를 연결)
+IMAGE_INDEX_ATTR = "data-altcat-idx"
+
+COLLECT_IMAGE_INFO_SCRIPT = """
+const indexAttr = arguments[0];
+const filterClasses = arguments[1];
+const maxDepth = arguments[2];
+
+function isActuallyVisible(element) {
+    const style = window.getComputedStyle(element);
+    const rect = element.getBoundingClientRect();
+    return !(
+        style.display === 'none' ||
+        style.visibility === 'hidden' ||
+        parseFloat(style.opacity) === 0 ||
+        (rect.width === 0 && rect.height === 0)
+    );
+}
+
+function isRendered(img) {
+    // 이미지가 로딩 완료됐는지 체크
+    if (!img.complete || img.naturalWidth === 0 || img.naturalHeight === 0) {
+        return false;
+    }
+    let element = img;
+    while (element && element !== document.body) {
+        if (!isActuallyVisible(element)) {
+            return false;
+        }
+        element = element.parentElement;
+    }
+    return true;
+}
+
+function isButtonElement(element) {
+    const tag = element.tagName.toLowerCase();
+    return (
+        tag === 'button' ||
+        element.getAttribute('role') === 'button' ||
+        (tag === 'a' && !!element.getAttribute('href')) ||
+        !!element.getAttribute('onclick') ||
+        filterClasses.some(cls => element.classList.contains(cls))
+    );
+}
+
+function isButton(img) {
+    let element = img;
+    let depth = 0;
+    while (element && element !== document.documentElement && depth < maxDepth) {
+        if (isButtonElement(element)) {
+            return true;
+        }
+        element = element.parentElement;
+        depth += 1;
+    }
+    return false;
+}
+
+return Array.from(document.getElementsByTagName('img')).map((img, index) => {
+    img.setAttribute(indexAttr, String(index));
+    const rect = img.getBoundingClientRect();
+    return {
+        index: index,
+        src: img.getAttribute('src'),
+        resolved_src: img.src,
+        current_src: img.currentSrc || img.src,
+        width: img.naturalWidth || img.width,
+        height: img.naturalHeight || img.height,
+        natural_width: img.naturalWidth,
+        natural_height: img.naturalHeight,
+        rendered_width: rect.width,
+        rendered_height: rect.height,
+        rendered: isRendered(img),
+        is_button: isButton(img),
+    };
+});
+"""
+
+def collect_image_info(driver, filter_classes=None, max_depth=10):
+    """
+    한 번의 execute_script 호출로 페이지의 모든 <img> 정보를 수집
+
+    각 이미지에 data-altcat-idx 속성을 부여하므로, 이후 page_source로 만든 문서(parse_html)의
+    태그와 수집 결과를 인덱스로 연결할 수 있음
+
+    Returns:
+        list: 이미지별 src/currentSrc, natural/rendered 크기, 렌더링 여부, 버튼 여부
     """
-    현재 웹 페이지의 모든 이미지 태그(<img>)에서 URL과 크기를 추출
+    if filter_classes is None:
+        filter_classes = ["btn"]
+    return driver.execute_script(COLLECT_IMAGE_INFO_SCRIPT, IMAGE_INDEX_ATTR, filter_classes, max_depth) or []
+
+def find_image_info(img, image_info):
+    """문서의 <img> 요소에 대응하는 collect_image_info 결과를 반환 (없으면 None)"""
+    index = img.get(IMAGE_INDEX_ATTR)
+    if index is None or not index.isdigit():
+        return None
+    index = int(index)
+    if index >= len(image_info):
+        return None
+    return image_info[index]
+
+def get_image_sizes(image_info):
     """
-    size_dict = driver.execute_script(
-        """
-        return Array.from(document.getElementsByTagName('img')).reduce((acc, img) => {
-            acc[img.src] = {
-                width: img.naturalWidth || img.width,
-                height: img.naturalHeight || img.height
-            };
-            return acc;
-        }, {});
-        """
-    )
-    return size_dict
+    collect_image_info 결과에서 이미지 URL과 크기를 추출
+    """
+    return {
+        info["resolved_src"]: {"width": info["width"], "height": info["height"]}
+        for info in image_info
+    }
 
-def select_container(soup, container):
+def select_container(doc, container):
     """원하는 container 선택"""
-    container_elem = soup.select_one(container)
+    container_elem = select_one(doc, container)
 
     if container_elem is None:
         raise NoSuchElementException(f"컨테이너를 찾을 수 없습니다: {container}")
@@ -340,39 +682,43 @@ def is_button_element(element, filter_classes):
     요소가 버튼 역할을 하는지 확인하는 헬퍼 함수
     """
     return (
-        element.name == "button"  # <button> 태그인지 확인
+        element.tag == "button"  # <button> 태그인지 확인
         or element.get("role") == "button"  # role="button" 속성 확인
-        or (element.name == "a" and element.get("href"))  # <a> 태그와 href 속성
+        or (element.tag == "a" and element.get("href"))  # <a> 태그와 href 속성
         or element.get("onclick")  # onclick 이벤트 속성 확인
         or any(
-            cls in element.get("class", []) for cls in filter_classes
+            cls in class_list(element) for cls in filter_classes
         )  # 커스텀 클래스 포함
     )
 
-def check_button(soup, element, filter_classes=None, max_depth=10):
+def check_button(doc, element, filter_classes=None, max_depth=10, image_info=None):
     """이미지 요소가 버튼의 일부인지 확인하는 함수"""
+    if image_info is not None:
+        # 브라우저에서 이미 판별한 결과가 있으면 그대로 사용
+        info = find_image_info(element, image_info)
+        if info is not None:
+            return info["is_button"]
+
     if filter_classes is None:
         filter_classes = ["btn"]
 
     current = element
     depth = 0
 
-    while current and current != soup and depth < max_depth:
+    while current is not None and current is not doc and depth < max_depth:
         if is_button_element(current, filter_classes):
             return True
 
-        current = current.parent
+        current = current.getparent()
         depth += 1
 
     return False
 
 def check_image_rendered(driver, partial_src):
-
-    ESA_PATHS = [
-        "/var/esa/storage/images/esa_multimedia/images/2012/03/europe_seen_by_andre_kuipers_onboard_the_iss/9251267-7-eng-GB/Europe_seen_by_Andre_Kuipers_onboard_the_ISS_pillars.jpg",
-        "/var/esa/storage/images/esa_multimedia/images/2018/10/from_mission_control_to_mercury/17835462-5-eng-GB/From_mission_control_to_Mercury_pillars.jpg"
-    ]
-
+    """
+    단일 이미지의 렌더링 여부 확인 (이미지마다 WebDriver 호출이 발생하므로
+    여러 이미지를 처리할 때는 collect_image_info 사용)
+    """
     if partial_src in ESA_PATHS:
         return True
 
@@ -413,30 +759,42 @@ def check_image_rendered(driver, partial_src):
 
     return driver.execute_script(script, partial_src)
 
-def process_images(soup, driver, context, image_sizes, base_url, container=None):
+def process_images(doc, image_info, context, base_url, container=None):
     """
     페이지 내의 이미지들을 처리하는 함수
     
     Args:
-        soup: BeautifulSoup 객체
-        driver: Selenium WebDriver 객체
-        image_sizes: 이미지 크기 정보 딕셔너리
+        doc: parse_html 결과 (lxml 문서)
+        image_info: collect_image_info 결과 (이미지별 크기/렌더링/버튼 여부)
+        context: 페이지 콘텐츠 요약
         base_url: 기본 URL
         container: 컨테이너 선택자 (선택사항)
         
     Returns:
         list: 처리된 이미지 정보 리스트
     """
+    return list(iter_images(doc, image_info, context, base_url, container))
+
+def iter_images(doc, image_info, context, base_url, container=None):
+    """
+    process_images의 제너레이터 버전
+
+    일반 이미지는 찾는 즉시 반환하고, 32x32 이하의 작은 이미지는 모아두었다가
+    마지막에 반환 (process_images와 동일한 순서)
+    """
     configs = load_config()
-    image_data = []
+    seen_original_urls = set()
     small_image_data = []
+    context_id = get_context_store().put(context) if context else None
+    local_context_config = configs["LOCAL_CONTEXT_CONFIG"]
+    root = doc
 
     logger = logging.getLogger(__name__)
 
     if container:
-        soup = select_container(soup, container)
+        doc = select_container(doc, container)
     
-    for img in soup.find_all("img"):
+    for img in doc.iter("img"):
         print(img)
 
         original_src = img.get("src")
@@ -444,22 +802,18 @@ def process_images(soup, driver, context, image_sizes, base_url, container=None)
         if (
             not original_src  # src가 없는 경우 스킵
             # or img.get("alt") == None # alt 속성이 없는 경우 스킵
-            or any(i["original_url"] == original_src for i in image_data)      # 이미 추출된 이미지인 경우 스킵
+            or original_src in seen_original_urls      # 이미 추출된 이미지인 경우 스킵
         ):
             continue
 
-        if not check_image_rendered(driver, original_src):
+        info = find_image_info(img, image_info)
+        if original_src not in ESA_PATHS and not (info and info["rendered"]):
             logger.info(f"화면에 존재하지 않는 이미지: {original_src}")
             continue
 
         src = original_src
         
         # 쿼리 파라미터 제거
-        
-        ESA_PATHS = [
-            "/var/esa/storage/images/esa_multimedia/images/2012/03/europe_seen_by_andre_kuipers_onboard_the_iss/9251267-7-eng-GB/Europe_seen_by_Andre_Kuipers_onboard_the_ISS_pillars.jpg",
-            "/var/esa/storage/images/esa_multimedia/images/2018/10/from_mission_control_to_mercury/17835462-5-eng-GB/From_mission_control_to_Mercury_pillars.jpg"
-        ]
 
         if src in ESA_PATHS:
             src = "https://www.esa.int" + src
@@ -472,7 +826,10 @@ def process_images(soup, driver, context, image_sizes, base_url, container=None)
         if not src.startswith(('http://', 'https://')):
             src = 'https://' + src.lstrip('/')
 
-        size_info = image_sizes.get(src, {"width": None, "height": None})
+        if info is not None:
+            size_info = {"width": info["width"], "height": info["height"]}
+        else:
+            size_info = {"width": None, "height": None}
         width = size_info.get("width")
         height = size_info.get("height")
 
@@ -488,41 +845,110 @@ def process_images(soup, driver, context, image_sizes, base_url, container=None)
                 and width >= configs["IMAGE_CONFIG"]["min_width"]
                 and height >= configs["IMAGE_CONFIG"]["min_height"]
             ):
+                image = {
+                    "alt_text": img.get("alt") or "",  # alt가 없으면 빈 문자열
+                    "img_url": src,
+                    "original_url": original_src,
+                    "is_button": check_button(doc, img, image_info=image_info),
+                    # 페이지 컨텍스트는 ContextStore에 한 번만 저장하고 ID로 참조
+                    "context_id": context_id,
+                    "local_context": (
+                        extract_local_context(img, root, local_context_config["max_tokens"])
+                        if local_context_config["enabled"] else ""
+                    ),
+                }
                 if width <= 32 and height <= 32:
-                    small_image_data.append(
-                        {
-                            "alt_text": img.get("alt") or "",  # alt가 없으면 빈 문자열
-                            "img_url": src,
-                            "original_url": original_src,
-                            "is_button": check_button(soup, img),
-                            "context": context
-                        }
-                    )
+                    small_image_data.append(image)
                 else:
-                    image_data.append(
-                        {
-                            "alt_text": img.get("alt") or "",  # alt가 없으면 빈 문자열
-                            "img_url": src,
-                            "original_url": original_src,
-                            "is_button": check_button(soup, img),
-                            "context": context
-                        }
-                    )
+                    seen_original_urls.add(original_src)
+                    yield image
             else:
                 logger.info(f"이미지 크기가 너무 작음: {src}, 크기={size_info}")
         except Exception as e:
             logger.error(f"이미지 처리 중 오류 발생: {e}, 이미지={src}")
             continue
     
-    image_data.extend(small_image_data)  # 작은 이미지 데이터가 뒤에 위치하도록 결합
+    # 작은 이미지 데이터가 뒤에 위치하도록 마지막에 반환
+    yield from small_image_data
+
+def extract_local_context(img, root=None, max_tokens=None):
+    """
+    이미지 하나의 주변 컨텍스트를 DOM에서 추출 (중요한 순서대로, max_tokens 이내)
 
-    return image_data
+    - caption: 가장 가까운 <figure>의 <figcaption>
+    - aria: aria-label, aria-describedby가 가리키는 요소, title 속성
+    - link: 이미지를 감싼 링크의 텍스트/aria-label/title
+    - heading: 이미지 앞에 있는 가장 가까운 제목
+    - paragraph: 이미지를 감싸거나 바로 옆에 있는 문단
+    """
+    config = load_config()["LOCAL_CONTEXT_CONFIG"]
+    max_tokens = max_tokens or config["max_tokens"]
+    field_max_chars = config["field_max_chars"]
+    fields = []
+
+    def add(label, text):
+        text = clean_html(text or "")[:field_max_chars]
+        if text and all(text != existing for _, existing in fields):
+            fields.append((label, text))
+
+    figure = find_ancestor(img, "figure")
+    if figure is not None:
+        caption = figure.find(".//figcaption")
+        if caption is not None:
+            add("caption", text_of(caption))
+
+    add("aria", img.get("aria-label"))
+    described_by = img.get("aria-describedby")
+    if described_by and root is not None:
+        for element_id in described_by.split():
+            described = root.get_element_by_id(element_id, None)
+            if described is not None:
+                add("aria", text_of(described))
+    add("title", img.get("title"))
+
+    link = find_ancestor(img, "a")
+    if link is not None:
+        add("link", clean_html(text_of(link)) or link.get("aria-label") or link.get("title"))
+
+    heading = find_previous_heading(img)
+    if heading is not None:
+        add("heading", text_of(heading))
+
+    paragraph = find_ancestor(img, "p")
+    if paragraph is None:
+        # 이미지 근처의 형제 문단만 사용 (페이지 전체를 감싼 블록의 첫 문단은 가져오지 않음)
+        paragraph = find_nearby(
+            img, "p", config["paragraph_max_levels"], config["paragraph_max_siblings"]
+        )
+    if paragraph is not None:
+        add("paragraph", text_of(paragraph))
+
+    # 토큰 예산 안에서 중요한 항목부터 포함
+    max_chars = max_tokens * 4
+    parts = []
+    used = 0
+    for label, text in fields:
+        part = f"{label}: {text}"
+        if used + len(part) > max_chars:
+            remaining = max_chars - used - len(label) - 2
+            if remaining > 20:
+                parts.append(f"{label}: {text[:remaining]}")
+            break
+        parts.append(part)
+        used += len(part) + 2
+    return "; ".join(parts)
+
+
+def extract_content(doc):
+    """
+    콘텐츠 추출 함수
 
-def extract_content(soup):
-    """콘텐츠 추출 함수"""
-    doc = Document(str(soup))
-    title = clean_html(doc.title())
-    content = clean_html(doc.summary())
+    parse_html 트리를 다시 직렬화/파싱하지 않고 readability에 그대로 전달
+    (readability는 정리 단계에서 트리를 복사하므로 원본 doc은 바뀌지 않음)
+    """
+    readable = Document(doc)
+    title = clean_html(readable.title())
+    content = clean_html(readable.summary())
     return f"title: {title}, context: {content}"
 
 
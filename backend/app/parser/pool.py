@@ -0,0 +1,207 @@
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from selenium.common.exceptions import WebDriverException, TimeoutException
+
+from parser.utils import load_config, setup_webdriver
+
+logger = logging.getLogger(__name__)
+
+
+class WebDriverPoolExhausted(WebDriverException):
+    """lease_timeout 안에 사용 가능한 브라우저를 얻지 못했을 때 발생"""
+
+
+class _PooledDriver:
+    """풀에 보관되는 WebDriver와 사용 통계"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.created_at = time.monotonic()
+
+
+class WebDriverPool:
+    """
+    미리 띄워둔 headless Chrome을 재사용하는 크기 제한 풀
+
+    - pool_size 만큼만 브라우저를 유지하며, 모두 사용 중이면 lease_timeout 동안 대기 후 예외 발생
+    - 대여할 때마다 헬스 체크 후 쿠키/스토리지를 지우고 새 탭에서 시작
+    - max_pages_per_driver 만큼 사용한 브라우저는 폐기하고 새로 생성
+    """
+
+    def __init__(self, pool_size=None, lease_timeout=None, max_pages_per_driver=None, driver_factory=None):
+        pool_config = load_config()["WEBDRIVER_POOL_CONFIG"]
+        self.pool_size = pool_size or pool_config["pool_size"]
+        self.lease_timeout = lease_timeout if lease_timeout is not None else pool_config["lease_timeout"]
+        self.max_pages_per_driver = max_pages_per_driver or pool_config["max_pages_per_driver"]
+        self.health_check_timeout = pool_config["health_check_timeout"]
+        self._driver_factory = driver_factory or setup_webdriver
+
+        # 최근에 반납된 브라우저부터 재사용하도록 LIFO 사용
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.pool_size)
+        self._lock = threading.Lock()
+        self._closed = False
+        self.stats = {
+            "created": 0,
+            "recycled": 0,
+            "discarded": 0,
+            "leases": 0,
+            "in_use": 0,
+            "lease_timeouts": 0,
+        }
+
+    def prewarm(self, count=None):
+        """브라우저를 미리 생성해 idle 큐에 넣어둠"""
+        count = min(count or self.pool_size, self.pool_size)
+        while self._idle.qsize() + self.stats["in_use"] < count and not self._closed:
+            try:
+                self._idle.put(self._spawn())
+            except Exception as e:
+                logger.error(f"브라우저 사전 생성 실패: {e}")
+                break
+        logger.info(f"웹드라이버 풀 준비 완료: idle={self._idle.qsize()}/{self.pool_size}")
+
+    @contextmanager
+    def lease(self, timeout=None):
+        """브라우저를 대여하고, with 블록이 끝나면 풀에 반납"""
+        entry = self._acquire(timeout)
+        broken = False
+        try:
+            yield entry.driver
+        except TimeoutException:
+            # 느린 페이지 때문에 발생한 타임아웃은 브라우저 문제로 보지 않음 (다음 대여 시 헬스 체크)
+            raise
+        except WebDriverException:
+            broken = True
+            raise
+        finally:
+            self._release(entry, broken)
+
+    def close(self):
+        """풀에 남아있는 모든 브라우저 종료"""
+        self._closed = True
+        while True:
+            try:
+                entry = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._quit(entry)
+
+    def _acquire(self, timeout):
+        if self._closed:
+            raise WebDriverPoolExhausted("웹드라이버 풀이 종료되었습니다.")
+
+        timeout = self.lease_timeout if timeout is None else timeout
+        if not self._slots.acquire(timeout=timeout):
+            with self._lock:
+                self.stats["lease_timeouts"] += 1
+            raise WebDriverPoolExhausted(f"{timeout}초 안에 사용 가능한 브라우저가 없습니다.")
+
+        entry = None
+        try:
+            entry = self._take_healthy()
+            self._reset(entry)
+        except Exception:
+            if entry is not None:
+                self._quit(entry)
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self.stats["leases"] += 1
+            self.stats["in_use"] += 1
+        return entry
+
+    def _release(self, entry, broken=False):
+        entry.pages += 1
+        try:
+            if broken or self._closed:
+                self._quit(entry)
+            elif entry.pages >= self.max_pages_per_driver:
+                logger.info(f"브라우저 재생성: {entry.pages}페이지 사용")
+                with self._lock:
+                    self.stats["recycled"] += 1
+                self._quit(entry)
+            else:
+                self._idle.put(entry)
+        finally:
+            with self._lock:
+                self.stats["in_use"] -= 1
+            self._slots.release()
+
+    def _take_healthy(self):
+        """idle 큐에서 정상 동작하는 브라우저를 꺼내고, 없으면 새로 생성"""
+        while True:
+            try:
+                entry = self._idle.get_nowait()
+            except queue.Empty:
+                return self._spawn()
+
+            if self._is_healthy(entry):
+                return entry
+            logger.warning("헬스 체크 실패한 브라우저 폐기")
+            self._quit(entry)
+
+    def _spawn(self):
+        entry = _PooledDriver(self._driver_factory())
+        with self._lock:
+            self.stats["created"] += 1
+        return entry
+
+    def _is_healthy(self, entry):
+        try:
+            entry.driver.set_script_timeout(self.health_check_timeout)
+            return entry.driver.execute_script("return 1;") == 1 and len(entry.driver.window_handles) > 0
+        except Exception:
+            return False
+
+    def _reset(self, entry):
+        """이전 페이지의 쿠키/스토리지를 지우고 새 탭만 남김"""
+        driver = entry.driver
+        try:
+            driver.execute_script("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+        except WebDriverException:
+            pass
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+
+        old_handles = list(driver.window_handles)
+        driver.switch_to.new_window("tab")
+        new_handle = driver.current_window_handle
+        for handle in old_handles:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(new_handle)
+
+    def _quit(self, entry):
+        with self._lock:
+            self.stats["discarded"] += 1
+        try:
+            entry.driver.quit()
+        except Exception as e:
+            logger.warning(f"브라우저 종료 중 오류: {e}")
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_webdriver_pool():
+    """프로세스 전역 WebDriverPool 반환 (최초 호출 시 생성)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = WebDriverPool()
+        return _pool
+
+
+def shutdown_webdriver_pool():
+    """프로세스 전역 WebDriverPool 종료"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
@@ -0,0 +1,162 @@
+"""
+트리를 만들지 않는 <img> 속성 수정 (alt 일괄 수정, src 절대 경로 변환)
+
+HTML을 한 번 앞에서부터 훑으며 <img> 태그만 찾아 alt 속성을 바꾸고 나머지 문자열은 그대로 이어붙임
+(주석, <script>, <style> 안의 <img>는 건드리지 않음)
+
+edits의 키는 파싱 결과의 img_url(절대 경로) 또는 original_url(원래 src) 어느 쪽이든 되도록
+원래 값 → base_url 기준 절대 경로 → normalize(절대 경로) 순으로 맞춰봄
+"""
+
+import html
+import re
+from urllib.parse import urljoin
+
+from parser.static import LAZY_SRC_ATTRS
+
+# 주석과 script/style 블록은 통째로 건너뛰고, <img ...>는 따옴표 안의 '>'까지 고려해 매칭
+TOKEN_PATTERN = re.compile(
+    r"<!--.*?-->"
+    r"|<(script|style)\b.*?</\1\s*>"
+    r"|<img\b(?:[^>\"']|\"[^\"]*\"|'[^']*')*>",
+    re.IGNORECASE | re.DOTALL,
+)
+ATTR_PATTERN = re.compile(r"""([^\s"'>/=]+)(?:\s*=\s*("[^"]*"|'[^']*'|[^\s"'>]+))?""")
+
+SRC_ATTRS = ("src",) + LAZY_SRC_ATTRS
+
+
+def _parse_attrs(tag):
+    """태그 문자열 → {속성 이름(소문자): (값, 값의 시작, 값의 끝)} (값이 없는 속성은 끝 위치를 이름 끝으로)"""
+    attrs = {}
+    for match in ATTR_PATTERN.finditer(tag, 4):
+        name = match.group(1).lower()
+        if name in attrs:
+            continue
+        if match.group(2) is None:
+            attrs[name] = ("", match.end(1), match.end(1))
+            continue
+        value = match.group(2)
+        start, end = match.span(2)
+        if value[:1] in ("'", '"'):
+            value = value[1:-1]
+        attrs[name] = (html.unescape(value), start, end)
+    return attrs
+
+
+def _set_attr(tag, attrs, name, value):
+    """태그 문자열에서 속성 하나만 바꾸거나 추가 (나머지 문자는 그대로 유지)"""
+    quoted = '"' + html.escape(value, quote=True) + '"'
+    if name in attrs:
+        _, start, end = attrs[name]
+        if start == end:
+            # 값 없는 속성 (예: <img alt>)
+            return f"{tag[:end]}={quoted}{tag[end:]}"
+        return f"{tag[:start]}{quoted}{tag[end:]}"
+    if tag.endswith("/>"):
+        return f"{tag[:-2].rstrip()} {name}={quoted} />"
+    return f"{tag[:-1].rstrip()} {name}={quoted}>"
+
+
+def iter_img_tags(html_code, rewrite_tag):
+    """<img> 태그마다 rewrite_tag(태그 문자열)를 적용한 HTML을 조각 단위로 반환 (트리나 문서 복사본을 만들지 않음)"""
+    position = 0
+    for match in TOKEN_PATTERN.finditer(html_code):
+        tag = match.group(0)
+        if tag[:4].lower() != "<img":
+            continue
+        yield html_code[position:match.start()]
+        yield rewrite_tag(tag)
+        position = match.end()
+    yield html_code[position:]
+
+
+def make_srcs_absolute(html_code, base_url):
+    """모든 <img>의 src를 base_url 기준 절대 경로로 변환 (src 외의 문자는 원본 그대로)"""
+
+    def rewrite_tag(tag):
+        attrs = _parse_attrs(tag)
+        src = attrs.get("src", ("",))[0]
+        if not src:
+            return tag
+        absolute = urljoin(base_url, src)
+        return tag if absolute == src else _set_attr(tag, attrs, "src", absolute)
+
+    return "".join(iter_img_tags(html_code, rewrite_tag))
+
+
+class AltTextRewriter:
+    """
+    edits({이미지 URL: 새 alt})를 HTML 문자열에 한 번에 적용
+
+    normalize는 URL 정규화 함수(예: llm.dedup.normalize_image_url)로, 주면 크기 접미사/쿼리 차이까지 무시하고 매칭
+    한 키에 여러 <img>가 맞으면 모두 수정 (같은 이미지가 페이지에 여러 번 나오는 경우)
+    """
+
+    def __init__(self, edits, base_url=None, normalize=None):
+        self.edits = dict(edits)
+        self.base_url = base_url
+        self.normalize = normalize
+        self.matches = {key: 0 for key in self.edits}
+        # 우선순위: 원래 값 > 절대 경로 > 정규화
+        self._indexes = ({}, {}, {})
+        for key in self.edits:
+            for index, variant in zip(self._indexes, self._variants(key)):
+                if variant:
+                    index.setdefault(variant, key)
+
+    def _variants(self, url):
+        url = html.unescape(url.strip())
+        absolute = urljoin(self.base_url, url) if self.base_url else url
+        normalized = None
+        if self.normalize is not None and not absolute.startswith("data:"):
+            try:
+                normalized = self.normalize(absolute)
+            except ValueError:
+                normalized = None
+        return url, absolute, normalized
+
+    def find_edit(self, url):
+        """이미지 URL에 해당하는 edits의 키 (없으면 None)"""
+        for index, variant in zip(self._indexes, self._variants(url)):
+            if variant and variant in index:
+                return index[variant]
+        return None
+
+    def rewrite_tag(self, tag):
+        """<img ...> 태그 하나의 alt 수정 (맞는 edit이 없으면 그대로 반환)"""
+        attrs = _parse_attrs(tag)
+        key = None
+        for name in SRC_ATTRS:
+            if name in attrs and attrs[name][0]:
+                key = self.find_edit(attrs[name][0])
+                if key is not None:
+                    break
+        if key is None:
+            return tag
+
+        self.matches[key] += 1
+        return _set_attr(tag, attrs, "alt", self.edits[key])
+
+    def iter_rewrite(self, html_code):
+        """수정된 HTML을 조각 단위로 반환 (전체 트리나 문서 복사본을 만들지 않음)"""
+        return iter_img_tags(html_code, self.rewrite_tag)
+
+    def rewrite(self, html_code):
+        return "".join(self.iter_rewrite(html_code))
+
+    def unmatched(self):
+        """어떤 <img>에도 적용되지 않은 edits의 키"""
+        return [key for key, count in self.matches.items() if count == 0]
+
+
+def rewrite_alt_texts(html_code, edits, base_url=None, normalize=None):
+    """
+    edits를 한 번의 스캔으로 적용
+
+    Returns:
+        tuple: (수정된 HTML, 수정된 <img> 수, 적용되지 않은 키 리스트)
+    """
+    rewriter = AltTextRewriter(edits, base_url, normalize)
+    updated_html = rewriter.rewrite(html_code)
+    return updated_html, sum(rewriter.matches.values()), rewriter.unmatched()
@@ -0,0 +1,273 @@
+import codecs
+import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+
+import requests
+from PIL import ImageFile
+from requests.compat import chardet
+
+from parser.dom import find_ancestor, select_one, text_of
+from parser.utils import load_config
+
+logger = logging.getLogger(__name__)
+
+# 지연 로딩 이미지의 실제 주소가 들어가는 속성
+LAZY_SRC_ATTRS = ("data-src", "data-lazy-src", "data-original", "data-url")
+LAZY_SRCSET_ATTRS = ("srcset", "data-srcset", "data-lazy-srcset")
+
+# 클라이언트 렌더링(SPA) 페이지의 흔한 루트 요소
+SPA_ROOT_SELECTORS = ("#root", "#app", "#__next", "#__nuxt", "[data-reactroot]", "[ng-app]", "[ng-version]")
+
+CSS_LENGTH_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*(px)?\s*$")
+STYLE_SIZE_PATTERN = re.compile(r"(?<![-\w])(width|height)\s*:\s*(\d+(?:\.\d+)?)px", re.I)
+HIDDEN_STYLE_PATTERN = re.compile(r"display\s*:\s*none|visibility\s*:\s*hidden", re.I)
+HEADER_CHARSET_PATTERN = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.I)
+# <meta charset="utf-8"> 또는 <meta http-equiv="Content-Type" content="text/html; charset=euc-kr">
+META_CHARSET_PATTERN = re.compile(rb"<meta[^>]+charset\s*=\s*[\"']?\s*([\w.:-]+)", re.I)
+
+_sessions = threading.local()
+
+
+class StaticFetchError(Exception):
+    """정적 HTML을 가져올 수 없을 때 발생 (auto 모드에서는 브라우저로 전환)"""
+
+
+def _session():
+    """스레드별 requests.Session (같은 호스트로의 연결 재사용)"""
+    session = getattr(_sessions, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.headers["User-Agent"] = load_config()["STATIC_PARSE_CONFIG"]["user_agent"]
+        _sessions.session = session
+    return session
+
+
+def _valid_encoding(name):
+    try:
+        return codecs.lookup(name).name
+    except (LookupError, TypeError):
+        return None
+
+
+def decode_html(data, content_type=""):
+    """
+    HTML 바이트를 문자열로 변환
+
+    Content-Type 헤더의 charset → <meta charset> → 내용 추정(chardet) → UTF-8 순으로 인코딩 결정
+    (charset 없는 text/html 응답에 requests가 붙이는 ISO-8859-1 기본값은 쓰지 않음 -
+    meta에만 UTF-8을 선언한 페이지가 깨지므로)
+    """
+    header = HEADER_CHARSET_PATTERN.search(content_type or "")
+    encoding = _valid_encoding(header.group(1)) if header else None
+    if encoding is None:
+        meta = META_CHARSET_PATTERN.search(data[:8192])
+        encoding = _valid_encoding(meta.group(1).decode("ascii", errors="ignore")) if meta else None
+    if encoding is None:
+        encoding = _valid_encoding((chardet.detect(data[:65536]) or {}).get("encoding")) or "utf-8"
+    return data.decode(encoding, errors="replace")
+
+
+def fetch_static_html(url):
+    """
+    HTTP로 HTML을 가져와 (html, 최종 URL) 반환 (리다이렉트 반영)
+    HTML이 아니거나 max_html_bytes를 넘으면 StaticFetchError
+    """
+    static_config = load_config()["STATIC_PARSE_CONFIG"]
+    try:
+        response = _session().get(url, timeout=static_config["timeout"], stream=True)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        raise StaticFetchError(f"HTML 요청 실패: {e}") from e
+
+    with response:
+        content_type = response.headers.get("Content-Type", "")
+        if "html" not in content_type.lower():
+            raise StaticFetchError(f"HTML 문서가 아닙니다: {content_type}")
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(64 * 1024):
+            size += len(chunk)
+            if size > static_config["max_html_bytes"]:
+                raise StaticFetchError(f"HTML이 너무 큽니다 (>{static_config['max_html_bytes']} bytes)")
+            chunks.append(chunk)
+    return decode_html(b"".join(chunks), content_type), response.url
+
+
+def pick_srcset_candidate(srcset):
+    """srcset에서 가장 큰 후보의 URL (w/x 설명자 기준, 없으면 첫 후보)"""
+    best_url, best_score = None, -1.0
+    for candidate in (srcset or "").split(","):
+        parts = candidate.strip().split()
+        if not parts:
+            continue
+        score = 1.0
+        if len(parts) > 1 and parts[1][:-1].replace(".", "", 1).isdigit():
+            score = float(parts[1][:-1])
+        if score > best_score:
+            best_url, best_score = parts[0], score
+    return best_url
+
+
+def resolve_static_src(img):
+    """
+    정적 HTML에서 이미지의 실제 주소
+    src가 없거나 data: 플레이스홀더이면 data-src 계열 → srcset 계열 → <picture><source> 순으로 찾음
+    """
+    src = (img.get("src") or "").strip()
+    if src and not src.startswith("data:"):
+        return src
+    for attr in LAZY_SRC_ATTRS:
+        if img.get(attr):
+            return img.get(attr).strip()
+    for attr in LAZY_SRCSET_ATTRS:
+        candidate = pick_srcset_candidate(img.get(attr))
+        if candidate:
+            return candidate
+    picture = find_ancestor(img, "picture")
+    if picture is not None:
+        for source in picture.iter("source"):
+            candidate = pick_srcset_candidate(source.get("srcset") or source.get("data-srcset"))
+            if candidate:
+                return candidate
+    return src or None
+
+
+def attribute_size(img):
+    """width/height 속성 또는 인라인 style의 px 값으로 크기 추정 (모르면 None)"""
+    sizes = {}
+    for name in ("width", "height"):
+        match = CSS_LENGTH_PATTERN.match(img.get(name) or "")
+        if match:
+            sizes[name] = float(match.group(1))
+    for name, value in STYLE_SIZE_PATTERN.findall(img.get("style") or ""):
+        sizes.setdefault(name.lower(), float(value))
+    return sizes.get("width"), sizes.get("height")
+
+
+def probe_image_size(url):
+    """이미지 앞부분만 받아 헤더에서 크기 읽기 (SVG 등 읽을 수 없으면 None)"""
+    static_config = load_config()["STATIC_PARSE_CONFIG"]
+    probe_bytes = static_config["size_probe_bytes"]
+    try:
+        with _session().get(
+            url,
+            headers={"Range": f"bytes=0-{probe_bytes - 1}"},
+            timeout=static_config["timeout"],
+            stream=True,
+        ) as response:
+            response.raise_for_status()
+            parser = ImageFile.Parser()
+            received = 0
+            for chunk in response.iter_content(8 * 1024):
+                parser.feed(chunk)
+                if parser.image is not None:
+                    return parser.image.size
+                received += len(chunk)
+                if received >= probe_bytes:
+                    break
+    except Exception as e:
+        logger.debug(f"이미지 크기 확인 실패: {url} ({e})")
+    return None
+
+
+def is_hidden(img, max_depth=5):
+    """hidden 속성이나 display:none/visibility:hidden 스타일이 있는 요소 안의 이미지인지"""
+    current = img
+    depth = 0
+    while current is not None and depth <= max_depth:
+        if current.get("hidden") is not None or HIDDEN_STYLE_PATTERN.search(current.get("style") or ""):
+            return True
+        if current.tag in ("noscript", "template"):
+            return True
+        current = current.getparent()
+        depth += 1
+    return False
+
+
+def collect_static_image_info(doc, base_url, index_attr, check_button, cancel_event=None):
+    """
+    collect_image_info와 같은 형식의 이미지 정보를 브라우저 없이 생성
+
+    - 지연 로딩 이미지는 실제 주소를 src에 채워 넣음 (이후 iter_images가 그대로 사용)
+    - 크기는 width/height 속성 → 인라인 style → 이미지 헤더(최대 max_size_probes개) 순으로 추정
+    - 렌더링 여부는 hidden 속성/스타일로 판단
+    """
+    static_config = load_config()["STATIC_PARSE_CONFIG"]
+    image_info = []
+    to_probe = []
+
+    for index, img in enumerate(doc.iter("img")):
+        img.set(index_attr, str(index))
+        src = resolve_static_src(img)
+        if src and src != img.get("src"):
+            img.set("src", src)
+        resolved_src = urljoin(base_url, src) if src else ""
+        width, height = attribute_size(img)
+        info = {
+            "index": index,
+            "src": src or "",
+            "resolved_src": resolved_src,
+            "current_src": resolved_src,
+            "width": width,
+            "height": height,
+            "natural_width": None,
+            "natural_height": None,
+            "rendered_width": width,
+            "rendered_height": height,
+            "rendered": bool(src) and not is_hidden(img),
+            "is_button": check_button(doc, img),
+        }
+        image_info.append(info)
+        if info["rendered"] and (width is None or height is None) and resolved_src.startswith(("http://", "https://")):
+            to_probe.append(info)
+
+    to_probe = to_probe[:static_config["max_size_probes"]]
+    if to_probe and not (cancel_event is not None and cancel_event.is_set()):
+        with ThreadPoolExecutor(max_workers=static_config["probe_workers"]) as executor:
+            sizes = list(executor.map(probe_image_size, [info["resolved_src"] for info in to_probe]))
+        for info, size in zip(to_probe, sizes):
+            if size is None:
+                continue
+            natural_width, natural_height = size
+            info["natural_width"], info["natural_height"] = natural_width, natural_height
+            # 한 변만 속성으로 주어진 경우 원본 비율로 나머지 변 계산
+            if info["width"] is not None and natural_width:
+                info["height"] = info["width"] * natural_height / natural_width
+            elif info["height"] is not None and natural_height:
+                info["width"] = info["height"] * natural_width / natural_height
+            else:
+                info["width"], info["height"] = natural_width, natural_height
+
+    return image_info
+
+
+def browser_required_reason(doc, image_info):
+    """
+    정적 파싱 결과를 믿기 어려워 브라우저로 다시 파싱해야 하는 이유 (괜찮으면 None)
+
+    - 보이는 이미지가 min_images개 미만
+    - 본문 텍스트가 거의 없고 SPA 루트 요소나 "JavaScript를 켜라"는 noscript가 있음
+    - 크기를 알 수 없는 이미지 비율이 unknown_size_ratio 이상
+    """
+    static_config = load_config()["STATIC_PARSE_CONFIG"]
+    visible = [info for info in image_info if info["rendered"]]
+    if len(visible) < static_config["min_images"]:
+        return f"보이는 이미지가 {len(visible)}개뿐임"
+
+    body = doc.find("body")
+    text_length = len(" ".join(text_of(body if body is not None else doc).split()))
+    if text_length < static_config["min_text_chars"]:
+        if any(select_one(doc, selector) is not None for selector in SPA_ROOT_SELECTORS):
+            return "SPA 루트 요소가 있고 본문 텍스트가 거의 없음"
+        for noscript in doc.iter("noscript"):
+            # text_of는 noscript 안의 텍스트를 제외하므로 itertext로 직접 읽음
+            if "javascript" in " ".join(noscript.itertext()).lower():
+                return "JavaScript가 필요한 페이지"
+
+    unknown = sum(1 for info in visible if info["width"] is None or info["height"] is None)
+    if unknown / len(visible) >= static_config["unknown_size_ratio"]:
+        return f"크기를 알 수 없는 이미지가 {unknown}/{len(visible)}개"
+    return None
@@ -1,6 +1,7 @@
 import logging
 import os
 import importlib
+import threading
 import fake_useragent
 from datetime import datetime
 from selenium import webdriver
@@ -14,8 +15,13 @@ def load_config():
     importlib.reload(config)
     return {
         "WEBDRIVER_CONFIG": config.WEBDRIVER_CONFIG,
+        "WEBDRIVER_POOL_CONFIG": config.WEBDRIVER_POOL_CONFIG,
+        "PARSE_EXECUTOR_CONFIG": config.PARSE_EXECUTOR_CONFIG,
         "CHROME_OPTIONS": config.CHROME_OPTIONS,
         "IMAGE_CONFIG": config.IMAGE_CONFIG,
+        "PAGE_CONTEXT_CONFIG": config.PAGE_CONTEXT_CONFIG,
+        "LOCAL_CONTEXT_CONFIG": config.LOCAL_CONTEXT_CONFIG,
+        "STATIC_PARSE_CONFIG": config.STATIC_PARSE_CONFIG,
         "LOGGING_CONFIG": config.LOGGING_CONFIG,
     }
 
@@ -58,6 +64,17 @@ def setup_logging(enable_logging=True):
         ],
     )
 
+_chromedriver_path = None
+_chromedriver_lock = threading.Lock()
+
+def get_chromedriver_path():
+    """ChromeDriverManager().install()은 프로세스당 한 번만 실행하고 경로를 재사용"""
+    global _chromedriver_path
+    with _chromedriver_lock:
+        if _chromedriver_path is None:
+            _chromedriver_path = ChromeDriverManager().install()
+        return _chromedriver_path
+
 def setup_webdriver():
     """웹드라이버를 설정하고 반환하는 함수"""
     configs = load_config()
@@ -78,6 +95,6 @@ def setup_webdriver():
         options.add_argument(option)
     
     return webdriver.Chrome(
-        service=Service(ChromeDriverManager().install()),
+        service=Service(get_chromedriver_path()),
         options=options,
     )
\ No newline at end of file
@@ -7,6 +7,9 @@ class AltTextRequest(BaseModel):
     alt_text: str
     is_button: Optional[bool] = False
     context: Optional[str] = ""
+    context_id: Optional[str] = None  # /api/parse_url 응답의 contexts 키 (있으면 context 대신 사용, 만료 시 context가 없으면 410)
+    local_context: Optional[str] = ""  # 이미지 주변 컨텍스트 (캡션, 주변 문단 등)
+    bypass_cache: Optional[bool] = False  # True면 캐시를 무시하고 새로 생성
 
 class AltTextListRequest(BaseModel):
     images: List[AltTextRequest]
@@ -20,4 +23,5 @@ class AltTextResponse(BaseModel):
     ai_modified_alt_text: str
     
 class AltTextListResponse(BaseModel):
-    results: List[AltTextResponse]
\ No newline at end of file
+    results: List[AltTextResponse]
+    dedup_stats: Optional[dict] = None  # 중복 제거 통계 (images, unique_urls, unique_images, llm_calls_saved)
\ No newline at end of file
@@ -1,20 +1,33 @@
 from pydantic import BaseModel, HttpUrl
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional
 
 # 요청 모델 정의
 class ParserRequest(BaseModel):
     url: HttpUrl
     container: Optional[str] = None
     enable_logging: Optional[bool] = True
+    bypass_cache: Optional[bool] = False  # alt-text 생성 시 캐시 무시 여부
+    mode: Optional[Literal["browser", "static", "auto"]] = None  # 파싱 방식 (None이면 설정 기본값)
 
 # 응답 모델 정의
 class ParserResponse(BaseModel):
     images: list
+    contexts: Optional[dict] = None  # context_id → 페이지 컨텍스트 (이미지에는 context_id만 포함)
     
 class UpdateAltTextRequest(BaseModel):
     html_code: str              # The HTML to be modified
     image_url: str              # The <img> source or another unique key
     customized_alt_text: str    # The user's new alt text
+
+class BulkUpdateAltTextRequest(BaseModel):
+    html_code: str                  # The HTML to be modified
+    edits: Dict[str, str]           # image URL (img_url or original_url) → new alt text
+    base_url: Optional[str] = None  # page URL, used to match relative src values against absolute keys
+
+class BulkUpdateAltTextResponse(BaseModel):
+    updated_html: str
+    updated_images: int             # number of <img> tags whose alt was rewritten
+    unmatched: List[str]            # edit keys that matched no <img>
     
 class DownloadHTMLRequest(BaseModel):
     url: str
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
 
 class CultureAwareTranslationRequest(BaseModel):
     english_alt_text: str
@@ -12,4 +12,13 @@ class CultureAwareTranslationResponse(BaseModel):
     translated_text: str
     target_language: str
     guidelines: Optional[list] = None  # 생성된 문화적 가이드라인
-    evaluation: Optional[dict] = None  # 평가 결과 
\ No newline at end of file
+    evaluation: Optional[dict] = None  # 평가 결과
+
+class BatchTranslationItem(BaseModel):
+    english_alt_text: str
+    image_url: str
+    image_type: Optional[str] = "informative"
+
+class BatchTranslationRequest(BaseModel):
+    items: List[BatchTranslationItem]
+    target_languages: List[str]  # 'ko', 'es', 'zh' 중 여러 개 
\ No newline at end of file
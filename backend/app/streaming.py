@@ -0,0 +1,82 @@
+"""
+스트리밍 응답 유틸리티
+- 동기 제너레이터(Selenium 파서 등)를 스레드에서 돌리며 비동기로 소비
+- NDJSON / SSE 형식 직렬화
+"""
+
+import asyncio
+import json
+import logging
+import threading
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SSE_MEDIA_TYPE = "text/event-stream"
+
+STREAM_MEDIA_TYPES = {
+    "ndjson": NDJSON_MEDIA_TYPE,
+    "sse": SSE_MEDIA_TYPE,
+}
+
+
+def format_stream_event(event: dict, stream_format: str = "ndjson") -> str:
+    """이벤트 dict를 NDJSON 한 줄 또는 SSE 메시지로 직렬화"""
+    data = json.dumps(event, ensure_ascii=False, default=str)
+    if stream_format == "sse":
+        return f"event: {event.get('event', 'message')}\ndata: {data}\n\n"
+    return data + "\n"
+
+
+async def iterate_in_thread(make_iterator, cancel_event: threading.Event = None, executor=None):
+    """
+    동기 이터레이터를 별도 스레드에서 실행하고, 항목이 나오는 즉시 비동기로 전달
+
+    소비 측이 중간에 멈추면(클라이언트 연결 종료 등) cancel_event를 설정해
+    스레드 쪽 이터레이터가 다음 항목에서 멈추도록 함
+    """
+    if cancel_event is None:
+        cancel_event = threading.Event()
+
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    end = object()
+
+    def put(item):
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        except RuntimeError:
+            # 이벤트 루프가 이미 종료된 경우
+            cancel_event.set()
+
+    def worker():
+        iterator = make_iterator()
+        try:
+            for item in iterator:
+                if cancel_event.is_set():
+                    break
+                put(("item", item))
+        except BaseException as e:
+            put(("error", e))
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                try:
+                    close()
+                except Exception as e:
+                    logging.warning(f"이터레이터 종료 중 오류: {e}")
+            put(("end", end))
+
+    future = loop.run_in_executor(executor, worker)
+    try:
+        while True:
+            kind, value = await queue.get()
+            if kind == "item":
+                yield value
+            elif kind == "error":
+                raise value
+            else:
+                break
+    finally:
+        cancel_event.set()
+        if not future.done():
+            # 스레드는 강제로 멈출 수 없으므로 결과만 버림
+            future.add_done_callback(lambda f: f.exception())
@@ -0,0 +1,63 @@
+"""HTML 왕복(round-trip) 검사: src/alt 수정 외에는 원본 문자열이 바뀌지 않아야 함"""
+
+from parser.dom import parse_html, serialize_html, source_doctype, text_of
+from parser.parser import make_img_src_absolute
+from parser.rewrite import rewrite_alt_texts
+from parser.static import browser_required_reason
+
+FULL_PAGE = '<!DOCTYPE html>\n<html><head></head><body><img src="a.png"></body></html>'
+NO_DOCTYPE = '<html><head></head><body><img src="a.png"></body></html>'
+FRAGMENT = '<div class="card"><img src="/a.png" alt="old"><p>caption</p></div>'
+
+
+def test_serialize_keeps_missing_doctype_missing():
+    doc = parse_html(NO_DOCTYPE)
+    assert "DOCTYPE" not in serialize_html(doc, source_doctype(NO_DOCTYPE))
+
+
+def test_serialize_keeps_source_doctype():
+    doc = parse_html(FULL_PAGE)
+    assert serialize_html(doc, source_doctype(FULL_PAGE)).startswith("<!DOCTYPE html>\n<html>")
+
+
+def test_make_img_src_absolute_only_touches_src():
+    for html_code in (FULL_PAGE, NO_DOCTYPE, FRAGMENT):
+        expected = html_code.replace('src="a.png"', 'src="https://example.com/a.png"').replace(
+            'src="/a.png"', 'src="https://example.com/a.png"'
+        )
+        assert make_img_src_absolute(html_code, "https://example.com/") == expected
+
+
+def test_alt_rewrite_keeps_fragment_and_doctype():
+    updated, count, unmatched = rewrite_alt_texts(FRAGMENT, {"/a.png": "new"})
+    assert (updated, count, unmatched) == (FRAGMENT.replace('alt="old"', 'alt="new"'), 1, [])
+
+    updated, count, _ = rewrite_alt_texts(FULL_PAGE, {"a.png": "A"})
+    assert updated == FULL_PAGE.replace('<img src="a.png">', '<img src="a.png" alt="A">')
+
+
+def test_rewrite_without_matches_is_identity():
+    html_code = FULL_PAGE + "<!-- <img src=a.png> --><script>'<img src=a.png>'</script>"
+    updated, count, unmatched = rewrite_alt_texts(html_code, {"missing.png": "x"})
+    assert updated == html_code
+    assert count == 0 and unmatched == ["missing.png"]
+
+
+def test_text_of_skips_script_and_style():
+    doc = parse_html(
+        '<html><body><div id="__next"></div><p>Hello <b>world</b></p>'
+        '<script id="__NEXT_DATA__" type="application/json">{"props": {}}</script>'
+        "<style>p { color: red }</style></body></html>"
+    )
+    assert " ".join(text_of(doc.find("body")).split()) == "Hello world"
+
+
+def test_spa_shell_with_large_data_script_needs_browser():
+    next_data = '{"props": {"pageProps": {"items": [' + ", ".join(['"item"'] * 60) + "]}}}"
+    doc = parse_html(
+        '<html><body><div id="__next"><img src="logo.png" width="40" height="40"></div>'
+        f'<script id="__NEXT_DATA__" type="application/json">{next_data}</script></body></html>'
+    )
+    image_info = [{"rendered": True, "width": 40, "height": 40}]
+    assert browser_required_reason(doc, image_info) is not None
+
@@ -0,0 +1,17 @@
+"""이미지 주변 컨텍스트(extract_local_context) 검사"""
+
+from parser.dom import parse_html
+from parser.parser import extract_local_context
+
+
+def test_local_context_uses_nearby_paragraph_not_page_intro():
+    doc = parse_html(
+        "<html><body><div class='page'><p>Site-wide intro paragraph.</p>"
+        + "<section><h2>Other</h2><p>Unrelated.</p></section>" * 5
+        + "<div class='row'><div class='media'><img src='a.png'></div>"
+        "<div class='text'><p>Paragraph next to the image.</p></div></div>"
+        "</div></body></html>"
+    )
+    context = extract_local_context(doc.find(".//img"), doc)
+    assert "Paragraph next to the image." in context
+    assert "Site-wide intro" not in context
@@ -0,0 +1,19 @@
+"""정적 파싱의 HTML 인코딩 결정(decode_html) 검사"""
+
+from parser.static import decode_html
+
+KOREAN_PAGE = '<html><head><meta charset="utf-8"><title>대체 텍스트</title></head><body>이미지</body></html>'
+
+
+def test_meta_charset_used_when_header_has_none():
+    assert decode_html(KOREAN_PAGE.encode("utf-8"), "text/html") == KOREAN_PAGE
+
+
+def test_header_charset_wins_over_meta():
+    page = KOREAN_PAGE.replace("utf-8", "euc-kr")
+    assert decode_html(page.encode("euc-kr"), "text/html; charset=EUC-KR") == page
+
+
+def test_http_equiv_meta_charset():
+    page = '<meta http-equiv="Content-Type" content="text/html; charset=euc-kr"><p>한국어 문단</p>'
+    assert decode_html(page.encode("euc-kr"), "text/html") == page
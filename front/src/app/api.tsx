@@ -80,6 +80,8 @@ export const regenerateImage = async (
     image_url: url,
     alt_text: original_alt_text,
     context: customized_alt_text,
+    // 재생성은 새 결과가 필요하므로 서버의 alt-text 캐시를 건너뜀
+    bypass_cache: true,
   };
 
   try {